@@ -1,12 +1,26 @@
+import copy
+import hashlib
 import os
+import time
+from typing import Any, Dict
 from fastapi import Header, HTTPException
 from jose import jwt, JWTError
+from app.cache import TTLCache
 
 AUD = "authenticated"
 
 _SUPABASE_JWT_SECRET = None
 _ALLOWED_DOMAINS = None
 
+# Verified claims keyed by token digest; each entry expires at the token's `exp`.
+# Only fully accepted tokens are cached, so 401/403 paths always re-verify.
+# Claims are deep-copied in and out: callers may mutate the nested metadata.
+_claims_cache = TTLCache(
+    "jwt_claims",
+    maxsize=int(os.getenv("JWT_CLAIMS_CACHE_MAXSIZE", "1024")),
+    ttl_seconds=0,
+)
+
 def _get_jwt_secret() -> str:
     global _SUPABASE_JWT_SECRET
     if _SUPABASE_JWT_SECRET is None:
@@ -29,6 +43,17 @@ def _is_allowed_domain(email: str) -> bool:
     email = (email or "").lower()
     return any(email.endswith(f"@{d}") for d in _get_allowed_domains())
 
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _cache_claims(digest: str, claims: Dict[str, Any]) -> None:
+    try:
+        ttl = float(claims.get("exp")) - time.time()
+    except (TypeError, ValueError):
+        return
+    if ttl > 0:
+        _claims_cache.set(digest, copy.deepcopy(claims), ttl_seconds=ttl)
+
 def require_allowed_user(authorization: str = Header(None)):
     """
     HS256-only validator for Supabase access tokens.
@@ -44,6 +69,11 @@ def require_allowed_user(authorization: str = Header(None)):
 
     token = authorization.split(" ", 1)[1]
 
+    digest = _token_digest(token)
+    cached = _claims_cache.get(digest)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
     # Ensure HS256 token
     try:
         header = jwt.get_unverified_header(token)
@@ -70,4 +100,5 @@ def require_allowed_user(authorization: str = Header(None)):
     if not _is_allowed_domain(email):
         raise HTTPException(status_code=403, detail="Forbidden domain")
 
-    return claims
+    _cache_claims(digest, claims)
+    return dict(claims)
@@ -0,0 +1,131 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial, wraps
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+import asyncio
+import contextvars
+import os
+import threading
+from app.metrics import BULKHEAD_REJECTIONS, THREAD_POOL_BUSY, THREAD_POOL_QUEUED, register_pool, run_in_pool
+
+# Bulkheads: one bounded executor per dependency class, so a slow Notion or Make
+# call cannot take the threads Supabase-backed routes need (and vice versa).
+# Sized by BULKHEAD_<NAME>_WORKERS / BULKHEAD_<NAME>_QUEUE; once the workers are
+# busy and the queue is full, calls fail fast with BulkheadFull (503 in app.main).
+_DEFAULTS: Dict[str, Tuple[int, int]] = {
+    "supabase": (16, 64),
+    "notion": (4, 16),
+    "make": (8, 16),
+    # Local SQLite writes of the Make outbox
+    "outbox": (4, 64),
+}
+
+class BulkheadFull(RuntimeError):
+    """All workers of a bulkhead are busy and its queue is full."""
+    def __init__(self, name: str):
+        super().__init__(f"{name} is saturated, retry later")
+        self.name = name
+
+class Bulkhead:
+    """
+    At most `max_workers` calls run at once and at most `max_queue` wait for a worker.
+    Sync work goes through submit()/call()/run(); async I/O (no thread needed) through slot().
+    """
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        register_pool(name, self.max_workers)
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._admitted >= self.max_workers + self.max_queue:
+                BULKHEAD_REJECTIONS.labels(self.name).inc()
+                raise BulkheadFull(self.name)
+            self._admitted += 1
+        THREAD_POOL_QUEUED.labels(self.name).inc()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._admitted -= 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"bulkhead-{self.name}")
+            return self._executor
+
+    def _start(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        THREAD_POOL_QUEUED.labels(self.name).dec()
+        return run_in_pool(self.name, partial(fn, *args, **kwargs))
+
+    def _done(self, future: Future) -> None:
+        if future.cancelled():
+            THREAD_POOL_QUEUED.labels(self.name).dec()
+        self._release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue `fn` in the caller's context (request metrics and other contextvars); raises BulkheadFull when saturated."""
+        self._admit()
+        try:
+            future = self._get_executor().submit(contextvars.copy_context().run, self._start, fn, *args, **kwargs)
+        except BaseException:
+            THREAD_POOL_QUEUED.labels(self.name).dec()
+            self._release()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Concurrency limit for awaited I/O, with the same queue bound and fast-fail."""
+        self._admit()
+        started = False
+        try:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_workers)
+            async with self._semaphore:
+                started = True
+                THREAD_POOL_QUEUED.labels(self.name).dec()
+                busy = THREAD_POOL_BUSY.labels(self.name)
+                busy.inc()
+                try:
+                    yield
+                finally:
+                    busy.dec()
+        finally:
+            if not started:
+                THREAD_POOL_QUEUED.labels(self.name).dec()
+            self._release()
+
+@lru_cache(maxsize=None)
+def get_bulkhead(name: str) -> Bulkhead:
+    workers, queue = _DEFAULTS.get(name, (8, 16))
+    prefix = f"BULKHEAD_{name.upper()}"
+    return Bulkhead(
+        name,
+        int(os.environ.get(f"{prefix}_WORKERS", str(workers))),
+        int(os.environ.get(f"{prefix}_QUEUE", str(queue))),
+    )
+
+def bulkhead(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Run a sync route on the `name` bulkhead instead of the shared AnyIO threadpool.
+    Place it under the @router decorator; BulkheadFull is raised before the route body runs.
+    """
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        async def endpoint(*args: Any, **kwargs: Any) -> Any:
+            return await get_bulkhead(name).run(fn, *args, **kwargs)
+        return endpoint
+    return decorate
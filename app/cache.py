@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from app.metrics import CACHE_LOOKUPS
+
+_registry: Dict[str, "TTLCache"] = {}
+_registry_lock = threading.Lock()
+
+class TTLCache:
+    """
+    Thread-safe, process-local LRU cache with a per-entry TTL and hit/miss counters.
+    Every named instance is registered so its stats can be reported (see cache_stats).
+    """
+    def __init__(self, name: str, *, maxsize: int, ttl_seconds: float):
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the fresh value for `key` (refreshing its LRU position) or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                CACHE_LOOKUPS.labels(self.name, "miss").inc()
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            CACHE_LOOKUPS.labels(self.name, "hit").inc()
+            return entry[1]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the value for `key` even if expired, without touching counters or LRU order."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[1] if entry is not None else None
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every registered cache, keyed by cache name."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {c.name: c.stats() for c in caches}
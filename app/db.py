@@ -1,16 +1,80 @@
+import contextvars
 import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from app.request_metrics import AsyncInstrumentedClient, InstrumentedClient
+from app.metrics import register_pool, run_in_pool
 
 load_dotenv()
 
-@lru_cache(maxsize=1)
-def get_supabase() -> Client:
+if TYPE_CHECKING:
+    from supabase import AsyncClient, Client
+
+_async_client: Optional[Any] = None
+
+def _credentials() -> Tuple[str, str]:
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_ANON_KEY")
     if url is None:
         raise RuntimeError("Environment variable SUPABASE_URL is not set.")
     if key is None:
         raise RuntimeError("Neither SUPABASE_SERVICE_ROLE_KEY nor SUPABASE_ANON_KEY is set.")
-    return create_client(url, key)
+    return url, key
+
+@lru_cache(maxsize=1)
+def get_supabase() -> "Client":
+    # supabase pulls in storage/realtime/auth clients; import on first use, not at app import
+    from supabase import create_client
+
+    # Proxy records PostgREST round trips per request (see app.request_metrics)
+    return InstrumentedClient(create_client(*_credentials()))
+
+async def get_async_supabase() -> "AsyncClient":
+    """
+    Async Supabase client for `async def` routes: queries are awaited on the event
+    loop instead of holding a threadpool thread. One client per worker, built on first use.
+    """
+    global _async_client
+    if _async_client is None:
+        from supabase import acreate_client
+
+        _async_client = AsyncInstrumentedClient(await acreate_client(*_credentials()))
+    return _async_client
+
+async def aclose_async_supabase() -> None:
+    """Close the async client's connection pool (called on application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.postgrest.aclose()
+        _async_client = None
+
+# Ids per in_() filter: the ids go into the query string, so batch reads split them
+IN_FILTER_CHUNK = int(os.environ.get("SUPABASE_IN_FILTER_CHUNK", "50"))
+
+def chunked(ids: List[Any], size: int = IN_FILTER_CHUNK) -> List[List[Any]]:
+    """Split `ids` into lists of at most `size` (one in_() query each)."""
+    size = max(1, size)
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+@lru_cache(maxsize=1)
+def _get_query_pool() -> ThreadPoolExecutor:
+    workers = max(1, int(os.environ.get("SUPABASE_QUERY_CONCURRENCY", "8")))
+    register_pool("supabase-query", workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="supabase-query")
+
+def run_parallel(*calls: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent Supabase reads concurrently on a bounded thread pool.
+    Returns results in the order of `calls`; the first failing call's exception is re-raised.
+    Do not nest: a call passed here must not itself call run_parallel.
+    Each call runs in a copy of the caller's context (request metrics and other contextvars).
+    """
+    if len(calls) <= 1:
+        return [c() for c in calls]
+    futures = [
+        _get_query_pool().submit(contextvars.copy_context().run, run_in_pool, "supabase-query", c)
+        for c in calls
+    ]
+    return [f.result() for f in futures]
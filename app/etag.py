@@ -0,0 +1,41 @@
+from typing import Optional
+import hashlib
+from fastapi import Request, Response
+
+# Weak ETags for conditional GETs. Responses carry `Cache-Control: private, no-cache`
+# so the browser stores them but revalidates with If-None-Match every time.
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == bare:
+            return True
+    return False
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    *,
+    cache_control: str = CACHE_CONTROL,
+) -> Optional[Response]:
+    """
+    Return a 304 response if the request's If-None-Match matches `etag`;
+    otherwise set the validator headers on `response` and return None.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,42 @@
+import logging
+import os
+import sys
+from typing import Any, Dict
+
+# Handler and level for the app.* loggers (e.g. the per-request JSON line of
+# app.request_metrics). Neither server configures them by itself: gunicorn takes
+# GUNICORN_LOGCONFIG as logconfig_dict (see gunicorn.conf.py), and under plain
+# uvicorn (run.py) app.main calls configure_logging().
+LOG_LEVEL = os.environ.get("APP_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s [%(process)d] [%(levelname)s] %(name)s: %(message)s"
+
+GUNICORN_LOGCONFIG: Dict[str, Any] = {
+    # Merged over gunicorn's defaults, which provide the console/error_console handlers.
+    # Third-party loggers (httpx logs every request at INFO) stay at WARNING.
+    "root": {"level": "WARNING", "handlers": ["console"]},
+    "loggers": {
+        "gunicorn.error": {"level": "INFO", "handlers": ["error_console"], "propagate": False, "qualname": "gunicorn.error"},
+        "gunicorn.access": {"level": "INFO", "handlers": ["console"], "propagate": False, "qualname": "gunicorn.access"},
+        "app": {"level": LOG_LEVEL, "handlers": ["app_console"], "propagate": False, "qualname": "app"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "generic", "stream": "ext://sys.stdout"},
+        "error_console": {"class": "logging.StreamHandler", "formatter": "generic", "stream": "ext://sys.stderr"},
+        "app_console": {"class": "logging.StreamHandler", "formatter": "app", "stream": "ext://sys.stdout"},
+    },
+    "formatters": {
+        "generic": {"format": "%(asctime)s [%(process)d] [%(levelname)s] %(message)s", "datefmt": "[%Y-%m-%d %H:%M:%S %z]"},
+        "app": {"format": LOG_FORMAT},
+    },
+}
+
+def configure_logging() -> None:
+    """Give the app logger a stdout handler and LOG_LEVEL, unless the server already configured it."""
+    logger = logging.getLogger("app")
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
@@ -1,13 +1,18 @@
 import os
-from fastapi import Depends, FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from app.auth.deps import require_allowed_user
 from app.routes.api.meta.enums import router as meta_router
+from app.routes.api.meta.cache_stats import router as cache_stats_router
+from app.routes.api.meta.outbox import router as outbox_router
 from app.routes.api.sessions.list import router as sessions_list_router
 from app.routes.api.sessions.create import router as sessions_create_router
 from app.routes.api.sessions.status import router as sessions_status_router
 from app.routes.api.sessions.confirmation_summary import router as confirmation_summary_router
+from app.routes.api.sessions.events import router as session_events_router
 from app.routes.api.notion.facility_info import router as notion_router
 from app.routes.api.hooks.make_evaluator_email import router as evaluator_hook_router
 from app.routes.api.hooks.make_facility_email import router as facility_hook_router
@@ -16,10 +21,28 @@ from app.routes.api.hooks.client_response import router as client_response_route
 from app.routes.api.hooks.make_form_urls import router as form_urls_hook_router
 from app.routes.api.hooks.auth.before_user_created import router as auth_hook_router
 from app.routes.api.hooks.reminder_mail import router as reminder_mail_router
+from app.services.hooks import make_outbox_service
+from app.services.hooks.make_http_client import aclose_http_clients
+from app.services.meta import enum_service
+from app.request_metrics import RequestMetricsMiddleware
+from app.metrics import PrometheusMiddleware, render as render_metrics
+from app.db import aclose_async_supabase, get_supabase
+from app.bulkhead import BulkheadFull
+from app.logging_config import configure_logging
 
 load_dotenv()
+configure_logging()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    make_outbox_service.start_worker()
+    enum_service.preload(get_supabase)
+    yield
+    make_outbox_service.stop_worker()
+    await aclose_http_clients()
+    await aclose_async_supabase()
+
+app = FastAPI(lifespan=lifespan)
 
 DEFAULT_CORS_ORIGINS = (
     "http://localhost:5173",
@@ -46,6 +69,13 @@ def _configure_cors(application: FastAPI) -> None:
 
 _configure_cors(app)
 
+@app.exception_handler(BulkheadFull)
+async def bulkhead_full_handler(request: Request, exc: BulkheadFull):
+    """A saturated bulkhead (see app.bulkhead) fails fast instead of queueing without bound."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(PrometheusMiddleware)
+
 @app.get("/")
 def read_root():
     """Root endpoint for API status."""
@@ -56,12 +86,24 @@ def status_check():
     """Health check endpoint."""
     return {"status": "200"}
 
+@app.get("/metrics")
+def metrics(request: Request):
+    """Prometheus text exposition (all gunicorn workers). Set METRICS_TOKEN to require a bearer token."""
+    token = os.getenv("METRICS_TOKEN")
+    if token and request.headers.get("authorization") != f"Bearer {token}":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 deps = [Depends(require_allowed_user)]
 app.include_router(sessions_list_router, prefix="/api/sessions", dependencies=deps)
 app.include_router(sessions_create_router, prefix="/api/sessions", dependencies=deps)
 app.include_router(sessions_status_router, prefix="/api/sessions", dependencies=deps)
 app.include_router(confirmation_summary_router, prefix="/api/sessions", dependencies=deps)
+app.include_router(session_events_router, prefix="/api/sessions", dependencies=deps)
 app.include_router(meta_router, prefix="/api/meta", dependencies=deps)
+app.include_router(cache_stats_router, prefix="/api/meta", dependencies=deps)
+app.include_router(outbox_router, prefix="/api/meta", dependencies=deps)
 app.include_router(notion_router, prefix="/api/notion", dependencies=deps)
 app.include_router(evaluator_hook_router, prefix="/api/hooks", dependencies=deps)
 app.include_router(facility_hook_router, prefix="/api/hooks", dependencies=deps)
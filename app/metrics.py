@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import os
+import time
+import anyio.to_thread
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Prometheus metrics. Under gunicorn, PROMETHEUS_MULTIPROC_DIR (set in gunicorn.conf.py)
+# makes each worker write its samples to shared mmap files; /metrics aggregates them.
+# Without it (e.g. run.py) the default in-process registry is used.
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "API request latency", ["method", "route", "status"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled", multiprocess_mode="livesum",
+)
+DEPENDENCY_SECONDS = Histogram(
+    "dependency_request_duration_seconds",
+    "Outbound call latency (supabase: table.op, notion: pages.retrieve, make: webhook target)",
+    ["dependency", "operation", "outcome"],
+)
+THREAD_POOL_BUSY = Gauge(
+    "thread_pool_busy_workers", "Busy workers per thread pool", ["pool"], multiprocess_mode="livesum",
+)
+THREAD_POOL_SIZE = Gauge(
+    "thread_pool_max_workers", "Configured workers per thread pool", ["pool"], multiprocess_mode="livesum",
+)
+THREAD_POOL_QUEUED = Gauge(
+    "thread_pool_queued_tasks", "Admitted tasks waiting for a worker", ["pool"], multiprocess_mode="livesum",
+)
+BULKHEAD_REJECTIONS = Counter(
+    "bulkhead_rejections_total", "Calls rejected with 503 because a bulkhead was saturated (see app.bulkhead)", ["pool"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "In-process cache lookups (see app.cache)", ["cache", "result"],
+)
+
+@contextmanager
+def track_dependency(dependency: str, operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        DEPENDENCY_SECONDS.labels(dependency, operation, outcome).observe(time.perf_counter() - start)
+
+def register_pool(pool: str, max_workers: int) -> None:
+    THREAD_POOL_SIZE.labels(pool).set(max_workers)
+
+def run_in_pool(pool: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """Run `fn` counting it as a busy worker of `pool` (call from inside the pool thread)."""
+    busy = THREAD_POOL_BUSY.labels(pool)
+    busy.inc()
+    try:
+        return fn(*args)
+    finally:
+        busy.dec()
+
+def render() -> Tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def _sample_threadpool() -> None:
+    # Starlette runs sync routes/dependencies on anyio's default limiter
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    THREAD_POOL_BUSY.labels("anyio").set(limiter.borrowed_tokens)
+    THREAD_POOL_SIZE.labels("anyio").set(limiter.total_tokens)
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware recording latency per (method, route template, status) and in-flight requests."""
+    def __init__(self, app: Any):
+        self.app = app
+        self._templates: Optional[Dict[Any, str]] = None
+
+    def _route_template(self, scope: Dict[str, Any]) -> str:
+        # The router stores the matched endpoint in the (shared) scope
+        if self._templates is None:
+            self._templates = {
+                getattr(r, "endpoint", None): r.path
+                for r in scope["app"].routes
+                if hasattr(r, "path")
+            }
+        return self._templates.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status: Dict[str, int] = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        _sample_threadpool()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _sample_threadpool()
+            HTTP_REQUEST_SECONDS.labels(
+                scope.get("method", ""), self._route_template(scope), str(status["code"]),
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,160 @@
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import threading
+import time
+from app.metrics import track_dependency
+
+logger = logging.getLogger(__name__)
+
+# Query verbs of a request builder chain (the operation label of Supabase latency metrics)
+_OPS = frozenset({"select", "insert", "update", "upsert", "delete"})
+
+# Per-request record of PostgREST round trips. RequestMetricsMiddleware opens one per
+# HTTP request; InstrumentedClient (see app.db.get_supabase) appends to it. The record
+# is found through a ContextVar, which sync routes inherit in the threadpool and
+# run_parallel copies into its workers.
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, table: str, duration_ms: float) -> None:
+        with self._lock:
+            self.calls.append({"table": table, "ms": round(duration_ms, 2)})
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = list(self.calls)
+        by_table: Dict[str, float] = {}
+        for c in calls:
+            by_table[c["table"]] = by_table.get(c["table"], 0.0) + c["ms"]
+        return {
+            "db_calls": len(calls),
+            "db_ms": round(sum(c["ms"] for c in calls), 2),
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "tables": {t: round(ms, 2) for t, ms in by_table.items()},
+            "calls": calls,
+        }
+
+def current() -> Optional[RequestMetrics]:
+    return _current.get()
+
+def _metric_name(table: str) -> str:
+    # Server-Timing metric names are tokens: keep [A-Za-z0-9_-]
+    return "db-" + "".join(ch if ch.isalnum() or ch in "_-" else "-" for ch in table)
+
+def server_timing(summary: Dict[str, Any]) -> str:
+    parts = [
+        f'db;dur={summary["db_ms"]};desc="{summary["db_calls"]} calls"',
+        f'app;dur={summary["total_ms"]}',
+    ]
+    parts += [f"{_metric_name(t)};dur={ms}" for t, ms in summary["tables"].items()]
+    return ", ".join(parts)
+
+class _Builder:
+    """Proxy over a postgrest request builder that times execute() and keeps wrapping the chain."""
+    __slots__ = ("_inner", "_table", "_op")
+
+    def __init__(self, inner: Any, table: str, op: str = ""):
+        self._inner = inner
+        self._table = table
+        self._op = op
+
+    def execute(self, *args: Any, **kwargs: Any) -> Any:
+        metrics = _current.get()
+        operation = f"{self._table}.{self._op}" if self._op else self._table
+        start = time.perf_counter()
+        try:
+            with track_dependency("supabase", operation):
+                return self._inner.execute(*args, **kwargs)
+        finally:
+            if metrics is not None:
+                metrics.record(self._table, (time.perf_counter() - start) * 1000)
+
+    def _wrap(self, value: Any, op: str) -> Any:
+        return type(self)(value, self._table, op) if hasattr(value, "execute") else value
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+        op = self._op or (name if name in _OPS else "")
+        if not callable(attr):
+            return self._wrap(attr, op)  # e.g. the `not_` property
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self._wrap(attr(*args, **kwargs), op)
+        return call
+
+class _AsyncBuilder(_Builder):
+    """_Builder for the async client: execute() is awaited inside the timing window."""
+    __slots__ = ()
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        metrics = _current.get()
+        operation = f"{self._table}.{self._op}" if self._op else self._table
+        start = time.perf_counter()
+        try:
+            with track_dependency("supabase", operation):
+                return await self._inner.execute(*args, **kwargs)
+        finally:
+            if metrics is not None:
+                metrics.record(self._table, (time.perf_counter() - start) * 1000)
+
+class InstrumentedClient:
+    """Thin proxy over the Supabase client; table()/from_()/rpc() calls are recorded per request."""
+    _builder = _Builder
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def table(self, name: str) -> _Builder:
+        return self._builder(self._client.table(name), name)
+
+    from_ = table
+
+    def rpc(self, fn: str, *args: Any, **kwargs: Any) -> _Builder:
+        return self._builder(self._client.rpc(fn, *args, **kwargs), f"rpc.{fn}")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+class AsyncInstrumentedClient(InstrumentedClient):
+    """InstrumentedClient over the async Supabase client (see app.db.get_async_supabase)."""
+    _builder = _AsyncBuilder
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware: adds a Server-Timing header and logs one JSON line per request."""
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status: Dict[str, int] = {}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(metrics.summary()).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            summary = metrics.summary()
+            logger.info(json.dumps({
+                "event": "request",
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "status": status.get("code"),
+                **summary,
+            }, ensure_ascii=False))
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional
+from app.bulkhead import BulkheadFull, get_bulkhead
 from app.db import get_supabase
 from app.services.hooks.client_response_service import insert_client_response
-from app.services.hooks.client_response_notify_service import post_to_make_webhook
+from app.services.hooks.client_response_notify_service import enqueue_make_notification
+from app.services.hooks.make_payload_service import abuild_payload
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -14,26 +19,35 @@ class ClientResponsePayload(BaseModel):
     note: Optional[str] = None
 
 @router.post("/save-client-response")
-def save_client_response(
+async def save_client_response(
     payload: ClientResponsePayload,
-    background_tasks: BackgroundTasks,
     supabase = Depends(get_supabase),
 ):
     try:
-        result = insert_client_response(
+        result = await abuild_payload(
             supabase,
+            insert_client_response,
             session_id=payload.session_id,
             selected_candidate_slot_id=payload.selected_candidate_slot_id,
             note=payload.note,
         )
 
-        background_tasks.add_task(
-            post_to_make_webhook,
-            result.get("client_response_payload") or {}
-        )
+        # Delivered to Make by the outbox worker (retries survive restarts).
+        # The response is already saved, so a failure here must not fail the request.
+        try:
+            await get_bulkhead("outbox").run(
+                enqueue_make_notification,
+                result.get("client_response_payload") or {},
+                session_id=payload.session_id,
+            )
+        except Exception:
+            logger.exception("Failed to queue the client response notification for session %s", payload.session_id)
 
         return result
 
+    except BulkheadFull:
+        raise
+
     except ValueError as ve:
         msg = str(ve)
         if "already been submitted" in msg:
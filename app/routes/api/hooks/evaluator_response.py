@@ -1,6 +1,7 @@
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field, field_validator
+from app.bulkhead import bulkhead
 from app.db import get_supabase
 from app.services.hooks.evaluator_response_service import insert_evaluator_response
 
@@ -34,6 +35,7 @@ class EvaluatorResponsePayload(BaseModel):
         return out
 
 @router.post("/save-evaluator-response")
+@bulkhead("supabase")
 def save_evaluator_response(payload: EvaluatorResponsePayload, supabase = Depends(get_supabase)):
     try:
         return insert_evaluator_response(
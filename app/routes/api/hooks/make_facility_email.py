@@ -3,10 +3,12 @@ from pydantic import BaseModel, Field
 from typing import List, Any, Dict
 from http import HTTPStatus
 import json, os
+from app.bulkhead import BulkheadFull, get_bulkhead
 from app.db import get_supabase
 from app.services.hooks.make_facility_email_service import (
-    build_make_payload, post_to_make_webhook
+    build_make_payload, apost_to_make_webhook
 )
+from app.services.hooks.make_payload_service import abuild_payload
 
 router = APIRouter()
 
@@ -15,16 +17,18 @@ class GenerateFacilityEmailBody(BaseModel):
     candidate_slot_ids: List[int] = Field(default_factory=list)
 
 @router.post("/generate-facility-email")
-def generate_facility_email(body: GenerateFacilityEmailBody, supabase = Depends(get_supabase)):
+async def generate_facility_email(body: GenerateFacilityEmailBody, supabase = Depends(get_supabase)):
     try:
-        payload = build_make_payload(
+        payload = await abuild_payload(
             supabase,
+            build_make_payload,
             session_id=body.session_id,
             candidate_slot_ids=body.candidate_slot_ids,
         )
 
         timeout_sec = int(os.getenv("MAKE_HTTP_TIMEOUT_SECONDS", "120"))
-        status, raw = post_to_make_webhook(payload, timeout_sec=timeout_sec)
+        async with get_bulkhead("make").slot():
+            status, raw = await apost_to_make_webhook(payload, timeout_sec=timeout_sec)
 
         try:
             make_json: Dict[str, Any] = json.loads(raw) if raw else {}
@@ -42,6 +46,8 @@ def generate_facility_email(body: GenerateFacilityEmailBody, supabase = Depends(
 
         raise HTTPException(status_code=HTTPStatus.BAD_GATEWAY, detail=f"Make webhook returned {status}")
 
+    except BulkheadFull:
+        raise
     except TimeoutError as te:
         raise HTTPException(status_code=HTTPStatus.GATEWAY_TIMEOUT, detail=str(te))
     except Exception as e:
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field, AnyHttpUrl
 from typing import Optional
+from app.bulkhead import bulkhead
 from app.db import get_supabase
 from app.services.hooks.make_form_urls_service import save_urls_for_session_evaluator, save_urls_for_session_facility
 
@@ -15,6 +16,7 @@ class SaveEvaluatorFormUrlsBody(BaseModel):
     edit_url: AnyHttpUrl
 
 @router.post("/save-evaluator-form-urls")
+@bulkhead("supabase")
 def save_evaluator_form_urls(body: SaveEvaluatorFormUrlsBody, supabase = Depends(get_supabase)):
     try:
         save_urls_for_session_evaluator(
@@ -37,6 +39,7 @@ class SaveFacilityFormUrlsBody(BaseModel):
     edit_url: AnyHttpUrl
 
 @router.post("/save-facility-form-urls")
+@bulkhead("supabase")
 def save_facility_form_urls(body: SaveFacilityFormUrlsBody, supabase = Depends(get_supabase)):
     try:
         save_urls_for_session_facility(
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
+from app.bulkhead import bulkhead
 from app.db import get_supabase
 from app.services.hooks.reminder_mail_service import fetch_due_reminders
 
 router = APIRouter()
 
 @router.get("/reminder-mail")
+@bulkhead("supabase")
 def get_all_due_reminders(
     as_of_date: Optional[str] = Query(None),
     supabase = Depends(get_supabase)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from app.cache import cache_stats
+from app.services.hooks.recipient_service import recipient_memo_stats
+from app.services.notion.facility_info_service import facility_info_cache_stats
+
+router = APIRouter()
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """Size and hit ratio of every in-process cache of this worker."""
+    return {
+        **cache_stats(),
+        # Registered cache stats plus the last_edited_time revalidation count
+        "notion_facility_info": facility_info_cache_stats(),
+        "recipient_emails": recipient_memo_stats(),
+    }
@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from app.bulkhead import bulkhead
 from app.db import get_supabase
+from app.etag import make_etag, not_modified
+from app.services.meta.enum_service import get_enums as load_cached_enums, refresh_interval_seconds
 
 router = APIRouter()
 
 @router.get("/enums")
-def get_enums(supabase = Depends(get_supabase)):
+@bulkhead("supabase")
+def get_enums(request: Request, response: Response, supabase = Depends(get_supabase)):
     try:
-        p = supabase.rpc("purpose_enum_values").execute().data or []
-        s = supabase.rpc("status_enum_values").execute().data or []
-        return {
-            "purpose": p,
-            "status": s
-        }
+        enums = load_cached_enums(supabase)
+        # The enum values are their own watermark; they change only with a schema migration
+        cached = not_modified(
+            request,
+            response,
+            make_etag("enums", enums["purpose"], enums["status"]),
+            cache_control=f"private, max-age={int(refresh_interval_seconds())}",
+        )
+        if cached is not None:
+            return cached
+        return enums
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.services.hooks.make_outbox_service import dead_letters
+
+router = APIRouter()
+
+@router.get("/outbox/dead-letters")
+def get_dead_letters(limit: int = Query(100, ge=1, le=1000)):
+    """Make deliveries that exhausted their retries, newest first."""
+    try:
+        return {"items": dead_letters(limit)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import HttpUrl
+from app.bulkhead import bulkhead
 from app.services.notion.facility_info_service import fetch_facility_info
 
 router = APIRouter()
 
 @router.get("/facility-info")
+@bulkhead("notion")
 def get_facility_info(url: HttpUrl = Query(..., alias="url")):
     """
     Fetch facility info from Notion by URL.
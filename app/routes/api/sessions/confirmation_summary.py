@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
+from app.bulkhead import bulkhead
 from app.db import get_supabase
+from app.etag import make_etag, not_modified
 from app.services.sessions.confirmation_summary_service import fetch_confirmation_summary
+from app.services.sessions.watermark_service import fetch_session_watermark
 
 router = APIRouter()
 
 @router.get("/{session_id}/confirmation-summary")
+@bulkhead("supabase")
 def get_confirmation_summary(
+    request: Request,
+    response: Response,
     session_id: int = Path(..., ge=1),
     supabase = Depends(get_supabase),
 ):
     try:
-        row = fetch_confirmation_summary(supabase, session_id=session_id)
+        watermark = fetch_session_watermark(supabase, session_id)
+        if watermark:
+            etag = make_etag("confirmation-summary", session_id, watermark)
+            cached = not_modified(request, response, etag)
+            if cached is not None:
+                return cached
+        row = fetch_confirmation_summary(supabase, session_id=session_id, watermark=watermark)
         if not row:
             raise HTTPException(status_code=404, detail="No data found.")
         return row
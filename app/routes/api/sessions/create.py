@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, HttpUrl, field_validator
 from typing import List
 from datetime import date
+from app.bulkhead import BulkheadFull, get_bulkhead
 from app.db import get_supabase
+from app.services.notion.facility_info_service import fetch_facility_info
 from app.services.sessions.create_service import create_session_with_notion
 
 router = APIRouter()
@@ -34,16 +36,25 @@ class CreateSessionBody(BaseModel):
         return cleaned
 
 @router.post("/create")
-def create_session(body: CreateSessionBody, supabase = Depends(get_supabase)):
+async def create_session(body: CreateSessionBody, supabase = Depends(get_supabase)):
+    """
+    The Notion read runs on the notion bulkhead first; the Supabase writes then run
+    on the supabase bulkhead, so neither holds the other's threads.
+    """
     try:
-        session_id = create_session_with_notion(
+        info = await get_bulkhead("notion").run(fetch_facility_info, body.notion_url)
+        session_id = await get_bulkhead("supabase").run(
+            create_session_with_notion,
             supabase,
             notion_url=body.notion_url,
+            facility_info=info,
             purpose=body.purpose,
             response_deadline=body.response_deadline,
             presentation_date=body.presentation_date,
             candidate_slots=[c.model_dump() for c in body.candidate_slots],
         )
         return {"session_id": session_id}
+    except BulkheadFull:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
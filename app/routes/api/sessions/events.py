@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Path
+from fastapi.responses import StreamingResponse
+from app.services.sessions.session_events_service import stream_events
+
+router = APIRouter()
+
+@router.get("/{session_id}/events")
+async def get_session_events(session_id: int = Path(..., ge=1)):
+    """
+    Server-sent events with live updates of one session
+    (answers, client_response, status, session, resync).
+    Async so open streams do not hold threadpool workers.
+    """
+    return StreamingResponse(
+        stream_events(session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
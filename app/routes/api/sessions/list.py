@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
+from app.bulkhead import bulkhead
 from app.db import get_supabase
+from app.etag import make_etag, not_modified
 from app.services.sessions.list_service import fetch_session_list
+from app.services.sessions.watermark_service import fetch_session_list_watermark
 
 router = APIRouter()
 
@@ -12,10 +15,24 @@ class SessionListQuery(BaseModel):
     facility: Optional[str] = None
     page: int = Field(1, ge=1, description="1-based page number")
     page_size: int = Field(10, ge=1, le=100, description="Rows per page (max 100)")
+    cursor: Optional[int] = Field(None, ge=1, description="Keyset cursor (next_cursor of the previous page); overrides page")
+    count_mode: Literal["exact", "planned", "estimated", "none"] = Field("exact", description="How `total` is counted")
 
 @router.get("/list")
-def get_session_list(q: SessionListQuery = Depends(), supabase = Depends(get_supabase)):
+@bulkhead("supabase")
+def get_session_list(
+    request: Request,
+    response: Response,
+    q: SessionListQuery = Depends(),
+    supabase = Depends(get_supabase),
+):
     try:
+        watermark = fetch_session_list_watermark(supabase)
+        if watermark:
+            etag = make_etag("list", q.model_dump_json(), watermark)
+            cached = not_modified(request, response, etag)
+            if cached is not None:
+                return cached
         return fetch_session_list(
             supabase,
             purpose=q.purpose,
@@ -23,6 +40,8 @@ def get_session_list(q: SessionListQuery = Depends(), supabase = Depends(get_sup
             facility=q.facility,
             page=q.page,
             page_size=q.page_size,
+            cursor=q.cursor,
+            count_mode=q.count_mode,
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
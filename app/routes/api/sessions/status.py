@@ -1,14 +1,24 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Literal, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, Path, Body, Query, Request, Response
 from pydantic import BaseModel, Field, field_validator
-from app.db import get_supabase
+from app.bulkhead import bulkhead
+from app.db import get_async_supabase, get_supabase
+from app.etag import make_etag, not_modified
 from app.services.sessions.status_service import (
-    fetch_session_status,
+    MAX_STATUS_BATCH,
+    afetch_session_status,
+    afetch_session_status_batch,
     update_evaluator_responses,
     update_session,
     check_slot_everyone_ok,
 )
+from app.services.sessions.watermark_service import afetch_session_watermark
+from app.services.sessions.consensus_service import (
+    MAX_BATCH_SESSIONS,
+    afetch_slot_consensus,
+    afetch_slot_consensus_batch,
+)
 
 router = APIRouter()
 class SessionStatusParams(BaseModel):
@@ -17,16 +27,50 @@ class SessionStatusParams(BaseModel):
 def _status_params(session_id: int = Path(..., ge=1)) -> SessionStatusParams:
     return SessionStatusParams(session_id=session_id)
 
+AnswersFormat = Literal["nested", "compact"]
+
 @router.get("/{session_id}/status")
-def get_session_status(
+async def get_session_status(
+    request: Request,
+    response: Response,
     q: SessionStatusParams = Depends(_status_params),
-    supabase = Depends(get_supabase),
+    answers_format: AnswersFormat = Query("nested"),
+    asupabase = Depends(get_async_supabase),
 ):
     """
     Fetch data for session status.
+    answers_format=compact returns the packed `answers_compact` matrix instead of `answers`.
+    Answers If-None-Match with 304 when the session watermark is unchanged.
+    The watermark covers the client responses behind `conflicts`, not this worker's
+    booking index: a worker whose index is still refreshing can flag a new
+    conflict up to BOOKING_INDEX_REFRESH_SECONDS late.
     """
     try:
-        return fetch_session_status(supabase, q.session_id)
+        # The watermark is read before the payload, so a concurrent change can
+        # only make the ETag stale (never the body)
+        watermark = await afetch_session_watermark(asupabase, q.session_id)
+        if watermark:
+            etag = make_etag("status", q.session_id, answers_format, watermark)
+            cached = not_modified(request, response, etag)
+            if cached is not None:
+                return cached
+        return await afetch_session_status(asupabase, q.session_id, answers_format, watermark)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+class StatusBatchBody(BaseModel):
+    session_ids: List[int] = Field(..., min_length=1, max_length=MAX_STATUS_BATCH)
+    answers_format: AnswersFormat = "nested"
+
+@router.post("/status:batch")
+async def post_session_status_batch(
+    body: StatusBatchBody,
+    asupabase = Depends(get_async_supabase),
+):
+    """
+    Fetch status for many sessions at once (same item shape as GET /{session_id}/status).
+    """
+    try:
+        return await afetch_session_status_batch(asupabase, body.session_ids, body.answers_format)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 class UpdateSessionPayload(BaseModel):
@@ -36,18 +80,14 @@ class UpdateSessionPayload(BaseModel):
 
     @field_validator("purpose")
     @classmethod
-    def _validate_purpose(cls, v: Optional[str]) -> Optional[str]:
+    def _strip_purpose(cls, v: Optional[str]) -> Optional[str]:
+        # Allowed values are checked against the enum cache in update_session
         if v is None:
             return None
-        s = v.strip()
-        if not s:
-            return None
-        allowed = {"訪問調査", "聞き取り", "場面観察", "FB", "その他"}
-        if s not in allowed:
-            raise ValueError("Invalid purpose")
-        return s
+        return v.strip() or None
 
 @router.patch("/{session_id}")
+@bulkhead("supabase")
 def patch_session(
     session_id: int = Path(..., ge=1),
     payload: UpdateSessionPayload = Body(...),
@@ -95,6 +135,7 @@ class UpdateEvaluatorPayload(BaseModel):
         return out
 
 @router.patch("/{session_id}/evaluators/{evaluator_id}")
+@bulkhead("supabase")
 def patch_evaluator_responses(
     session_id: int = Path(..., ge=1),
     evaluator_id: int = Path(..., ge=1),
@@ -116,6 +157,7 @@ def patch_evaluator_responses(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{session_id}/slots/{slot_id}/check")
+@bulkhead("supabase")
 def check_everyone_ok(
     session_id: int = Path(..., ge=1),
     slot_id: int = Path(..., ge=1),
@@ -125,3 +167,30 @@ def check_everyone_ok(
         return check_slot_everyone_ok(supabase, session_id, slot_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{session_id}/slots/consensus")
+async def get_slot_consensus(
+    session_id: int = Path(..., ge=1),
+    asupabase = Depends(get_async_supabase),
+):
+    """
+    Score every candidate slot of the session (○/△/x counts, unanswered,
+    everyone_ok, rank) from a single responses fetch.
+    """
+    try:
+        return await afetch_slot_consensus(asupabase, session_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class ConsensusBatchBody(BaseModel):
+    session_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SESSIONS)
+
+@router.post("/consensus:batch")
+async def post_slot_consensus_batch(
+    body: ConsensusBatchBody,
+    asupabase = Depends(get_async_supabase),
+):
+    try:
+        return {"items": await afetch_slot_consensus_batch(asupabase, body.session_ids)}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
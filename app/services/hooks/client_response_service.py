@@ -1,28 +1,13 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 from .client_response_notify_service import build_make_payload
+from .make_payload_service import identity_map
+from app.services.sessions.booking_conflict_service import find_conflicts, record_confirmation
+from app.services.sessions.session_events_service import EVENT_CLIENT_RESPONSE, EVENT_STATUS, publish
+from app.services.sessions.entity_cache_service import invalidate_session
 
 CONFIRMED_STATUS = "確定"
 
-def _has_existing_response(supabase, session_id: int) -> bool:
-    res = (
-        supabase.table("client_responses")
-        .select("session_id")
-        .eq("session_id", session_id)
-        .limit(1)
-        .execute()
-    )
-    return bool(res.data)
-
-def _slot_belongs_to_session(supabase, session_id: int, slot_id: int) -> bool:
-    res = (supabase.table("candidate_slots")
-           .select("id")
-           .eq("session_id", session_id)
-           .eq("id", slot_id)
-           .single()
-           .execute())
-    return bool(res.data)
-
 def insert_client_response(
     supabase,
     *,
@@ -30,11 +15,29 @@ def insert_client_response(
     selected_candidate_slot_id: Optional[int],
     note: Optional[str] = None,
 ) -> Dict[str, Any]:
-    if _has_existing_response(supabase, session_id):
+    # The checks below and the notification payload share one identity map,
+    # so the slots and the new client_responses row are not read back.
+    with identity_map(supabase) as imap:
+        return _insert_client_response(
+            imap,
+            session_id=session_id,
+            selected_candidate_slot_id=selected_candidate_slot_id,
+            note=note,
+        )
+
+def _insert_client_response(
+    imap,
+    *,
+    session_id: int,
+    selected_candidate_slot_id: Optional[int],
+    note: Optional[str],
+) -> Dict[str, Any]:
+    supabase = imap.supabase
+    if imap.client_response(session_id) is not None:
         raise ValueError("This form has already been submitted for the session.")
 
     if selected_candidate_slot_id is not None:
-        if not _slot_belongs_to_session(supabase, session_id, selected_candidate_slot_id):
+        if imap.candidate_slot(session_id, selected_candidate_slot_id) is None:
             raise ValueError("Selected slot does not belong to the session")
 
     now_iso = datetime.now(timezone.utc).isoformat()
@@ -48,6 +51,13 @@ def insert_client_response(
     }
 
     res = supabase.table("client_responses").insert(row).execute()
+    invalidate_session(session_id)
+    if res.data:
+        imap.put("client_response", session_id, res.data[0])
+        publish(session_id, EVENT_CLIENT_RESPONSE, {
+            "selected_candidate_slot_id": selected_candidate_slot_id,
+            "answered_at": now_iso,
+        })
 
     try:
         if res.data:
@@ -61,18 +71,50 @@ def insert_client_response(
         selected_candidate_slot_id=selected_candidate_slot_id,
     )
 
+    conflicts = _check_and_record_booking(supabase, session_id, client_response_payload)
+
     return {
         "ok": True,
         "updated_count": len(res.data or []),
         "session_id": session_id,
         "client_response_payload": client_response_payload,
+        "conflicts": conflicts,
     }
 
+def _check_and_record_booking(supabase, session_id: int, payload: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Flag evaluators already booked by another session on the confirmed date,
+    then add this confirmation to the booking index. Never blocks the save.
+    """
+    body = payload[0] if payload else {}
+    slot = (body.get("client_response") or {}).get("preferred_slot") or {}
+    evaluator_ids = [e["id"] for e in body.get("evaluators") or [] if e.get("id") is not None]
+    if not slot.get("id") or not evaluator_ids:
+        return []
+    try:
+        conflicts = find_conflicts(
+            supabase,
+            session_id=session_id,
+            checks=[(eid, slot["id"], slot.get("slot_date"), "confirmed") for eid in evaluator_ids],
+        )
+        record_confirmation(
+            session_id=session_id,
+            slot_id=slot["id"],
+            slot_date=slot.get("slot_date"),
+            slot_label=slot.get("slot_label"),
+            evaluator_ids=evaluator_ids,
+        )
+        return conflicts
+    except Exception:
+        return []
+
 def mark_session_status(supabase, session_id: int, status: str) -> None:
     """Update sessions.status."""
     _ = (
         supabase.table("sessions")
-        .update({"status": status})
+        .update({"status": status, "updated_at": datetime.now(timezone.utc).isoformat()})
         .eq("id", session_id)
         .execute()
     )
+    invalidate_session(session_id)
+    publish(session_id, EVENT_STATUS, {"status": status})
@@ -1,5 +1,7 @@
 from typing import Dict, Optional, List, Any
 from datetime import datetime, timezone
+from app.services.sessions.session_events_service import EVENT_ANSWERS, EVENT_STATUS, publish
+from app.services.sessions.entity_cache_service import invalidate_session
 
 ALLOWED = {"O", "M", "X"}
 WAITING_FOR_CLIENT_STATUS = "事業所待ち"
@@ -91,9 +93,10 @@ def insert_evaluator_response(
             .execute()
         )
         upserted_count = len(res.data or [])
+        invalidate_session(session_id)
 
     if upserted_count > 0:
-        update_data = {"answered_at": now_iso}
+        update_data = {"answered_at": now_iso, "updated_at": now_iso}
         if note is not None:
             update_data["note"] = note
 
@@ -104,8 +107,16 @@ def insert_evaluator_response(
             .is_("answered_at", None)
             .execute()
         )
+        invalidate_session(session_id)
         if not res.data:
             raise ValueError("This evaluator has already submitted a response.")
+        publish(session_id, EVENT_ANSWERS, {
+            "evaluator_id": evaluator_id,
+            "session_evaluator_id": session_evaluator_id,
+            "answers": {r["candidate_slot_id"]: r["choice"] for r in rows},
+            "answered_at": now_iso,
+            **({"note": note} if note is not None else {}),
+        })
 
     try:
         if _all_evaluators_answered(supabase, session_id):
@@ -127,7 +138,9 @@ def mark_session_status(supabase, session_id: int, status: str) -> None:
     """Update sessions.status."""
     _ = (
         supabase.table("sessions")
-        .update({"status": status})
+        .update({"status": status, "updated_at": datetime.now(timezone.utc).isoformat()})
         .eq("id", session_id)
         .execute()
     )
+    invalidate_session(session_id)
+    publish(session_id, EVENT_STATUS, {"status": status})
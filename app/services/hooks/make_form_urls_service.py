@@ -1,4 +1,6 @@
 from typing import Optional, Dict, Any
+from datetime import datetime, timezone
+from app.services.sessions.entity_cache_service import invalidate_session
 
 def _resolve_session_evaluator_id(supabase, session_id: int, evaluator_id: int) -> int:
     """
@@ -41,6 +43,7 @@ def save_urls_for_session_evaluator(
         "evaluator_form_id": form_id,
         "evaluator_form_view_url": view_url,
         "evaluator_form_edit_url": edit_url,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
     }
     _ = (
         supabase.table("session_evaluators")
@@ -48,6 +51,7 @@ def save_urls_for_session_evaluator(
         .eq("id", session_evaluator_id)
         .execute()
     )
+    invalidate_session(session_id)
 
 def save_urls_for_session_facility(
     supabase,
@@ -65,6 +69,7 @@ def save_urls_for_session_facility(
         "facility_form_id": form_id,
         "facility_form_view_url": view_url,
         "facility_form_edit_url": edit_url,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
     }
     _ = (
         supabase.table("sessions")
@@ -72,3 +77,4 @@ def save_urls_for_session_facility(
         .eq("id", session_id)
         .execute()
     )
+    invalidate_session(session_id)
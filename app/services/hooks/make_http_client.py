@@ -0,0 +1,93 @@
+from typing import Any, Dict, Optional, Tuple
+from functools import lru_cache
+import json
+import os
+import httpx
+from app.metrics import track_dependency
+
+# Shared outbound HTTP layer for Make webhooks: pooled keep-alive connections and
+# separate connect/read timeouts, with sync and async variants.
+_connect_timeout = float(os.environ.get("MAKE_HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+_read_timeout = float(os.environ.get("MAKE_HTTP_TIMEOUT_SECONDS", "120"))
+_max_connections = int(os.environ.get("MAKE_HTTP_MAX_CONNECTIONS", "20"))
+_max_keepalive = int(os.environ.get("MAKE_HTTP_MAX_KEEPALIVE", "10"))
+_keepalive_expiry = float(os.environ.get("MAKE_HTTP_KEEPALIVE_SECONDS", "60"))
+
+_async_client: Optional[httpx.AsyncClient] = None
+
+def _timeout(read_timeout: Optional[float]) -> httpx.Timeout:
+    read = _read_timeout if read_timeout is None else read_timeout
+    return httpx.Timeout(connect=_connect_timeout, read=read, write=read, pool=_connect_timeout)
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_max_connections,
+        max_keepalive_connections=_max_keepalive,
+        keepalive_expiry=_keepalive_expiry,
+    )
+
+def _encode(payload: Any, idempotency_key: Optional[str]) -> Tuple[bytes, Dict[str, str]]:
+    # ensure_ascii=False keeps Japanese text as-is; the body is sent as UTF-8.
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = {"Content-Type": "application/json; charset=utf-8"}
+    if idempotency_key:
+        headers["Idempotency-Key"] = idempotency_key
+    return body, headers
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    return httpx.Client(timeout=_timeout(None), limits=_limits())
+
+def get_async_http_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(timeout=_timeout(None), limits=_limits())
+    return _async_client
+
+def post_json(
+    url: str,
+    payload: Any,
+    *,
+    read_timeout: Optional[float] = None,
+    idempotency_key: Optional[str] = None,
+    target: str = "make",
+) -> Tuple[int, str]:
+    """
+    POST JSON over the pooled client and return (status_code, response_text).
+    Raises TimeoutError on timeout or connection failure.
+    `target` names the webhook in latency metrics.
+    """
+    body, headers = _encode(payload, idempotency_key)
+    try:
+        with track_dependency("make", target):
+            resp = get_http_client().post(url, content=body, headers=headers, timeout=_timeout(read_timeout))
+    except httpx.TransportError as e:
+        raise TimeoutError("Make webhook request timed out") from e
+    return resp.status_code, resp.text
+
+async def apost_json(
+    url: str,
+    payload: Any,
+    *,
+    read_timeout: Optional[float] = None,
+    idempotency_key: Optional[str] = None,
+    target: str = "make",
+) -> Tuple[int, str]:
+    """Async variant of post_json."""
+    body, headers = _encode(payload, idempotency_key)
+    try:
+        with track_dependency("make", target):
+            resp = await get_async_http_client().post(url, content=body, headers=headers, timeout=_timeout(read_timeout))
+    except httpx.TransportError as e:
+        raise TimeoutError("Make webhook request timed out") from e
+    return resp.status_code, resp.text
+
+async def aclose_http_clients() -> None:
+    """Close pooled connections (called on application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+        get_http_client.cache_clear()
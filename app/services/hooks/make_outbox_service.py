@@ -0,0 +1,251 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from app.metrics import register_pool, run_in_pool
+
+logger = logging.getLogger(__name__)
+
+# Local SQLite stand-in for a durable outbox table. The default relative path is
+# only durable on a local machine: on hosts with an ephemeral filesystem (Render
+# without a persistent disk) queued deliveries are lost on every deploy/restart,
+# so MAKE_OUTBOX_DB_PATH must point at a persistent disk there.
+DEFAULT_DB_PATH = "make_outbox.sqlite3"
+_db_path = os.environ.get("MAKE_OUTBOX_DB_PATH") or DEFAULT_DB_PATH
+_concurrency = int(os.environ.get("MAKE_OUTBOX_CONCURRENCY", "4"))
+_max_attempts = int(os.environ.get("MAKE_OUTBOX_MAX_ATTEMPTS", "8"))
+_backoff_base_sec = float(os.environ.get("MAKE_OUTBOX_BACKOFF_BASE_SECONDS", "2"))
+_backoff_max_sec = float(os.environ.get("MAKE_OUTBOX_BACKOFF_MAX_SECONDS", "600"))
+_poll_interval_sec = float(os.environ.get("MAKE_OUTBOX_POLL_SECONDS", "5"))
+# A row stuck in 'delivering' longer than this (e.g. the worker process died) is retried.
+_lease_sec = float(os.environ.get("MAKE_OUTBOX_LEASE_SECONDS", "300"))
+# Delivered rows are kept this long (for idempotency-key dedupe and debugging), then purged.
+_retention_sec = float(os.environ.get("MAKE_OUTBOX_RETENTION_SECONDS", str(7 * 24 * 3600)))
+_purge_interval_sec = float(os.environ.get("MAKE_OUTBOX_PURGE_INTERVAL_SECONDS", "3600"))
+
+STATUS_PENDING = "pending"
+STATUS_DELIVERING = "delivering"
+STATUS_DELIVERED = "delivered"
+STATUS_DEAD = "dead"
+
+# target name -> sender(payload, idempotency_key) returning the HTTP status code
+_targets: Dict[str, Callable[[Any, str], int]] = {}
+
+_wakeup = threading.Event()
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+_init_lock = threading.Lock()
+_initialized = False
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(_db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def _ensure_schema() -> None:
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        with _connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS make_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT NOT NULL UNIQUE,
+                    target TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    lease_owner TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            # Outbox files created before leases were owned get the column added in place
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(make_outbox)")}
+            if "lease_owner" not in columns:
+                conn.execute("ALTER TABLE make_outbox ADD COLUMN lease_owner TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS make_outbox_due_idx ON make_outbox (status, next_attempt_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS make_outbox_status_updated_idx ON make_outbox (status, updated_at)"
+            )
+        _initialized = True
+
+def register_target(name: str, sender: Callable[[Any, str], int]) -> None:
+    """Register how payloads queued for `name` are delivered."""
+    _targets[name] = sender
+
+def enqueue(target: str, payload: Any, *, idempotency_key: str) -> bool:
+    """
+    Persist a delivery for `target`. Returns False if a row with the same
+    idempotency key already exists (the payload is then not queued twice).
+    """
+    if target not in _targets:
+        raise ValueError(f"Unknown outbox target: {target}")
+    _ensure_schema()
+    now = time.time()
+    with _connect() as conn:
+        cur = conn.execute(
+            """
+            INSERT OR IGNORE INTO make_outbox
+                (idempotency_key, target, payload, status, attempts, next_attempt_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, 0, ?, ?, ?)
+            """,
+            (idempotency_key, target, json.dumps(payload, ensure_ascii=False), STATUS_PENDING, now, now, now),
+        )
+        inserted = cur.rowcount == 1
+    if inserted:
+        _wakeup.set()
+    return inserted
+
+def _claim_due(limit: int) -> List[Dict[str, Any]]:
+    """
+    Atomically move due rows to 'delivering' (safe across gunicorn workers).
+    Each claim gets a fresh lease_owner, so a delivery whose lease expired and was
+    re-claimed elsewhere cannot overwrite the new owner's result.
+    """
+    now = time.time()
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """
+                SELECT * FROM make_outbox
+                WHERE (status = ? AND next_attempt_at <= ?)
+                   OR (status = ? AND updated_at <= ?)
+                ORDER BY next_attempt_at
+                LIMIT ?
+                """,
+                (STATUS_PENDING, now, STATUS_DELIVERING, now - _lease_sec, limit),
+            ).fetchall()
+            claimed = [{**dict(r), "lease_owner": uuid.uuid4().hex} for r in rows]
+            conn.executemany(
+                "UPDATE make_outbox SET status = ?, lease_owner = ?, updated_at = ? WHERE id = ?",
+                [(STATUS_DELIVERING, r["lease_owner"], now, r["id"]) for r in claimed],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return claimed
+
+def _backoff_seconds(attempts: int) -> float:
+    delay = min(_backoff_max_sec, _backoff_base_sec * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+def _deliver(row: Dict[str, Any]) -> None:
+    attempts = row["attempts"] + 1
+    error: Optional[str] = None
+    try:
+        sender = _targets.get(row["target"])
+        if sender is None:
+            raise RuntimeError(f"No sender registered for target {row['target']}")
+        status = sender(json.loads(row["payload"]), row["idempotency_key"])
+        if not 200 <= status < 300:
+            error = f"Make webhook returned {status}"
+    except Exception as e:
+        error = str(e) or e.__class__.__name__
+
+    now = time.time()
+    if error is None:
+        update = (STATUS_DELIVERED, attempts, row["next_attempt_at"], None)
+    elif attempts >= _max_attempts:
+        logger.error("Outbox delivery %s dead-lettered after %d attempts: %s", row["idempotency_key"], attempts, error)
+        update = (STATUS_DEAD, attempts, row["next_attempt_at"], error)
+    else:
+        update = (STATUS_PENDING, attempts, now + _backoff_seconds(attempts), error)
+    with _connect() as conn:
+        cur = conn.execute(
+            "UPDATE make_outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+            "lease_owner = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (*update, now, row["id"], row["lease_owner"]),
+        )
+    if cur.rowcount == 0:
+        logger.warning("Outbox delivery %s lost its lease; result not recorded", row["idempotency_key"])
+
+def purge_delivered(older_than_sec: Optional[float] = None) -> int:
+    """Delete delivered rows last updated more than `older_than_sec` ago. Returns the number removed."""
+    _ensure_schema()
+    cutoff = time.time() - (_retention_sec if older_than_sec is None else older_than_sec)
+    with _connect() as conn:
+        cur = conn.execute(
+            "DELETE FROM make_outbox WHERE status = ? AND updated_at < ?",
+            (STATUS_DELIVERED, cutoff),
+        )
+    return cur.rowcount
+
+def _run() -> None:
+    register_pool("make-outbox", max(1, _concurrency))
+    next_purge = 0.0
+    with ThreadPoolExecutor(max_workers=max(1, _concurrency), thread_name_prefix="make-outbox") as pool:
+        while not _stop.is_set():
+            _wakeup.clear()
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + _purge_interval_sec
+                try:
+                    purged = purge_delivered()
+                    if purged:
+                        logger.info("Outbox purged %d delivered rows", purged)
+                except Exception:
+                    logger.exception("Outbox purge failed")
+            try:
+                rows = _claim_due(max(1, _concurrency))
+                if rows:
+                    list(pool.map(lambda r: run_in_pool("make-outbox", _deliver, r), rows))
+                    continue
+            except Exception:
+                logger.exception("Outbox worker iteration failed")
+            _wakeup.wait(_poll_interval_sec)
+
+def start_worker() -> None:
+    """Start the background delivery worker (idempotent)."""
+    global _worker
+    if not os.environ.get("MAKE_OUTBOX_DB_PATH"):
+        logger.warning(
+            "MAKE_OUTBOX_DB_PATH is not set; the Make outbox is stored in %s. "
+            "Queued notifications do not survive a redeploy unless this is on a persistent disk.",
+            os.path.abspath(_db_path),
+        )
+    _ensure_schema()
+    if _worker is not None and _worker.is_alive():
+        return
+    _stop.clear()
+    _worker = threading.Thread(target=_run, name="make-outbox-worker", daemon=True)
+    _worker.start()
+
+def stop_worker(timeout: float = 10.0) -> None:
+    global _worker
+    _stop.set()
+    _wakeup.set()
+    if _worker is not None:
+        _worker.join(timeout)
+        _worker = None
+
+def dead_letters(limit: int = 100) -> List[Dict[str, Any]]:
+    """Rows that exhausted their retries, newest first."""
+    _ensure_schema()
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT id, idempotency_key, target, attempts, last_error, created_at, updated_at "
+            "FROM make_outbox WHERE status = ? ORDER BY updated_at DESC LIMIT ?",
+            (STATUS_DEAD, limit),
+        ).fetchall()
+    return [dict(r) for r in rows]
@@ -0,0 +1,231 @@
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+import asyncio
+import re
+import threading
+from app.bulkhead import get_bulkhead
+from app.db import run_parallel
+from app.services.hooks.recipient_service import (
+    anotion_recipients,
+    evaluator_recipients,
+    facility_recipients,
+    merge_unique_emails,
+    notion_recipients,
+)
+from app.services.sessions.entity_cache_service import (
+    get_candidate_slot_rows,
+    get_facility_row,
+    get_session_evaluator_rows,
+    get_session_row,
+)
+from app.services.sessions.watermark_service import fetch_session_watermark
+
+# Shared assembly for the Make webhook payloads (evaluator email, facility email,
+# client response notification). Rows are read through a request-scoped identity
+# map, so within one request each entity is fetched at most once, even when a
+# write path (insert_client_response) builds a payload right after its own checks.
+# Each webhook declares what it takes from those rows as a Projection.
+#
+# Notion contact emails are not fetched while the rows load: project_header defers
+# them on the map and they are merged into the payload's facility when the map is
+# resolved. Async routes open the map themselves, run the builder on the supabase
+# bulkhead and then await aresolve_recipients(), so no supabase thread waits on Notion.
+
+SLOT_FIELDS = ("id", "slot_date", "slot_label", "sort_order")
+CLIENT_RESPONSE_SELECT = "id, note, answered_at, selected_candidate_slot_id"
+
+_current: ContextVar[Optional["IdentityMap"]] = ContextVar("payload_identity_map", default=None)
+
+class IdentityMap:
+    """
+    Rows loaded during one request, keyed by (kind, id). Rows are shared, not copied:
+    treat them as read-only. A write made after a row was loaded must put() the new
+    row or discard() the old one.
+    """
+    def __init__(self, supabase):
+        self.supabase = supabase
+        self._rows: Dict[Tuple[str, Hashable], Any] = {}
+        self._notion: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._watermark_locks: Dict[int, threading.Lock] = {}
+
+    def _get(self, kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            if (kind, key) in self._rows:
+                return self._rows[(kind, key)]
+        value = loader()
+        with self._lock:
+            return self._rows.setdefault((kind, key), value)
+
+    def put(self, kind: str, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._rows[(kind, key)] = value
+
+    def discard(self, kind: str, key: Hashable) -> None:
+        with self._lock:
+            self._rows.pop((kind, key), None)
+
+    def defer_notion_recipients(self, notion_url: str, facility: Dict[str, Any]) -> None:
+        """Merge the Notion page's contact emails into facility["contact_emails"] on resolve."""
+        with self._lock:
+            self._notion.setdefault(notion_url, []).append(facility)
+
+    def _take_notion(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            pending, self._notion = self._notion, {}
+        return pending
+
+    def watermark(self, session_id: int) -> Optional[str]:
+        """The session watermark, fetched once per request even when the first reads run in parallel."""
+        with self._lock:
+            lock = self._watermark_locks.setdefault(int(session_id), threading.Lock())
+        with lock:
+            return self._get("watermark", int(session_id), lambda: fetch_session_watermark(self.supabase, session_id))
+
+    def session(self, session_id: int) -> Dict[str, Any]:
+        return self._get("session", int(session_id), lambda: get_session_row(
+            self.supabase, session_id, self.watermark(session_id)))
+
+    def facility(self, session_id: int, facility_id: int) -> Dict[str, Any]:
+        return self._get("facility", int(facility_id), lambda: get_facility_row(
+            self.supabase, facility_id, session_id=session_id, watermark=self.watermark(session_id)))
+
+    def session_evaluators(self, session_id: int) -> List[Dict[str, Any]]:
+        return self._get("session_evaluators", int(session_id), lambda: get_session_evaluator_rows(
+            self.supabase, session_id, self.watermark(session_id)))
+
+    def candidate_slots(self, session_id: int) -> List[Dict[str, Any]]:
+        return self._get("candidate_slots", int(session_id), lambda: get_candidate_slot_rows(
+            self.supabase, session_id, self.watermark(session_id)))
+
+    def candidate_slot(self, session_id: int, slot_id: int) -> Optional[Dict[str, Any]]:
+        for slot in self.candidate_slots(session_id):
+            if int(slot["id"]) == int(slot_id):
+                return slot
+        return None
+
+    def client_response(self, session_id: int) -> Optional[Dict[str, Any]]:
+        def load() -> Optional[Dict[str, Any]]:
+            rows = (
+                self.supabase.table("client_responses")
+                .select(CLIENT_RESPONSE_SELECT)
+                .eq("session_id", session_id)
+                .limit(1)
+                .execute()
+            ).data or []
+            return rows[0] if rows else None
+        return self._get("client_response", int(session_id), load)
+
+@contextmanager
+def identity_map(supabase) -> Iterator[IdentityMap]:
+    """Open the identity map for this request, or join the one an outer call already opened."""
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+    imap = IdentityMap(supabase)
+    token = _current.set(imap)
+    try:
+        yield imap
+        # Sync callers that own the map: whatever was not resolved yet is fetched here
+        resolve_recipients(imap)
+    finally:
+        _current.reset(token)
+
+def _merge_notion(facilities: List[Dict[str, Any]], emails: List[str]) -> None:
+    for facility in facilities:
+        facility["contact_emails"] = merge_unique_emails(facility.get("contact_emails"), emails)
+
+def resolve_recipients(imap: IdentityMap) -> None:
+    """Merge deferred Notion emails, blocking on the notion bulkhead (never call from a bulkhead thread)."""
+    for url, facilities in imap._take_notion().items():
+        _merge_notion(facilities, notion_recipients(url))
+
+async def aresolve_recipients(imap: IdentityMap) -> None:
+    """Merge deferred Notion emails; each distinct page is fetched once, concurrently."""
+    pending = imap._take_notion()
+    if not pending:
+        return
+    results = await asyncio.gather(*(anotion_recipients(url) for url in pending))
+    for facilities, emails in zip(pending.values(), results):
+        _merge_notion(facilities, emails)
+
+async def abuild_payload(supabase, build: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a sync builder (build(supabase, ...)) on the supabase bulkhead inside a fresh
+    identity map, then resolve its deferred Notion recipients on the notion bulkhead.
+    """
+    with identity_map(supabase) as imap:
+        result = await get_bulkhead("supabase").run(build, supabase, *args, **kwargs)
+        await aresolve_recipients(imap)
+        return result
+
+class Projection:
+    """
+    What one webhook takes from the loaded rows for the shared header:
+      evaluator_fields: keys of each evaluators[] entry, from id, name, email (list), invite_token
+      include_unlinked_evaluators: keep session_evaluators whose evaluator row is missing
+      single_line_facility_name: collapse newlines in facility.name
+    """
+    def __init__(
+        self,
+        *,
+        evaluator_fields: Tuple[str, ...],
+        include_unlinked_evaluators: bool = False,
+        single_line_facility_name: bool = False,
+    ):
+        self.evaluator_fields = evaluator_fields
+        self.include_unlinked_evaluators = include_unlinked_evaluators
+        self.single_line_facility_name = single_line_facility_name
+
+def _single_line(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return text
+    return re.sub(r"[\r\n]+", " ", text).strip()
+
+def _evaluator_entry(se: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    ev = se.get("evaluator") or {}
+    values = {
+        "id": se["evaluator_id"],
+        "name": ev.get("name"),
+        "email": evaluator_recipients(ev),
+        "invite_token": se.get("invite_token"),
+    }
+    return {k: values[k] for k in fields}
+
+def project_slot(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: row.get(k) for k in SLOT_FIELDS}
+
+def project_header(imap: IdentityMap, session_id: int, projection: Projection) -> Dict[str, Any]:
+    """
+    session / facility / evaluators part common to every webhook. facility.contact_emails
+    holds the DB addresses until the map's deferred Notion lookup is resolved.
+    """
+    s = imap.session(session_id)
+    f, se_rows = run_parallel(
+        lambda: imap.facility(session_id, s["facility_id"]),
+        lambda: imap.session_evaluators(session_id),
+    )
+    name = f.get("name")
+    facility = {
+        "name": _single_line(name) if projection.single_line_facility_name else name,
+        "contact_name": f.get("contact_name"),
+        "contact_emails": facility_recipients(f),
+        "notion_url": f.get("notion_url"),
+    }
+    notion_url = f.get("notion_url") or s.get("notion_url")
+    if notion_url:
+        imap.defer_notion_recipients(notion_url, facility)
+    return {
+        "session_id": s["id"],
+        "purpose": s.get("purpose"),
+        "response_deadline": s.get("response_deadline"),
+        "presentation_date": s.get("presentation_date"),
+        "facility": facility,
+        "evaluators": [
+            _evaluator_entry(se, projection.evaluator_fields)
+            for se in se_rows
+            if projection.include_unlinked_evaluators or se.get("evaluator")
+        ],
+    }
@@ -0,0 +1,110 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import Future
+from functools import lru_cache
+import os
+import re
+from app.bulkhead import get_bulkhead
+from app.services.notion.facility_info_service import fetch_facility_info
+
+# Recipient resolution shared by the Make payload builders and reminder mail.
+# contact_email / evaluators.email are free text ("a@x.jp、b@y.jp\nc@z.jp; ..."),
+# so parsed address lists are memoized by raw text (bounded LRU).
+_memo_size = int(os.environ.get("RECIPIENT_MEMO_MAXSIZE", "4096"))
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}", re.IGNORECASE)
+_SEPARATORS = str.maketrans({"\r": " ", "\n": " ", "、": " ", ";": " ", ",": " "})
+
+@lru_cache(maxsize=_memo_size)
+def _parse(text: str) -> Tuple[str, ...]:
+    return tuple(m.strip() for m in _EMAIL_RE.findall(text.translate(_SEPARATORS)))
+
+def extract_emails(text: Optional[str]) -> List[str]:
+    """Extract all emails from arbitrary text (handles commas/newlines/etc)."""
+    if not text:
+        return []
+    return list(_parse(text))
+
+def merge_unique_emails(*lists: Optional[List[str]]) -> List[str]:
+    """Merge and deduplicate multiple email lists (case-insensitive, first spelling kept)."""
+    seen, out = set(), []
+    for lst in lists:
+        for e in lst or []:
+            k = e.strip().lower()
+            if k and k not in seen:
+                seen.add(k)
+                out.append(e.strip())
+    return out
+
+def _notion_emails(info: Dict[str, Any]) -> List[str]:
+    return extract_emails((info.get("contact_person") or {}).get("email"))
+
+def _submit_notion(notion_url: str) -> Optional[Future]:
+    try:
+        return get_bulkhead("notion").submit(fetch_facility_info, notion_url)
+    except Exception:
+        return None
+
+def _notion_result(future: Optional[Future]) -> List[str]:
+    # Notion is best effort: on any failure (including a saturated bulkhead) the DB emails are used
+    if future is None:
+        return []
+    try:
+        return _notion_emails(future.result())
+    except Exception:
+        return []
+
+def notion_recipients(notion_url: str) -> List[str]:
+    """Contact emails of a facility's Notion page; [] on any failure. Blocks on the notion bulkhead."""
+    return _notion_result(_submit_notion(notion_url))
+
+async def anotion_recipients(notion_url: str) -> List[str]:
+    """notion_recipients() for async callers: awaits the notion bulkhead without holding a thread."""
+    try:
+        return _notion_emails(await get_bulkhead("notion").run(fetch_facility_info, notion_url))
+    except Exception:
+        return []
+
+def evaluator_recipients(evaluator: Dict[str, Any]) -> List[str]:
+    return extract_emails(evaluator.get("email"))
+
+def facility_recipients(facility: Dict[str, Any], *, notion_url: Optional[str] = None) -> List[str]:
+    """DB contact_email merged with the contact emails of the facility's Notion page (if any)."""
+    notion_emails = notion_recipients(notion_url) if notion_url else []
+    return merge_unique_emails(extract_emails(facility.get("contact_email")), notion_emails)
+
+def resolve_recipients_batch(
+    *,
+    facilities: Iterable[Tuple[Any, Dict[str, Any], Optional[str]]] = (),
+    evaluators: Iterable[Tuple[Any, Dict[str, Any]]] = (),
+) -> Dict[str, Dict[Any, List[str]]]:
+    """
+    Resolve many recipients at once.
+      facilities: (key, facility row, notion_url or None)
+      evaluators: (key, evaluator row)
+    Each distinct Notion page is fetched once, concurrently on the notion bulkhead.
+    Returns {"facilities": {key: [...]}, "evaluators": {key: [...]}}.
+    """
+    facilities = list(facilities)
+    futures = {
+        url: _submit_notion(url)
+        for url in dict.fromkeys(url for _, _, url in facilities if url)
+    }
+    notion = {url: _notion_result(f) for url, f in futures.items()}
+    return {
+        "facilities": {
+            key: merge_unique_emails(extract_emails(row.get("contact_email")), notion.get(url) if url else None)
+            for key, row, url in facilities
+        },
+        "evaluators": {key: evaluator_recipients(row) for key, row in evaluators},
+    }
+
+def recipient_memo_stats() -> Dict[str, Any]:
+    info = _parse.cache_info()
+    total = info.hits + info.misses
+    return {
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_ratio": (info.hits / total) if total else 0.0,
+    }
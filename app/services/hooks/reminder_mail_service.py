@@ -1,21 +1,6 @@
 from datetime import date
 from typing import Any, Dict, List, Optional
-import re
-
-_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}", re.IGNORECASE)
-
-def _extract_emails(text: str) -> List[str]:
-    """Extract all emails from arbitrary text (handles commas/newlines/etc)."""
-    if not text:
-        return []
-    norm = (
-        text.replace("\r\n", " ")
-            .replace("\n", " ")
-            .replace("、", " ")
-            .replace(";", " ")
-            .replace(",", " ")
-    )
-    return [m.strip() for m in _EMAIL_RE.findall(norm)]
+from app.services.hooks.recipient_service import resolve_recipients_batch
 
 def fetch_due_reminders(supabase, as_of_date: Optional[str] = None) -> List[Dict[str, Any]]:
     """
@@ -48,6 +33,16 @@ def fetch_due_reminders(supabase, as_of_date: Optional[str] = None) -> List[Dict
         .execute()
     ).data or []
 
+    # Reminders use the DB addresses only (no Notion lookup)
+    resolved = resolve_recipients_batch(
+        facilities=((s["id"], s.get("facility") or {}, None) for s in rows),
+        evaluators=(
+            (se["id"], se.get("evaluator") or {})
+            for s in rows
+            for se in s.get("session_evaluators") or []
+        ),
+    )
+
     sessions_grouped: List[Dict[str, Any]] = []
 
     for s in rows:
@@ -72,7 +67,7 @@ def fetch_due_reminders(supabase, as_of_date: Optional[str] = None) -> List[Dict
             for se in se_list:
                 if se.get("answered_at") is None and se.get("evaluator_form_view_url"):
                     ev = se.get("evaluator") or {}
-                    emails = _extract_emails(ev.get("email") or "")
+                    emails = resolved["evaluators"][se["id"]]
                     evaluators_section.append({
                         "evaluator_name": ev.get("name"),
                         "evaluator_email": emails,
@@ -86,7 +81,7 @@ def fetch_due_reminders(supabase, as_of_date: Optional[str] = None) -> List[Dict
             # No response → send reminder
             if len(cr_list) == 0:
                 if form_view_url:
-                    recipients = _extract_emails(facility.get("contact_email") or "")
+                    recipients = resolved["facilities"][s["id"]]
                     facility_section.append({
                         "contact_name": facility.get("contact_name"),
                         "contact_emails": recipients,
@@ -98,7 +93,7 @@ def fetch_due_reminders(supabase, as_of_date: Optional[str] = None) -> List[Dict
                 has_unanswered = any(cr.get("answered_at") is None for cr in cr_list)
 
                 if has_unanswered and form_view_url:
-                    recipients = _extract_emails(facility.get("contact_email") or "")
+                    recipients = resolved["facilities"][s["id"]]
                     facility_section.append({
                         "contact_name": facility.get("contact_name"),
                         "contact_emails": recipients,
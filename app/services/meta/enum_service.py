@@ -0,0 +1,78 @@
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# purpose_enum / status_enum values, loaded at startup and refreshed every
+# ENUM_REFRESH_SECONDS. This is the single source for validating purpose/status.
+_refresh_sec = float(os.environ.get("ENUM_REFRESH_SECONDS", "3600"))
+
+_lock = threading.Lock()
+_values: Optional[Dict[str, List[str]]] = None
+_loaded_at: Optional[float] = None
+
+def refresh_interval_seconds() -> float:
+    return _refresh_sec
+
+def load_enums(supabase) -> Dict[str, List[str]]:
+    """Read both enums from the database and replace the cached values."""
+    global _values, _loaded_at
+    purpose = supabase.rpc("purpose_enum_values").execute().data or []
+    status = supabase.rpc("status_enum_values").execute().data or []
+    values = {"purpose": [str(p) for p in purpose], "status": [str(s) for s in status]}
+    with _lock:
+        _values = values
+        _loaded_at = time.monotonic()
+    return values
+
+def get_enums(supabase) -> Dict[str, List[str]]:
+    """
+    Cached {"purpose": [...], "status": [...]}. Reloads after the refresh interval;
+    if that reload fails the previous values keep being served.
+    """
+    with _lock:
+        values, loaded_at = _values, _loaded_at
+    if values is not None and loaded_at is not None and time.monotonic() - loaded_at <= _refresh_sec:
+        return {k: list(v) for k, v in values.items()}
+    try:
+        values = load_enums(supabase)
+    except Exception:
+        if values is None:
+            raise
+        logger.warning("Enum refresh failed; serving cached values", exc_info=True)
+    return {k: list(v) for k, v in values.items()}
+
+def is_member(supabase, kind: str, value: str) -> Optional[bool]:
+    """
+    Whether `value` is one of the `kind` ("purpose" | "status") enum values, loading
+    them if needed; None when they cannot be loaded (the caller decides what to skip).
+    """
+    try:
+        values = get_enums(supabase)[kind]
+    except Exception:
+        logger.warning("Enum values unavailable; %s not validated", kind, exc_info=True)
+        return None
+    return value in values
+
+def validate_purpose(supabase, value: str) -> str:
+    if value not in get_enums(supabase)["purpose"]:
+        raise ValueError("Invalid purpose")
+    return value
+
+def validate_status(supabase, value: str) -> str:
+    if value not in get_enums(supabase)["status"]:
+        raise ValueError("Invalid status")
+    return value
+
+def preload(get_client: Callable[[], Any]) -> None:
+    """
+    Best-effort load at startup; a failure (including a client that cannot be
+    built, e.g. missing SUPABASE_URL) is retried on first use.
+    """
+    try:
+        load_enums(get_client())
+    except Exception:
+        logger.warning("Enum preload failed", exc_info=True)
@@ -1,18 +1,110 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pydantic import HttpUrl
-from notion_client import Client
-import os, re
+from notion_client import Client, APIErrorCode, APIResponseError
+from app.cache import TTLCache
+from app.metrics import register_pool, run_in_pool, track_dependency
+import copy, os, re, threading, time
 
 # Notion property names on the "facility" row
 PROP_FACILITY_NAME = "facility name"
 PROP_CONTACT = "担当者名"
 PROP_CONTACT_MAIL = "Mail"
 
-# Notion client
-_token = os.environ.get("NOTION_API_TOKEN")
-if not _token:
-    raise RuntimeError("NOTION_API_TOKEN is not set")
-_notion = Client(auth=_token)
+# Notion client, built on first use so a missing token only fails Notion calls
+@lru_cache(maxsize=1)
+def _get_notion() -> Client:
+    token = os.environ.get("NOTION_API_TOKEN")
+    if not token:
+        raise RuntimeError("NOTION_API_TOKEN is not set")
+    return Client(auth=token)
+
+# Notion allows an average of ~3 requests/second per integration
+NOTION_RATE_PER_SEC = float(os.environ.get("NOTION_RATE_PER_SEC", "3"))
+NOTION_BURST = int(os.environ.get("NOTION_BURST", "3"))
+NOTION_FETCH_CONCURRENCY = int(os.environ.get("NOTION_FETCH_CONCURRENCY", "4"))
+NOTION_MAX_RETRIES = int(os.environ.get("NOTION_MAX_RETRIES", "3"))
+_DEFAULT_RETRY_AFTER_SEC = 1.0
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket shared by every Notion call in this process.
+    `pause()` pushes the next grant out, e.g. to honor a 429 Retry-After.
+    """
+    def __init__(self, rate: float, capacity: int):
+        self._rate = max(rate, 0.001)
+        self._capacity = max(capacity, 1)
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._blocked_until:
+                    self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._rate
+                else:
+                    wait = self._blocked_until - now
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._blocked_until:
+                self._blocked_until = until
+                self._tokens = 0.0
+                self._updated = until
+
+_bucket = _TokenBucket(NOTION_RATE_PER_SEC, NOTION_BURST)
+
+# Facility info cache keyed by normalized page id.
+# Expired entries are revalidated against the page's last_edited_time before
+# the related evaluator pages are fetched again. Editing a related evaluator page
+# does not touch the facility page's last_edited_time, so entries older than
+# FACILITY_INFO_MAX_AGE_SECONDS are always rebuilt from scratch.
+_facility_cache = TTLCache(
+    "notion_facility_info",
+    maxsize=int(os.environ.get("FACILITY_INFO_CACHE_MAXSIZE", "256")),
+    ttl_seconds=float(os.environ.get("FACILITY_INFO_CACHE_TTL_SECONDS", "300")),
+)
+FACILITY_INFO_MAX_AGE_SECONDS = float(os.environ.get("FACILITY_INFO_MAX_AGE_SECONDS", "3600"))
+# fetch_facility_info runs on pool threads, so the counter is guarded like the cache
+_revalidated_lock = threading.Lock()
+_revalidated = 0
+
+@lru_cache(maxsize=1)
+def _get_fetch_pool() -> ThreadPoolExecutor:
+    register_pool("notion-fetch", max(1, NOTION_FETCH_CONCURRENCY))
+    return ThreadPoolExecutor(max_workers=max(1, NOTION_FETCH_CONCURRENCY), thread_name_prefix="notion-fetch")
+
+def _retry_after_seconds(err: APIResponseError) -> float:
+    raw = (getattr(err, "headers", None) or {}).get("retry-after")
+    try:
+        return max(float(raw), 0.0)
+    except (TypeError, ValueError):
+        return _DEFAULT_RETRY_AFTER_SEC
+
+def _retrieve_page(page_id: str) -> Dict[str, Any]:
+    """pages.retrieve through the shared rate limiter, retrying on 429 after Retry-After."""
+    attempt = 0
+    while True:
+        _bucket.acquire()
+        try:
+            with track_dependency("notion", "pages.retrieve"):
+                return _get_notion().pages.retrieve(page_id=page_id)
+        except APIResponseError as e:
+            if e.code != APIErrorCode.RateLimited or attempt >= NOTION_MAX_RETRIES:
+                raise
+            attempt += 1
+            _bucket.pause(_retry_after_seconds(e))
 
 # Regex to match both 32-hex and 36-uuid Notion IDs
 _UUID_32_OR_36 = re.compile(r"[0-9a-fA-F]{32}|[0-9a-fA-F-]{36}")
@@ -91,35 +183,40 @@ def _related_page_ids(props: Dict[str, Any]) -> List[str]:
                 ordered.append(pid_norm)
     return ordered
 
-def fetch_facility_info(notion_url: HttpUrl) -> Dict[str, Any]:
-    """Return { facility_name, contact_person: {name,email}, evaluators: [{name,email}...] }"""
-    page_id = normalize_id(str(notion_url))
-    page = _notion.pages.retrieve(page_id=page_id)
-    if page.get("object") != "page":
-        raise ValueError("URL must point to a database item (row)")
+def _fetch_evaluator(page_id: str) -> Optional[Tuple[str, str]]:
+    """Return (name, email) for a related page, or None if it cannot be read."""
+    try:
+        epage = _retrieve_page(page_id)
+    except Exception:
+        return None
+    eprops = epage.get("properties", {}) or {}
+    ename = _extract_title_from_any(eprops) or ""
+    email = _extract_email_from_props(eprops) or ""
+    return ename, email
+
+def _build_facility_info(page_id: str, page: Dict[str, Any]) -> Dict[str, Any]:
     props = page.get("properties", {}) or {}
 
     facility_name = _join_title_plaintext(props, PROP_FACILITY_NAME) or ""
     contact_name = _join_rich_text_plaintext(props, PROP_CONTACT) if PROP_CONTACT in props else ""
     contact_email = _join_rich_text_plaintext(props, PROP_CONTACT_MAIL) if PROP_CONTACT_MAIL in props else ""
 
+    # Related pages are fetched concurrently; failures stay isolated per page
     evaluator_ids = _related_page_ids(props)
+    results = list(_get_fetch_pool().map(lambda eid: run_in_pool("notion-fetch", _fetch_evaluator, eid), evaluator_ids))
+
     evaluators = []
     seen = set()
-    for eid in evaluator_ids:
-        try:
-            epage = _notion.pages.retrieve(page_id=eid)
-            eprops = epage.get("properties", {}) or {}
-            ename  = _extract_title_from_any(eprops) or ""
-            email  = _extract_email_from_props(eprops) or ""
-            dedupe_key = (email or eid).lower()
-            if dedupe_key in seen:
-                continue
-            seen.add(dedupe_key)
-            if ename or email:
-                evaluators.append({"name": ename, "email": email})
-        except Exception:
+    for eid, result in zip(evaluator_ids, results):
+        if result is None:
+            continue
+        ename, email = result
+        dedupe_key = (email or eid).lower()
+        if dedupe_key in seen:
             continue
+        seen.add(dedupe_key)
+        if ename or email:
+            evaluators.append({"name": ename, "email": email})
 
     return {
         "notion_page_id": page_id,
@@ -127,3 +224,40 @@ def fetch_facility_info(notion_url: HttpUrl) -> Dict[str, Any]:
         "contact_person": {"name": contact_name, "email": contact_email},
         "evaluators": evaluators,
     }
+
+def fetch_facility_info(notion_url: HttpUrl) -> Dict[str, Any]:
+    """Return { facility_name, contact_person: {name,email}, evaluators: [{name,email}...] }"""
+    global _revalidated
+    page_id = normalize_id(str(notion_url))
+
+    cached = _facility_cache.get(page_id)
+    if cached is not None:
+        return copy.deepcopy(cached["info"])
+
+    page = _retrieve_page(page_id)
+    if page.get("object") != "page":
+        raise ValueError("URL must point to a database item (row)")
+
+    last_edited = page.get("last_edited_time")
+    stale = _facility_cache.peek(page_id)
+    if (
+        stale is not None
+        and last_edited
+        and stale["last_edited_time"] == last_edited
+        and time.monotonic() - stale["fetched_at"] < FACILITY_INFO_MAX_AGE_SECONDS
+    ):
+        _facility_cache.set(page_id, stale)
+        with _revalidated_lock:
+            _revalidated += 1
+        return copy.deepcopy(stale["info"])
+
+    fetched_at = time.monotonic()
+    info = _build_facility_info(page_id, page)
+    _facility_cache.set(page_id, {"last_edited_time": last_edited, "fetched_at": fetched_at, "info": info})
+    return copy.deepcopy(info)
+
+def facility_info_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the facility info cache; `revalidated` counts misses served after a last_edited_time check."""
+    with _revalidated_lock:
+        revalidated = _revalidated
+    return {**_facility_cache.stats(), "revalidated": revalidated}
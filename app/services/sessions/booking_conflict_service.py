@@ -0,0 +1,272 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+import asyncio
+import logging
+import os
+import threading
+import time
+
+# In-process index of confirmed bookings per evaluator, built from
+# client_responses.selected_candidate_slot_id -> candidate_slots.slot_date and the
+# session's evaluators. Each evaluator maps to a list sorted by slot date, so lookups
+# and inserts find their position by bisect (O(log n) comparisons). Rebuilt every
+# BOOKING_INDEX_REFRESH_SECONDS and updated incrementally when a client response is
+# saved in this worker.
+# Only the first build blocks a request; later rebuilds run in the background while
+# the current index keeps serving. Rebuilds are single-flight, back off after a
+# failure (which is logged), and replay confirmations recorded while their load was running.
+_refresh_sec = float(os.environ.get("BOOKING_INDEX_REFRESH_SECONDS", "300"))
+_retry_base_sec = float(os.environ.get("BOOKING_INDEX_RETRY_BASE_SECONDS", "5"))
+_retry_max_sec = float(os.environ.get("BOOKING_INDEX_RETRY_MAX_SECONDS", "300"))
+_PAGE = 1000
+
+CONFIRMED_SELECT = (
+    "session_id, selected_candidate_slot_id, "
+    "slot: candidate_slots!selected_candidate_slot_id(id, slot_date, slot_label), "
+    "session: sessions(session_evaluators(evaluator_id))"
+)
+
+# evaluator_id -> sorted [(date_ordinal, session_id, slot_id, slot_label)]
+_Booking = Tuple[int, int, int, Optional[str]]
+_lock = threading.Lock()
+_by_evaluator: Dict[int, List[_Booking]] = {}
+# evaluator_id -> session_id -> its booking in _by_evaluator (one confirmed slot per session)
+_session_bookings: Dict[int, Dict[int, _Booking]] = {}
+_built_at: Optional[float] = None
+
+_rebuild_lock = threading.Lock()
+_rebuilding = False
+# record_confirmation() calls made while a rebuild is loading, re-applied on top of it
+_replay: List[Tuple[int, _Booking]] = []
+_failures = 0
+_retry_at = 0.0
+_refresh_task: Optional["asyncio.Task[None]"] = None
+
+logger = logging.getLogger(__name__)
+
+def _ordinal(slot_date: Any) -> Optional[int]:
+    if isinstance(slot_date, date):
+        return slot_date.toordinal()
+    try:
+        return date.fromisoformat(str(slot_date)[:10]).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+def _add_locked(evaluator_id: int, booking: _Booking) -> None:
+    bookings = _by_evaluator.setdefault(evaluator_id, [])
+    by_session = _session_bookings.setdefault(evaluator_id, {})
+    # One confirmed slot per session: drop a previous booking of the same session
+    previous = by_session.get(booking[1])
+    if previous is not None:
+        del bookings[bisect_left(bookings, previous)]
+    by_session[booking[1]] = booking
+    insort(bookings, booking)
+
+def record_confirmation(
+    *,
+    session_id: int,
+    slot_id: int,
+    slot_date: Any,
+    evaluator_ids: Iterable[int],
+    slot_label: Optional[str] = None,
+) -> None:
+    """Add a confirmed slot for every evaluator of the session (call after client_responses writes)."""
+    d = _ordinal(slot_date)
+    if d is None:
+        return
+    booking = (d, int(session_id), int(slot_id), slot_label)
+    with _lock:
+        for eid in evaluator_ids:
+            _add_locked(int(eid), booking)
+            if _rebuilding:
+                _replay.append((int(eid), booking))
+
+def _load_all(supabase) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        page = (
+            supabase.table("client_responses")
+            .select(CONFIRMED_SELECT)
+            .not_.is_("selected_candidate_slot_id", None)
+            .order("session_id", desc=False)
+            .range(start, start + _PAGE - 1)
+            .execute()
+        ).data or []
+        rows.extend(page)
+        if len(page) < _PAGE:
+            return rows
+        start += _PAGE
+
+async def _aload_all(asupabase) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        page = (
+            await asupabase.table("client_responses")
+            .select(CONFIRMED_SELECT)
+            .not_.is_("selected_candidate_slot_id", None)
+            .order("session_id", desc=False)
+            .range(start, start + _PAGE - 1)
+            .execute()
+        ).data or []
+        rows.extend(page)
+        if len(page) < _PAGE:
+            return rows
+        start += _PAGE
+
+def _replace_index(rows: List[Dict[str, Any]]) -> None:
+    global _built_at
+    with _lock:
+        _by_evaluator.clear()
+        _session_bookings.clear()
+        for r in rows:
+            slot = r.get("slot") or {}
+            d = _ordinal(slot.get("slot_date"))
+            if d is None:
+                continue
+            booking = (d, int(r["session_id"]), int(slot["id"]), slot.get("slot_label"))
+            for se in (r.get("session") or {}).get("session_evaluators") or []:
+                _add_locked(int(se["evaluator_id"]), booking)
+        for evaluator_id, booking in _replay:
+            _add_locked(evaluator_id, booking)
+        _built_at = time.monotonic()
+
+def _begin_rebuild() -> bool:
+    global _rebuilding
+    if not _rebuild_lock.acquire(blocking=False):
+        return False
+    with _lock:
+        _rebuilding = True
+        _replay.clear()
+    return True
+
+def _end_rebuild(rows: Optional[List[Dict[str, Any]]]) -> None:
+    """rows: the loaded rows, or None if the load failed."""
+    global _rebuilding, _failures, _retry_at
+    try:
+        if rows is not None:
+            _replace_index(rows)
+        with _lock:
+            if rows is None:
+                _failures += 1
+                _retry_at = time.monotonic() + min(_retry_max_sec, _retry_base_sec * (2 ** (_failures - 1)))
+            else:
+                _failures = 0
+                _retry_at = 0.0
+            _rebuilding = False
+            _replay.clear()
+    finally:
+        _rebuild_lock.release()
+
+def rebuild(supabase) -> bool:
+    """Reload the whole index; False if another rebuild is already running."""
+    if not _begin_rebuild():
+        return False
+    rows = None
+    try:
+        rows = _load_all(supabase)
+    finally:
+        _end_rebuild(rows)
+    return True
+
+async def arebuild(asupabase) -> bool:
+    """rebuild() over the async Supabase client."""
+    if not _begin_rebuild():
+        return False
+    rows = None
+    try:
+        rows = await _aload_all(asupabase)
+    finally:
+        _end_rebuild(rows)
+    return True
+
+def _needs_rebuild() -> bool:
+    now = time.monotonic()
+    if now < _retry_at:
+        return False
+    return _built_at is None or now - _built_at > _refresh_sec
+
+def _refresh_in_background(supabase) -> None:
+    try:
+        rebuild(supabase)
+    except Exception:
+        logger.warning("Booking index refresh failed; serving the stale index", exc_info=True)
+
+async def _arefresh(asupabase) -> None:
+    try:
+        await arebuild(asupabase)
+    except Exception:
+        logger.warning("Booking index refresh failed; serving the stale index", exc_info=True)
+
+def _ensure_fresh(supabase) -> None:
+    """First build in the caller (failures logged), later rebuilds in a background thread."""
+    if not _needs_rebuild():
+        return
+    if _built_at is None:
+        _refresh_in_background(supabase)
+        return
+    if _rebuilding:
+        return
+    threading.Thread(
+        target=_refresh_in_background, args=(supabase,), name="booking-index-refresh", daemon=True
+    ).start()
+
+async def aensure_fresh(asupabase) -> None:
+    """_ensure_fresh for async callers: later rebuilds run as a task on the event loop."""
+    global _refresh_task
+    if not _needs_rebuild():
+        return
+    if _built_at is None:
+        await _arefresh(asupabase)
+        return
+    if _rebuilding or (_refresh_task is not None and not _refresh_task.done()):
+        return
+    _refresh_task = asyncio.get_running_loop().create_task(_arefresh(asupabase))
+
+def _lookup_locked(evaluator_id: int, d: int, exclude_session_id: int) -> List[_Booking]:
+    bookings = _by_evaluator.get(evaluator_id)
+    if not bookings:
+        return []
+    lo = bisect_left(bookings, (d,))
+    hi = bisect_right(bookings, (d + 1,))
+    return [b for b in bookings[lo:hi] if b[0] == d and b[1] != exclude_session_id]
+
+def find_conflicts(
+    supabase,
+    *,
+    session_id: int,
+    checks: Iterable[Tuple[int, int, Any, str]],
+) -> List[Dict[str, Any]]:
+    """
+    checks: (evaluator_id, slot_id, slot_date, kind) tuples, where kind is
+    'answer' (a ○ answer) or 'confirmed' (this session's confirmed slot).
+    Returns one entry per collision with another session's confirmed slot on the same date.
+    """
+    _ensure_fresh(supabase)
+    return lookup_conflicts(session_id=session_id, checks=checks)
+
+def lookup_conflicts(
+    *,
+    session_id: int,
+    checks: Iterable[Tuple[int, int, Any, str]],
+) -> List[Dict[str, Any]]:
+    """find_conflicts against the index as it is (async callers refresh it with aensure_fresh first)."""
+    out: List[Dict[str, Any]] = []
+    with _lock:
+        for evaluator_id, slot_id, slot_date, kind in checks:
+            d = _ordinal(slot_date)
+            if d is None:
+                continue
+            for _, other_session_id, other_slot_id, other_label in _lookup_locked(int(evaluator_id), d, int(session_id)):
+                out.append({
+                    "evaluator_id": evaluator_id,
+                    "slot_id": slot_id,
+                    "slot_date": date.fromordinal(d).isoformat(),
+                    "kind": kind,
+                    "other_session_id": other_session_id,
+                    "other_slot_id": other_slot_id,
+                    "other_slot_label": other_label,
+                })
+    return out
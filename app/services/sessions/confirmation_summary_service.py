@@ -1,22 +1,29 @@
 from typing import Optional, Dict, Any
+from app.services.sessions.entity_cache_service import get_confirmation_summary
 
 def fetch_confirmation_summary(
     supabase,
     *,
     session_id: int,
+    watermark: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Returns the latest confirmation summary row for the given session_id,
-    or None if no row exists.
+    or None if no row exists. Cached per session `watermark` when given.
     """
-    res = (
-        supabase
-        .table("session_confirmation_summary_v")
-        .select("*")
-        .eq("session_id", session_id)
-        .order("client_answered_at", desc=True, nullsfirst=False)
-        .limit(1)
-        .execute()
-    )
-    rows = res.data or []
-    return rows[0] if rows else None
+    def load() -> Optional[Dict[str, Any]]:
+        res = (
+            supabase
+            .table("session_confirmation_summary_v")
+            .select("*")
+            .eq("session_id", session_id)
+            .order("client_answered_at", desc=True, nullsfirst=False)
+            .limit(1)
+            .execute()
+        )
+        rows = res.data or []
+        return rows[0] if rows else None
+
+    if watermark:
+        return get_confirmation_summary(session_id, watermark, load)
+    return load()
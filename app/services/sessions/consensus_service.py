@@ -0,0 +1,101 @@
+from typing import Any, Dict, List
+from array import array
+import asyncio
+from app.db import chunked
+
+# One embedded select gives slots, session_evaluators and all their responses
+CONSENSUS_SELECT = (
+    "id, "
+    "candidate_slots(id, slot_date, slot_label, sort_order), "
+    "session_evaluators(id, evaluator_responses(candidate_slot_id, choice))"
+)
+MAX_BATCH_SESSIONS = 500
+
+# Column index per choice in the flat counts array
+_CHOICE_COLUMN = {"O": 0, "M": 1, "X": 2}
+
+def _score_session(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Score every candidate slot of one session in a single pass.
+    counts is a flat (n_slots x 3) array of ○/△/x tallies.
+    """
+    slots = sorted(row.get("candidate_slots") or [], key=lambda s: (s.get("sort_order") is None, s.get("sort_order")))
+    se_rows = row.get("session_evaluators") or []
+    n_eval = len(se_rows)
+    slot_pos = {int(s["id"]): i for i, s in enumerate(slots)}
+
+    counts = array("I", [0]) * (3 * len(slots))
+    for se in se_rows:
+        for r in se.get("evaluator_responses") or []:
+            pos = slot_pos.get(int(r["candidate_slot_id"]))
+            col = _CHOICE_COLUMN.get(str(r.get("choice") or "").upper())
+            if pos is not None and col is not None:
+                counts[pos * 3 + col] += 1
+
+    scored: List[Dict[str, Any]] = []
+    for i, s in enumerate(slots):
+        ok, maybe, ng = counts[i * 3], counts[i * 3 + 1], counts[i * 3 + 2]
+        scored.append({
+            "slot_id": s["id"],
+            "slot_date": s.get("slot_date"),
+            "slot_label": s.get("slot_label"),
+            "sort_order": s.get("sort_order"),
+            "ok": ok,
+            "maybe": maybe,
+            "ng": ng,
+            "unanswered": n_eval - ok - maybe - ng,
+            "everyone_ok": n_eval > 0 and ok == n_eval,
+        })
+
+    # Rank: everyone ○ first, then fewest x, most ○, most △, earliest slot
+    ranked = sorted(
+        range(len(scored)),
+        key=lambda i: (not scored[i]["everyone_ok"], scored[i]["ng"], -scored[i]["ok"], -scored[i]["maybe"], i),
+    )
+    for rank, i in enumerate(ranked, start=1):
+        scored[i]["rank"] = rank
+
+    return {
+        "session_id": row["id"],
+        "evaluator_count": n_eval,
+        "slots": scored,
+        "recommended_slot_id": scored[ranked[0]]["slot_id"] if ranked else None,
+    }
+
+def _consensus_query(supabase, session_id: int):
+    return (
+        supabase.table("sessions")
+        .select(CONSENSUS_SELECT)
+        .eq("id", session_id)
+        .single()
+    )
+
+def _batch_ids(session_ids: List[int]) -> List[int]:
+    ids = list(dict.fromkeys(int(s) for s in session_ids))
+    if len(ids) > MAX_BATCH_SESSIONS:
+        raise ValueError(f"At most {MAX_BATCH_SESSIONS} sessions per batch")
+    return ids
+
+def _score_batch(ids: List[int], rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_id = {int(r["id"]): r for r in rows}
+    return [_score_session(by_id[sid]) for sid in ids if sid in by_id]
+
+async def afetch_slot_consensus(asupabase, session_id: int) -> Dict[str, Any]:
+    """Score all candidate slots of a session from one responses fetch."""
+    res = await _consensus_query(asupabase, session_id).execute()
+    if not res.data:
+        raise ValueError(f"Session {session_id} not found")
+    return _score_session(res.data)
+
+async def afetch_slot_consensus_batch(asupabase, session_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    Score many sessions with one query per IN_FILTER_CHUNK ids (run concurrently);
+    results follow the order of `session_ids`, unknown ids are skipped.
+    """
+    ids = _batch_ids(session_ids)
+    if not ids:
+        return []
+    results = await asyncio.gather(*(
+        asupabase.table("sessions").select(CONSENSUS_SELECT).in_("id", chunk).execute() for chunk in chunked(ids)
+    ))
+    return _score_batch(ids, [r for res in results for r in (res.data or [])])
@@ -0,0 +1,158 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+import copy
+import os
+import threading
+from app.cache import TTLCache
+
+# Process-local read-through cache for the session/facility/evaluator/slot rows that
+# status, confirmation-summary and the Make payload builders read repeatedly.
+# Every entry is tied to the session watermark (see watermark_service) it was read
+# under and is only served to a reader holding the same watermark, so a write made by
+# another worker is seen on the next read instead of after the TTL. Write paths still
+# call invalidate_session() after their writes to drop the superseded entries.
+_ttl_sec = float(os.environ.get("ENTITY_CACHE_TTL_SECONDS", "30"))
+_maxsize = int(os.environ.get("ENTITY_CACHE_MAXSIZE", "1024"))
+
+SESSION_SELECT = "id, facility_id, purpose, status, response_deadline, presentation_date, notion_url"
+FACILITY_SELECT = "id, name, contact_name, contact_email, notion_url"
+SESSION_EVALUATORS_SELECT = "id, evaluator_id, invite_token, evaluator: evaluators(id, name, email)"
+CANDIDATE_SLOTS_SELECT = "id, slot_date, slot_label, sort_order"
+
+# Keyed by session_id, holding (watermark, rows). The facility is cached per session:
+# the session watermark covers facilities.updated_at, so an upsert of a shared
+# facility (create_session_with_notion) invalidates it for every session that uses it.
+_sessions = TTLCache("entity_session", maxsize=_maxsize, ttl_seconds=_ttl_sec)
+_facilities = TTLCache("entity_session_facility", maxsize=_maxsize, ttl_seconds=_ttl_sec)
+_session_evaluators = TTLCache("entity_session_evaluators", maxsize=_maxsize, ttl_seconds=_ttl_sec)
+_candidate_slots = TTLCache("entity_candidate_slots", maxsize=_maxsize, ttl_seconds=_ttl_sec)
+# Keyed by (session_id, watermark), so an entry can never outlive the data it was read from
+_status_rows = TTLCache("entity_status_row", maxsize=_maxsize, ttl_seconds=_ttl_sec)
+_confirmation_summaries = TTLCache("entity_confirmation_summary", maxsize=_maxsize, ttl_seconds=_ttl_sec)
+
+_SESSION_SCOPED = (_sessions, _facilities, _session_evaluators, _candidate_slots)
+
+# Bumped by every invalidation. A load that raced with an invalidation is returned
+# to its caller but not stored, so a read that started before a write cannot
+# repopulate the cache with pre-write rows.
+_lock = threading.Lock()
+_invalidations = 0
+
+def _read_through(cache: TTLCache, key: Hashable, loader: Callable[[], Any]) -> Any:
+    with _lock:
+        seq = _invalidations
+    cached = cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    value = loader()
+    if value is not None:
+        with _lock:
+            if _invalidations == seq:
+                cache.set(key, value)
+    return copy.deepcopy(value)
+
+async def _aread_through(cache: TTLCache, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+    with _lock:
+        seq = _invalidations
+    cached = cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    value = await loader()
+    if value is not None:
+        with _lock:
+            if _invalidations == seq:
+                cache.set(key, value)
+    return copy.deepcopy(value)
+
+def _read_at(cache: TTLCache, session_id: int, watermark: Optional[str], loader: Callable[[], Any]) -> Any:
+    """Rows of the session as of `watermark`; without one (unknown session) nothing is cached."""
+    if not watermark:
+        return loader()
+    with _lock:
+        seq = _invalidations
+    cached = cache.get(int(session_id))
+    if cached is not None and cached[0] == watermark:
+        return copy.deepcopy(cached[1])
+    value = loader()
+    if value is not None:
+        with _lock:
+            if _invalidations == seq:
+                cache.set(int(session_id), (watermark, value))
+    return copy.deepcopy(value)
+
+def _bump() -> None:
+    global _invalidations
+    with _lock:
+        _invalidations += 1
+
+def invalidate_session(session_id: int) -> None:
+    """Drop the cached rows of one session (call after any write to it or its children)."""
+    _bump()
+    for cache in _SESSION_SCOPED:
+        cache.invalidate(int(session_id))
+
+def get_session_row(supabase, session_id: int, watermark: Optional[str]) -> Dict[str, Any]:
+    def load() -> Optional[Dict[str, Any]]:
+        return (
+            supabase.table("sessions")
+            .select(SESSION_SELECT)
+            .eq("id", session_id)
+            .single()
+            .execute()
+        ).data
+    row = _read_at(_sessions, session_id, watermark, load)
+    if not row:
+        raise ValueError(f"Session {session_id} not found")
+    return row
+
+def get_facility_row(supabase, facility_id: int, *, session_id: int, watermark: Optional[str]) -> Dict[str, Any]:
+    """The facility of `session_id`, cached with that session's rows."""
+    def load() -> Optional[Dict[str, Any]]:
+        return (
+            supabase.table("facilities")
+            .select(FACILITY_SELECT)
+            .eq("id", facility_id)
+            .single()
+            .execute()
+        ).data
+    row = _read_at(_facilities, session_id, watermark, load)
+    if not row:
+        raise ValueError(f"Facility {facility_id} not found")
+    return row
+
+def get_session_evaluator_rows(supabase, session_id: int, watermark: Optional[str]) -> List[Dict[str, Any]]:
+    """session_evaluators of the session in id order, each with its `evaluator` {id, name, email}."""
+    def load() -> List[Dict[str, Any]]:
+        return (
+            supabase.table("session_evaluators")
+            .select(SESSION_EVALUATORS_SELECT)
+            .eq("session_id", session_id)
+            .order("id", desc=False)
+            .execute()
+        ).data or []
+    return _read_at(_session_evaluators, session_id, watermark, load)
+
+def get_candidate_slot_rows(supabase, session_id: int, watermark: Optional[str]) -> List[Dict[str, Any]]:
+    """Candidate slots of the session ordered by sort_order."""
+    def load() -> List[Dict[str, Any]]:
+        return (
+            supabase.table("candidate_slots")
+            .select(CANDIDATE_SLOTS_SELECT)
+            .eq("session_id", session_id)
+            .order("sort_order", desc=False)
+            .execute()
+        ).data or []
+    return _read_at(_candidate_slots, session_id, watermark, load)
+
+async def aget_status_row(
+    session_id: int,
+    watermark: str,
+    loader: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    return await _aread_through(_status_rows, (int(session_id), watermark), loader)
+
+def get_confirmation_summary(
+    session_id: int,
+    watermark: str,
+    loader: Callable[[], Optional[Dict[str, Any]]],
+) -> Optional[Dict[str, Any]]:
+    return _read_through(_confirmation_summaries, (int(session_id), watermark), loader)
@@ -0,0 +1,200 @@
+from typing import Dict, Iterable, List, Optional, Set
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+
+# In-process n-gram index over normalized facility names.
+# Built from `facilities` on first use, rebuilt every FACILITY_INDEX_REFRESH_SECONDS
+# and updated incrementally on facility upserts made by this worker.
+# Only the first build blocks a request; later rebuilds run in a background thread
+# (one at a time) while the stale index keeps serving.
+# Facilities created by other workers since the last rebuild are not in the index,
+# so a miss (or an index that cannot be built) is answered from `facilities.name_fold`,
+# the same folding done in SQL (see docs/rpc.md, fold_for_search).
+_refresh_sec = float(os.environ.get("FACILITY_INDEX_REFRESH_SECONDS", "600"))
+_PAGE = 1000
+
+# Katakana (ァ..ヶ) -> Hiragana, so kana variants match each other
+_KATA_TO_HIRA = {cp: cp - 0x60 for cp in range(0x30A1, 0x30F7)}
+
+_lock = threading.Lock()
+_names: Dict[int, str] = {}
+_folded: Dict[int, str] = {}
+_grams: Dict[str, Set[int]] = {}
+_built_at: Optional[float] = None
+
+_rebuild_lock = threading.Lock()
+_refreshing = False
+
+logger = logging.getLogger(__name__)
+
+def normalize_text_for_search(text: str) -> str:
+    """
+    Normalizes Japanese and mixed-width text for reliable searching.
+    - Converts full-width to half-width (NFKC)
+    - Removes invisible control characters
+    - Replaces all whitespace/newlines/full-width spaces with a single space
+    - Converts to lowercase
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    text = re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
+    text = re.sub(r"[\s\u3000]+", " ", text)
+    return text.lower().strip()
+
+def fold_for_search(text: str) -> str:
+    """normalize_text_for_search + katakana->hiragana, with all spaces removed."""
+    return normalize_text_for_search(text).translate(_KATA_TO_HIRA).replace(" ", "")
+
+def _ngrams(folded: str) -> Set[str]:
+    """Unigrams and bigrams; unigrams serve 1-char queries, bigrams everything longer."""
+    out = set(folded)
+    out.update(folded[i:i + 2] for i in range(len(folded) - 1))
+    return out
+
+def _remove_locked(facility_id: int) -> None:
+    old = _folded.pop(facility_id, None)
+    _names.pop(facility_id, None)
+    if old is None:
+        return
+    for g in _ngrams(old):
+        ids = _grams.get(g)
+        if ids is not None:
+            ids.discard(facility_id)
+            if not ids:
+                del _grams[g]
+
+def _add_locked(facility_id: int, name: str) -> None:
+    folded = fold_for_search(name)
+    _names[facility_id] = name
+    _folded[facility_id] = folded
+    for g in _ngrams(folded):
+        _grams.setdefault(g, set()).add(facility_id)
+
+def index_facility(facility_id: int, name: Optional[str]) -> None:
+    """Add or replace one facility in the index (call after facility upserts)."""
+    with _lock:
+        _remove_locked(facility_id)
+        if name:
+            _add_locked(facility_id, name)
+
+def _load_all(supabase) -> List[Dict[str, object]]:
+    rows: List[Dict[str, object]] = []
+    start = 0
+    while True:
+        page = (
+            supabase.table("facilities")
+            .select("id, name")
+            .order("id", desc=False)
+            .range(start, start + _PAGE - 1)
+            .execute()
+        ).data or []
+        rows.extend(page)
+        if len(page) < _PAGE:
+            return rows
+        start += _PAGE
+
+def rebuild(supabase) -> None:
+    global _built_at
+    rows = _load_all(supabase)
+    with _lock:
+        _names.clear()
+        _folded.clear()
+        _grams.clear()
+        for r in rows:
+            if r.get("name"):
+                _add_locked(int(r["id"]), str(r["name"]))
+        _built_at = time.monotonic()
+
+def _refresh_in_background(supabase) -> None:
+    global _refreshing
+    try:
+        with _rebuild_lock:
+            rebuild(supabase)
+    except Exception:
+        logger.warning("Facility index refresh failed; serving the stale index", exc_info=True)
+    finally:
+        _refreshing = False
+
+def _ensure_fresh(supabase) -> None:
+    global _refreshing
+    if _built_at is None:
+        # First build: callers wait for a single load instead of each loading
+        with _rebuild_lock:
+            if _built_at is None:
+                rebuild(supabase)
+        return
+    if time.monotonic() - _built_at <= _refresh_sec:
+        return
+    with _lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    try:
+        threading.Thread(
+            target=_refresh_in_background, args=(supabase,), name="facility-index-refresh", daemon=True
+        ).start()
+    except Exception:
+        _refreshing = False
+        raise
+
+def _candidates(folded_term: str) -> Iterable[int]:
+    if len(folded_term) == 1:
+        return _grams.get(folded_term, ())
+    postings = [_grams.get(folded_term[i:i + 2]) for i in range(len(folded_term) - 1)]
+    if any(p is None for p in postings):
+        return ()
+    postings.sort(key=len)
+    result = set(postings[0])
+    for p in postings[1:]:
+        result &= p
+        if not result:
+            break
+    return result
+
+def _like_pattern(folded_term: str, prefix: bool) -> str:
+    escaped = folded_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+def _search_db(supabase, folded_term: str, prefix: bool) -> List[int]:
+    """Match against facilities.name_fold and add the hits to the local index."""
+    rows = (
+        supabase.table("facilities")
+        .select("id, name")
+        .ilike("name_fold", _like_pattern(folded_term, prefix))
+        .execute()
+    ).data or []
+    for r in rows:
+        if r.get("name"):
+            index_facility(int(r["id"]), str(r["name"]))
+    return [int(r["id"]) for r in rows]
+
+def _search_index(folded_term: str, prefix: bool) -> List[int]:
+    with _lock:
+        return [
+            fid
+            for fid in _candidates(folded_term)
+            if (_folded[fid].startswith(folded_term) if prefix else folded_term in _folded[fid])
+        ]
+
+def search_facility_ids(supabase, term: str, *, prefix: bool = False) -> List[int]:
+    """
+    Return the ids of the facilities whose name matches `term` (substring by default,
+    or prefix), width/case/kana-insensitive.
+    """
+    folded_term = fold_for_search(term or "")
+    if not folded_term:
+        return []
+    try:
+        _ensure_fresh(supabase)
+    except Exception:
+        logger.warning("Facility index unavailable; searching the database", exc_info=True)
+        return sorted(_search_db(supabase, folded_term, prefix))
+    ids = _search_index(folded_term, prefix)
+    if not ids:
+        ids = _search_db(supabase, folded_term, prefix)
+    return sorted(ids)
@@ -1,21 +1,23 @@
-from typing import Optional
-import unicodedata
-import re
+from typing import List, Optional
+import os
+from app.services.sessions.facility_search_service import fold_for_search, search_facility_ids
+from app.services.meta.enum_service import is_member
 
-def normalize_text_for_search(text: str) -> str:
-    """
-    Normalizes Japanese and mixed-width text for reliable searching.
-    - Converts full-width to half-width (NFKC)
-    - Removes invisible control characters
-    - Replaces all whitespace/newlines/full-width spaces with a single space
-    - Converts to lowercase
-    """
-    if not text:
-        return ""
-    text = unicodedata.normalize("NFKC", text)
-    text = re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
-    text = re.sub(r"[\s\u3000]+", " ", text)
-    return text.lower().strip()
+# Up to this many matching facilities are filtered with in_() (the ids go into the
+# query string, so keep this small); above it they are posted to
+# session_list_for_facilities (see docs/rpc.md)
+FACILITY_IN_FILTER_MAX = int(os.environ.get("FACILITY_IN_FILTER_MAX", "50"))
+
+COUNT_MODES = ("exact", "planned", "estimated", "none")
+
+def _empty_page(page: int, page_size: int, count_mode: str):
+    return {
+        "items": [],
+        "total": 0 if count_mode != "none" else None,
+        "page": page,
+        "page_size": page_size,
+        "next_cursor": None,
+    }
 
 def fetch_session_list(
     supabase,
@@ -25,49 +27,80 @@ def fetch_session_list(
     facility: Optional[str],
     page: int,
     page_size: int,
+    cursor: Optional[int] = None,
+    count_mode: str = "exact",
 ):
     """
     Reads from session_list_v, which is backed by:
     sessions, facilities, session_evaluators (answered_at), client_responses, candidate_slots
 
     Uses DB-side pagination for performance & stability.
+    - Page mode (default): OFFSET via range(); kept for compatibility.
+    - Cursor mode: pass `cursor` (the previous page's `next_cursor`) to seek with
+      `id < cursor`, which stays flat at deep pages. `total` then counts the rows
+      remaining after the cursor.
+    count_mode: 'exact' | 'planned' | 'estimated' (Postgres planner based, cheap) | 'none'.
+    facility: matched by search_facility_ids (width/case/kana-insensitive) and applied
+    as a facility_id filter. Blank means no filter.
+    purpose / status: a value outside the enum matches nothing (empty page, not an error);
+    if the enum values cannot be loaded the filter is applied unvalidated.
     """
-    offset = (page - 1) * page_size
-    limit_start = offset
-    limit_end = offset + page_size - 1
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"Invalid count_mode: {count_mode}")
 
-    q = (
-        supabase
-        .table("session_list_v")
-        .select(
-            "id, facility_name, purpose, status, confirmed_date, notion_url, updated_at, "
-            "total_evaluators, answered",
-            count="exact",
-        )
-        .order("id", desc=True)
-    )
+    filters = {k: v for k, v in (("purpose", purpose), ("status", status)) if v}
+    if any(is_member(supabase, k, v) is False for k, v in filters.items()):
+        return _empty_page(page, page_size, count_mode)
 
-    if purpose:
-        q = q.eq("purpose", purpose)
+    term = (facility or "").strip()
+    if not fold_for_search(term):
+        # Blank / whitespace-only facility means no filter
+        term = ""
 
-    if status:
-        q = q.eq("status", status)
+    facility_ids: Optional[List[int]] = None
+    if term:
+        facility_ids = search_facility_ids(supabase, term)
+        if not facility_ids:
+            return _empty_page(page, page_size, count_mode)
 
-    if facility:
-        norm = normalize_text_for_search(facility.strip())
-        q = q.ilike("facility_name_norm", f"%{norm}%")
+    columns = (
+        "id, facility_name, purpose, status, confirmed_date, notion_url, updated_at, "
+        "total_evaluators, answered"
+    )
+    count = None if count_mode == "none" else count_mode
+    if facility_ids is not None and len(facility_ids) > FACILITY_IN_FILTER_MAX:
+        q = (
+            supabase
+            .rpc("session_list_for_facilities", {"p_facility_ids": facility_ids}, count=count)
+            .select(columns)
+        )
+    else:
+        q = supabase.table("session_list_v").select(columns, count=count)
+        if facility_ids is not None:
+            q = q.in_("facility_id", facility_ids)
+    q = q.order("id", desc=True)
 
-    # DB-side pagination
-    q = q.range(limit_start, limit_end)
+    for column, value in filters.items():
+        q = q.eq(column, value)
 
+    if cursor is not None:
+        # Keyset pagination: fetch one extra row to know whether another page exists
+        q = q.lt("id", cursor).limit(page_size + 1)
+    else:
+        # DB-side pagination, also one extra row for has_more
+        offset = (page - 1) * page_size
+        q = q.range(offset, offset + page_size)
     res = q.execute()
 
     items = res.data or []
-    total = res.count or 0
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    total = (res.count or 0) if count_mode != "none" else None
 
     return {
         "items": items,
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": items[-1]["id"] if has_more and items else None,
     }
@@ -0,0 +1,80 @@
+from typing import Any, AsyncIterator, Dict, Set
+import asyncio
+import itertools
+import json
+import os
+import threading
+
+# In-process pub/sub behind GET /api/sessions/{id}/events (server-sent events).
+# Write paths call publish() from any thread; every open stream owns an asyncio.Queue
+# that is fed on its own event loop via call_soon_threadsafe. Only streams served by
+# the worker that handled the write see the event.
+_queue_max = int(os.environ.get("SESSION_EVENTS_QUEUE_MAX", "100"))
+_heartbeat_sec = float(os.environ.get("SESSION_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# Event types
+EVENT_ANSWERS = "answers"                  # {evaluator_id, session_evaluator_id, answers: {slot_id: "O"|"M"|"X"|""}, answered_at?, note?}
+EVENT_CLIENT_RESPONSE = "client_response"  # {selected_candidate_slot_id, answered_at}
+EVENT_STATUS = "status"                    # {status}
+EVENT_SESSION = "session"                  # changed session header fields
+EVENT_RESYNC = "resync"                    # events were dropped; refetch the status
+
+_lock = threading.Lock()
+_subscribers: Dict[int, Set["_Subscriber"]] = {}
+_event_ids = itertools.count(1)
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=_queue_max)
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        # Runs on self.loop. A stream that cannot keep up gets its backlog replaced by one resync.
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"id": event["id"], "type": EVENT_RESYNC, "data": {"session_id": event["data"]["session_id"]}}
+        self.queue.put_nowait(event)
+
+def publish(session_id: int, event_type: str, data: Dict[str, Any]) -> None:
+    """Push an event to every open stream of the session. Never raises."""
+    with _lock:
+        subs = list(_subscribers.get(int(session_id), ()))
+    if not subs:
+        return
+    event = {"id": next(_event_ids), "type": event_type, "data": {"session_id": int(session_id), **data}}
+    for sub in subs:
+        try:
+            sub.loop.call_soon_threadsafe(sub.offer, event)
+        except RuntimeError:
+            pass  # loop already closed; the stream's finally block removes it
+
+def _format(event: Dict[str, Any]) -> str:
+    data = json.dumps(event["data"], ensure_ascii=False, default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+async def stream_events(session_id: int) -> AsyncIterator[str]:
+    """SSE frames for one session until the client disconnects, with a heartbeat comment when idle."""
+    sub = _Subscriber(asyncio.get_running_loop())
+    with _lock:
+        _subscribers.setdefault(session_id, set()).add(sub)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=_heartbeat_sec)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield _format(event)
+    finally:
+        with _lock:
+            subs = _subscribers.get(session_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del _subscribers[session_id]
+
+def open_stream_count() -> int:
+    with _lock:
+        return sum(len(s) for s in _subscribers.values())
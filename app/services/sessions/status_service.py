@@ -1,7 +1,13 @@
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timezone, date
+import asyncio
+import base64
+from app.db import chunked, run_parallel
+from app.services.sessions.booking_conflict_service import aensure_fresh, lookup_conflicts
+from app.services.sessions.session_events_service import EVENT_ANSWERS, EVENT_SESSION, publish
+from app.services.sessions.entity_cache_service import aget_status_row, invalidate_session
+from app.services.meta.enum_service import validate_purpose
 
-PURPOSE_OPTIONS = {"訪問調査", "聞き取り", "場面観察", "FB", "その他"}
 DB_TO_SYMBOL: Dict[str, str] = {
     "O": "○", # OK
     "M": "△", # Maybe
@@ -14,31 +20,44 @@ SYMBOL_TO_DB: Dict[str, str] = {
 }
 CHOICE_SYMBOLS: Set[str] = set(SYMBOL_TO_DB.keys())
 CHOICE_DB_TOKENS: Set[str] = set(DB_TO_SYMBOL.keys())
-
-def _get_session_with_facility(supabase, session_id: int) -> Dict[str, Any]:
-    s_res = (
+# 2-bit cell codes for the compact answer matrix (0 = unanswered)
+DB_TO_CELL_CODE: Dict[str, int] = {"O": 1, "M": 2, "X": 3}
+ANSWERS_FORMATS = ("nested", "compact")
+
+STATUS_SELECT = (
+    "id, facility_id, purpose, status, response_deadline, presentation_date, notion_url, "
+    "facility_form_id, facility_form_view_url, facility_form_edit_url, "
+    "facility: facilities(id, name, contact_name, contact_email, notion_url), "
+    "session_evaluators(id, evaluator_id, answered_at, note, "
+    "evaluator_form_view_url, evaluator_form_edit_url, evaluator_form_id, "
+    "evaluator: evaluators(id, name, email), "
+    "evaluator_responses(candidate_slot_id, choice)), "
+    "candidate_slots(id, slot_date, slot_label, sort_order), "
+    "client_responses(selected_candidate_slot_id)"
+)
+
+def _status_query(supabase, session_id: int):
+    return (
         supabase.table("sessions")
-        .select(
-            "id, facility_id, purpose, status, response_deadline, presentation_date, notion_url, "
-            "facility_form_id, facility_form_view_url, facility_form_edit_url"
-        )
+        .select(STATUS_SELECT)
         .eq("id", session_id)
+        .order("id", foreign_table="session_evaluators")
+        .order("sort_order", foreign_table="candidate_slots")
         .single()
-        .execute()
     )
-    if not s_res.data:
-        raise ValueError(f"Session {session_id} not found")
-    s = s_res.data
 
-    f_res = (
-        supabase.table("facilities")
-        .select("id, name, contact_name, contact_email, notion_url")
-        .eq("id", s["facility_id"])
-        .single()
-        .execute()
-    )
-    f = f_res.data or {}
+async def _aget_status_row(asupabase, session_id: int) -> Dict[str, Any]:
+    """
+    Load the session together with its facility, session_evaluators (+ evaluator, responses)
+    and candidate_slots via PostgREST resource embedding, i.e. a single round trip.
+    """
+    res = await _status_query(asupabase, session_id).execute()
+    if not res.data:
+        raise ValueError(f"Session {session_id} not found")
+    return res.data
 
+def _build_session_header(s: Dict[str, Any]) -> Dict[str, Any]:
+    f = s.get("facility") or {}
     return {
         "id": s["id"],
         "purpose": s.get("purpose"),
@@ -68,24 +87,10 @@ def _get_session_evaluator_rows(supabase, session_id: int) -> List[Dict[str, Any
         .execute()
     ).data or []
 
-def _build_evaluators(supabase, se_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    ids = [r["evaluator_id"] for r in se_rows]
-    if not ids:
-        return []
-
-    ev_map = {
-        r["id"]: r
-        for r in (
-            supabase.table("evaluators")
-            .select("id, name, email")
-            .in_("id", ids)
-            .execute()
-        ).data or []
-    }
-
+def _build_evaluators(se_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     out: List[Dict[str, Any]] = []
     for row in se_rows:
-        ev = ev_map.get(row["evaluator_id"], {})
+        ev = row.get("evaluator") or {}
         out.append({
             "id": row["evaluator_id"],
             "session_evaluator_id": row["id"],
@@ -99,61 +104,160 @@ def _build_evaluators(supabase, se_rows: List[Dict[str, Any]]) -> List[Dict[str,
         })
     return out
 
-def _get_candidate_slots(supabase, session_id: int) -> List[Dict[str, Any]]:
-    return (
-        supabase.table("candidate_slots")
-        .select("id, slot_date, slot_label, sort_order")
-        .eq("session_id", session_id)
-        .order("sort_order", desc=False)
-        .execute()
-    ).data or []
-
 def _get_answers_matrix_from_se(
-    supabase,
     se_rows: List[Dict[str, Any]],
 ) -> Dict[str, Dict[str, Optional[str]]]:
     """
-    evaluator_responses: session_evaluator_id, candidate_slot_id, choice ('O'|'M'|'X')
+    session_evaluators[].evaluator_responses: candidate_slot_id, choice ('O'|'M'|'X')
     """
-    if not se_rows:
-        return {}
+    matrix: Dict[str, Dict[str, Optional[str]]] = {}
+    for se in se_rows:
+        ekey = str(se["evaluator_id"])
+        for r in se.get("evaluator_responses") or []:
+            skey = str(r["candidate_slot_id"])
+            db_choice = str(r.get("choice") or "")
+            symbol = DB_TO_SYMBOL.get(db_choice)
+            matrix.setdefault(ekey, {})[skey] = symbol
+    return matrix
 
-    se_id_to_eid = {r["id"]: r["evaluator_id"] for r in se_rows}
-    se_ids = list(se_id_to_eid.keys())
+def _get_answers_compact(
+    se_rows: List[Dict[str, Any]],
+    slot_rows: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Columnar form of the answers matrix (answers_format=compact):
+      evaluator_ids: row order, slot_ids: column order (slot sort_order)
+      cells: base64 of a row-major, 2-bit packed array, 4 cells per byte with the
+             first cell in the highest bits; codes 0=unanswered, 1=○, 2=△, 3=x
+    Decoding cell (e, s): i = e * len(slot_ids) + s; code = (bytes[i >> 2] >> (6 - 2 * (i & 3))) & 3
+    """
+    evaluator_ids = [se["evaluator_id"] for se in se_rows]
+    slot_ids = [sl["id"] for sl in slot_rows]
+    n_slots = len(slot_ids)
+    col = {int(sid): j for j, sid in enumerate(slot_ids)}
+    packed = bytearray((len(evaluator_ids) * n_slots + 3) // 4)
+    for e, se in enumerate(se_rows):
+        for r in se.get("evaluator_responses") or []:
+            j = col.get(int(r["candidate_slot_id"]))
+            code = DB_TO_CELL_CODE.get(str(r.get("choice") or ""))
+            if j is None or code is None:
+                continue
+            i = e * n_slots + j
+            shift = 6 - 2 * (i & 3)
+            packed[i >> 2] = (packed[i >> 2] & ~(3 << shift) & 0xFF) | (code << shift)
+    return {
+        "evaluator_ids": evaluator_ids,
+        "slot_ids": slot_ids,
+        "encoding": "2bit-base64",
+        "cells": base64.b64encode(bytes(packed)).decode("ascii"),
+    }
 
-    rows = (
-        supabase.table("evaluator_responses")
-        .select("session_evaluator_id, candidate_slot_id, choice")
-        .in_("session_evaluator_id", se_ids)
-        .execute()
-    ).data or []
+def _confirmed_slot_id(row: Dict[str, Any]) -> Optional[int]:
+    cr = row.get("client_responses")
+    cr_list = cr if isinstance(cr, list) else ([cr] if cr else [])
+    for r in cr_list:
+        if r.get("selected_candidate_slot_id"):
+            return int(r["selected_candidate_slot_id"])
+    return None
 
-    matrix: Dict[str, Dict[str, Optional[str]]] = {}
-    for r in rows:
-        eid = se_id_to_eid.get(r["session_evaluator_id"])
-        if eid is None:
-            continue
-        ekey = str(eid)
-        skey = str(r["candidate_slot_id"])
-        db_choice = str(r.get("choice") or "")
-        symbol = DB_TO_SYMBOL.get(db_choice)
-        matrix.setdefault(ekey, {})[skey] = symbol
-    return matrix
+def _booking_checks(row: Dict[str, Any]) -> List[Tuple[int, int, Any, str]]:
+    """
+    ○ answers and this session's confirmed slot, as (evaluator_id, slot_id, slot_date, kind)
+    to be checked against other sessions' confirmed slots for the same evaluator.
+    """
+    slot_dates = {int(sl["id"]): sl.get("slot_date") for sl in row.get("candidate_slots") or []}
+    confirmed = _confirmed_slot_id(row)
+    checks = []
+    for se in row.get("session_evaluators") or []:
+        eid = se["evaluator_id"]
+        for r in se.get("evaluator_responses") or []:
+            sid = int(r["candidate_slot_id"])
+            if str(r.get("choice") or "") == "O" and sid in slot_dates:
+                checks.append((eid, sid, slot_dates[sid], "answer"))
+        if confirmed in slot_dates:
+            checks.append((eid, confirmed, slot_dates[confirmed], "confirmed"))
+    return checks
+
+async def _aget_booking_conflicts(asupabase, row: Dict[str, Any]) -> List[Dict[str, Any]]:
+    checks = _booking_checks(row)
+    if not checks:
+        return []
+    await aensure_fresh(asupabase)
+    return lookup_conflicts(session_id=row["id"], checks=checks)
+
+def _assemble_status(row: Dict[str, Any], answers_format: str, conflicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if answers_format not in ANSWERS_FORMATS:
+        raise ValueError(f"Invalid answers_format: {answers_format}")
+    se_rows = row.get("session_evaluators") or []
+    session = _build_session_header(row)
+    evaluators = _build_evaluators(se_rows)
+    slots = row.get("candidate_slots") or []
+    out: Dict[str, Any] = {"session": session, "evaluators": evaluators, "slots": slots}
+    if answers_format == "compact":
+        out["answers_compact"] = _get_answers_compact(se_rows, slots)
+    else:
+        out["answers"] = _get_answers_matrix_from_se(se_rows)
+    out["conflicts"] = conflicts
+    return out
 
-def fetch_session_status(supabase, session_id: int) -> Dict[str, Any]:
+async def afetch_session_status(
+    asupabase,
+    session_id: int,
+    answers_format: str = "nested",
+    watermark: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Aggregate header, evaluators, slots, and answers for P3 (read-only).
+    Aggregate header, evaluators, slots, and answers for P3 (read-only), over the
+    async Supabase client (see app.db.get_async_supabase).
     Matches current columns:
       - session_evaluators.note (not 'remark')
       - evaluator_responses(session_evaluator_id, candidate_slot_id, choice)
       - candidate_slots
+    Everything is loaded with one embedded select (see STATUS_SELECT).
+    answers_format='compact' returns `answers_compact` instead of `answers`.
+    With the session's `watermark` (see watermark_service) the row is served from the entity cache.
     """
-    session = _get_session_with_facility(supabase, session_id)
-    se_rows = _get_session_evaluator_rows(supabase, session_id)
-    evaluators = _build_evaluators(supabase, se_rows)
-    slots = _get_candidate_slots(supabase, session_id)
-    answers = _get_answers_matrix_from_se(supabase, se_rows)
-    return {"session": session, "evaluators": evaluators, "slots": slots, "answers": answers}
+    if watermark:
+        row = await aget_status_row(session_id, watermark, lambda: _aget_status_row(asupabase, session_id))
+    else:
+        row = await _aget_status_row(asupabase, session_id)
+    return _assemble_status(row, answers_format, await _aget_booking_conflicts(asupabase, row))
+
+MAX_STATUS_BATCH = 300
+
+def _batch_ids(session_ids: List[int]) -> List[int]:
+    ids = list(dict.fromkeys(int(s) for s in session_ids))
+    if len(ids) > MAX_STATUS_BATCH:
+        raise ValueError(f"At most {MAX_STATUS_BATCH} sessions per batch")
+    return ids
+
+def _status_batch_query(supabase, ids: List[int]):
+    return (
+        supabase.table("sessions")
+        .select(STATUS_SELECT)
+        .in_("id", ids)
+        .order("id", foreign_table="session_evaluators")
+        .order("sort_order", foreign_table="candidate_slots")
+    )
+
+async def afetch_session_status_batch(asupabase, session_ids: List[int], answers_format: str = "nested") -> Dict[str, Any]:
+    """
+    Same payload as afetch_session_status for many sessions, loaded with one
+    embedded select per IN_FILTER_CHUNK ids (run concurrently). Items follow the
+    order of `session_ids`; ids with no session are listed in `missing`.
+    """
+    ids = _batch_ids(session_ids)
+    if not ids:
+        return {"items": [], "missing": []}
+    results = await asyncio.gather(*(_status_batch_query(asupabase, chunk).execute() for chunk in chunked(ids)))
+    by_id = {int(r["id"]): r for res in results for r in (res.data or [])}
+    return {
+        "items": [
+            _assemble_status(by_id[sid], answers_format, await _aget_booking_conflicts(asupabase, by_id[sid]))
+            for sid in ids if sid in by_id
+        ],
+        "missing": [sid for sid in ids if sid not in by_id],
+    }
 
 def _resolve_session_evaluator_id(supabase, session_id: int, evaluator_id: int) -> int:
     """
@@ -200,9 +304,7 @@ def update_session(
     if purpose is not None:
       p = str(purpose).strip()
       if p:
-          if p not in PURPOSE_OPTIONS:
-              raise ValueError("Invalid purpose")
-          updates["purpose"] = p
+          updates["purpose"] = validate_purpose(supabase, p)
     if response_deadline is not None:
         updates["response_deadline"] = response_deadline.isoformat()
     if presentation_date is not None:
@@ -226,6 +328,7 @@ def update_session(
         .eq("id", session_id)
         .execute()
     )
+    invalidate_session(session_id)
     sel = (
         supabase.table("sessions")
         .select("id, purpose, response_deadline, presentation_date")
@@ -236,6 +339,7 @@ def update_session(
     if not sel.data:
         raise ValueError(f"Session {session_id} not found after update")
 
+    publish(session_id, EVENT_SESSION, sel.data)
     return {"session": sel.data}
 
 def update_evaluator_responses(
@@ -251,8 +355,10 @@ def update_evaluator_responses(
       - Upsert evaluator_responses for non-empty choices
       - Delete evaluator_responses for empty/cleared choices
     """
-    se_id = _resolve_session_evaluator_id(supabase, session_id, evaluator_id)
-    valid_slot_ids = _session_slot_ids(supabase, session_id)
+    se_id, valid_slot_ids = run_parallel(
+        lambda: _resolve_session_evaluator_id(supabase, session_id, evaluator_id),
+        lambda: _session_slot_ids(supabase, session_id),
+    )
 
     # Track desired answer state per slot
     to_upsert: Dict[int, str] = {}
@@ -325,6 +431,15 @@ def update_evaluator_responses(
             .eq("id", se_id)
             .execute()
         )
+    invalidate_session(session_id)
+    changed: Dict[int, str] = {sid: "" for sid in to_delete}
+    changed.update(to_upsert)
+    publish(session_id, EVENT_ANSWERS, {
+        "evaluator_id": evaluator_id,
+        "session_evaluator_id": se_id,
+        "answers": changed,
+        **({"note": note} if note is not None else {}),
+    })
     return {
         "session_id": session_id,
         "evaluator_id": evaluator_id,
@@ -337,18 +452,20 @@ def check_slot_everyone_ok(supabase, session_id: int, slot_id: int) -> Dict[str,
     """
     Check whether all evaluators for the session answered 'O' for the given slot.
     """
-    slot = (
-        supabase.table("candidate_slots")
-        .select("id")
-        .eq("id", slot_id)
-        .eq("session_id", session_id)
-        .single()
-        .execute()
+    slot, se_rows = run_parallel(
+        lambda: (
+            supabase.table("candidate_slots")
+            .select("id")
+            .eq("id", slot_id)
+            .eq("session_id", session_id)
+            .single()
+            .execute()
+        ),
+        lambda: _get_session_evaluator_rows(supabase, session_id),
     )
     if not slot.data:
         raise ValueError("Slot not found for this session")
 
-    se_rows = _get_session_evaluator_rows(supabase, session_id)
     if not se_rows:
         return {"slot_id": slot_id, "everyone_ok": False}
 
@@ -0,0 +1,20 @@
+from typing import Optional
+
+# Change markers used for conditional GETs (see docs/rpc.md).
+# Each is one cheap aggregate over updated_at/created_at columns and row counts;
+# any write that changes the corresponding payload changes the marker.
+
+def fetch_session_watermark(supabase, session_id: int) -> Optional[str]:
+    """Marker for everything GET /{session_id}/status and confirmation-summary return; None if the session is unknown."""
+    res = supabase.rpc("session_watermark", {"p_session_id": session_id}).execute()
+    return res.data or None
+
+async def afetch_session_watermark(asupabase, session_id: int) -> Optional[str]:
+    """fetch_session_watermark over the async Supabase client."""
+    res = await asupabase.rpc("session_watermark", {"p_session_id": session_id}).execute()
+    return res.data or None
+
+def fetch_session_list_watermark(supabase) -> Optional[str]:
+    """Marker for the rows of session_list_v."""
+    res = supabase.rpc("session_list_watermark").execute()
+    return res.data or None
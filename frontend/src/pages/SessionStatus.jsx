@@ -5,7 +5,8 @@ import {
   fetchSessionStatus,
   updateEvaluatorResponses,
   updateSession,
-  checkSlotEveryoneOk,
+  fetchSlotConsensus,
+  subscribeSessionEvents,
   generateFacilityEmail,
   extractGmailDraftUrl
 } from "../services/sessionService";
@@ -14,7 +15,9 @@ import {
   TOKEN_TO_SYMBOL,
   buildInitialAnswers,
   buildInitialNotes,
+  decodeCompactAnswers,
   buildInitialProposed,
+  keepUnsaved,
   formatAnsweredAt,
   formatSlot,
   validateRequiredDate
@@ -26,6 +29,7 @@ import {
   MSG_TIMEOUT,
   MSG_DRAFT_GENERIC_ERROR,
   MSG_FACILITY_FORM_ALREADY_CREATED,
+  MSG_EVALUATOR_DOUBLE_BOOKED,
 } from "./utils/messages";
 
 export default function SessionStatus() {
@@ -39,6 +43,7 @@ export default function SessionStatus() {
   const [pageErr, setPageErr] = useState("");
   const [inlineErr, setInlineErr] = useState("");
   const [data, setData] = useState(null);
+  const [consensus, setConsensus] = useState(null);
   const [saving, setSaving] = useState(false);
   const [makingDraft, setMakingDraft] = useState(false);
 
@@ -52,6 +57,12 @@ export default function SessionStatus() {
   const [localAnswers, setLocalAnswers] = useState({});
   const [notes, setNotes] = useState({});
   const [proposed, setProposed] = useState({});
+  const [liveAnsweredAt, setLiveAnsweredAt] = useState({});
+
+  // edits not saved yet; live updates and reloads leave these alone
+  const unsavedAnswers = useRef(new Set());
+  const unsavedNotes = useRef(new Set());
+  const unsavedHeader = useRef(false);
 
   const hasProposedSelected = useMemo(
     () => Object.values(proposed || {}).some(Boolean),
@@ -61,8 +72,12 @@ export default function SessionStatus() {
   // centralized loader
   const reloadStatus = useCallback(
     async (abortSignal) => {
-      const out = await fetchSessionStatus(id, abortSignal);
+      const [out, slotConsensus] = await Promise.all([
+        fetchSessionStatus(id, abortSignal),
+        fetchSlotConsensus(id, abortSignal),
+      ]);
       setData(out);
+      setConsensus(slotConsensus);
     },
     [id]
   );
@@ -70,6 +85,9 @@ export default function SessionStatus() {
   // initial load
   useEffect(() => {
     const controller = new AbortController();
+    unsavedAnswers.current = new Set();
+    unsavedNotes.current = new Set();
+    unsavedHeader.current = false;
     setLoading(true);
     setPageErr("");
     reloadStatus(controller.signal)
@@ -82,56 +100,109 @@ export default function SessionStatus() {
     return () => controller.abort();
   }, [id, reloadStatus]);
 
+  // live updates (answers saved by evaluators or other coordinators,
+  // status / header changes, the facility's client response)
+  useEffect(() => {
+    const controller = new AbortController();
+    const onEvent = (type, ev) => {
+      if (type === "answers") {
+        setLocalAnswers((m) => {
+          const next = { ...m };
+          for (const [slotId, token] of Object.entries(ev.answers || {})) {
+            const key = `${ev.evaluator_id}_${slotId}`;
+            if (!unsavedAnswers.current.has(key)) next[key] = token || "";
+          }
+          return next;
+        });
+        if (ev.note !== undefined && !unsavedNotes.current.has(String(ev.evaluator_id))) {
+          setNotes((m) => ({ ...m, [ev.evaluator_id]: ev.note || "" }));
+        }
+        if (ev.answered_at) {
+          setLiveAnsweredAt((m) => ({ ...m, [ev.evaluator_id]: ev.answered_at }));
+        }
+        fetchSlotConsensus(id, controller.signal).then(setConsensus).catch(() => {});
+      } else if (
+        type === "status" ||
+        type === "session" ||
+        type === "client_response" ||
+        type === "resync"
+      ) {
+        // Unsaved edits survive the reload (see the data effect below)
+        reloadStatus(controller.signal).catch(() => {});
+      }
+    };
+    (async () => {
+      while (!controller.signal.aborted) {
+        try {
+          await subscribeSessionEvents(id, onEvent, controller.signal);
+        } catch {
+          // reconnect below
+        }
+        if (!controller.signal.aborted) {
+          await new Promise((resolve) => setTimeout(resolve, 3000));
+        }
+      }
+    })();
+    return () => controller.abort();
+  }, [id, reloadStatus]);
+
   // local UI state from fetched data
   useEffect(() => {
     if (!data?.session) return;
 
-    setPurpose(data.session.purpose || "");
-    setResponseDeadline(data.session.response_deadline || "");
-    setPresentationDate(data.session.presentation_date || "");
+    if (!unsavedHeader.current) {
+      setPurpose(data.session.purpose || "");
+      setResponseDeadline(data.session.response_deadline || "");
+      setPresentationDate(data.session.presentation_date || "");
+    }
 
-    setLocalAnswers(
-      buildInitialAnswers(data.evaluators || [], data.slots || [], data.answers || {})
+    const answers = buildInitialAnswers(
+      data.evaluators || [],
+      data.slots || [],
+      data.answers || decodeCompactAnswers(data.answers_compact)
+    );
+    setLocalAnswers((m) => keepUnsaved(answers, m, unsavedAnswers.current));
+    const initialNotes = buildInitialNotes(data.evaluators || []);
+    setNotes((m) => keepUnsaved(initialNotes, m, unsavedNotes.current));
+    const initialProposed = buildInitialProposed(data.slots || []);
+    setProposed((m) =>
+      keepUnsaved(initialProposed, m, Object.keys(initialProposed).filter((k) => m[k]))
     );
-    setNotes(buildInitialNotes(data.evaluators || []));
-    setProposed(buildInitialProposed(data.slots || []));
   }, [data]);
 
   const getAns = (eId, sId) => localAnswers[`${eId}_${sId}`] ?? "";
-  const setAns = (eId, sId, v) => setLocalAnswers((m) => ({ ...m, [`${eId}_${sId}`]: v }));
+  const setAns = (eId, sId, v) => {
+    unsavedAnswers.current.add(`${eId}_${sId}`);
+    setLocalAnswers((m) => ({ ...m, [`${eId}_${sId}`]: v }));
+  };
+  const setNote = (eId, v) => {
+    unsavedNotes.current.add(String(eId));
+    setNotes((m) => ({ ...m, [eId]: v }));
+  };
+  const editHeader = (setter) => (e) => {
+    unsavedHeader.current = true;
+    setter(e.target.value);
+  };
 
   const responseDateError = validateRequiredDate(responseDeadline, "評価者回答期限");
   const presentationDateError = validateRequiredDate(presentationDate, "事業所提示期限");
 
   // aggregate when checked
-  const handleProposedCheck = async (slotId, nextChecked) => {
-    const controller = new AbortController();
+  const handleProposedCheck = (slotId, nextChecked) => {
     setInlineErr("");
     if (!nextChecked) {
       setProposed((m) => ({ ...m, [slotId]: false }));
       return;
     }
-    try {
-      const out = await checkSlotEveryoneOk(
-        data.session.id,
-        slotId,
-        controller.signal
-      );
-      const ok = !!out?.everyone_ok;
-      setProposed((m) => ({ ...m, [slotId]: ok }));
-      if (!ok) {
-        setInlineErr(MSG_REQUIRE_ALL_OK);
-        return;
-      }
-      setLocalAnswers((m) => {
-        const next = { ...m };
-        for (const ev of data.evaluators || []) {
-          next[`${ev.id}_${slotId}`] = "O";
-        }
-        return next;
-      });
-    } catch (e) {
-      if (e?.name !== "AbortError") setInlineErr(String(e?.message || e));
+    const slot = (consensus?.slots || []).find((s) => s.slot_id === slotId);
+    const ok = !!slot?.everyone_ok;
+    setProposed((m) => ({ ...m, [slotId]: ok }));
+    if (!ok) {
+      setInlineErr(MSG_REQUIRE_ALL_OK);
+      return;
+    }
+    for (const ev of data.evaluators || []) {
+      setAns(ev.id, slotId, "O");
     }
   };
 
@@ -153,6 +224,7 @@ export default function SessionStatus() {
       };
       if (Object.keys(payload).length === 0) return;
       await updateSession(data.session.id, payload, controller.signal);
+      unsavedHeader.current = false;
       await reloadStatus(controller.signal);
     } catch (e) {
       if (e?.name !== "AbortError") setInlineErr(String(e?.message || e));
@@ -179,6 +251,11 @@ export default function SessionStatus() {
         payload,
         controller.signal
       );
+      for (const s of data?.slots || []) {
+        unsavedAnswers.current.delete(`${evaluatorId}_${s.id}`);
+      }
+      unsavedNotes.current.delete(String(evaluatorId));
+      setConsensus(await fetchSlotConsensus(data.session.id, controller.signal));
     } catch (e) {
       if (e?.name !== "AbortError") setInlineErr(String(e?.message || e));
     } finally {
@@ -322,6 +399,21 @@ export default function SessionStatus() {
         {/* Content */}
         {!loading && !pageErr && data && (
           <>
+            {/* 重複予約の警告 */}
+            {(data.conflicts || []).length > 0 && (
+              <div className="bg-white border border-yellow-300 rounded shadow-sm p-4">
+                <div className="text-xs text-yellow-700">{MSG_EVALUATOR_DOUBLE_BOOKED}</div>
+                <ul className="mt-2 list-disc pl-5 text-xs text-gray-700">
+                  {data.conflicts.map((c) => (
+                    <li key={`${c.kind}_${c.evaluator_id}_${c.slot_id}_${c.other_session_id}`}>
+                      {(data.evaluators || []).find((ev) => ev.id === c.evaluator_id)?.name || c.evaluator_id}
+                      ：{c.slot_date}（{c.kind === "confirmed" ? "確定日程" : "○回答"} / セッション #{c.other_session_id} で確定済み）
+                    </li>
+                  ))}
+                </ul>
+              </div>
+            )}
+
             {/* 基本情報 */}
             <div className="bg-white border rounded shadow-sm p-4">
               <h1 className="text-base font-medium text-gray-700">基本情報</h1>
@@ -457,7 +549,7 @@ export default function SessionStatus() {
                     <select
                       className="w-36 rounded border-gray-300 py-1 text-xs"
                       value={purpose}
-                      onChange={(e) => setPurpose(e.target.value)}
+                      onChange={editHeader(setPurpose)}
                     >
                       {PURPOSE_OPTIONS.map((p) => (
                         <option key={p} value={p}>
@@ -476,7 +568,7 @@ export default function SessionStatus() {
                       type="date"
                       className="w-36 rounded border-gray-300 py-1 text-xs"
                       value={responseDeadline || ""}
-                      onChange={(e) => setResponseDeadline(e.target.value)}
+                      onChange={editHeader(setResponseDeadline)}
                     />
                     {showDateErrors && responseDateError && (
                       <div className="text-xs text-red-600 mt-1">{responseDateError}</div>
@@ -492,7 +584,7 @@ export default function SessionStatus() {
                       type="date"
                       className="w-36 rounded border-gray-300 py-1 text-xs"
                       value={presentationDate || ""}
-                      onChange={(e) => setPresentationDate(e.target.value)}
+                      onChange={editHeader(setPresentationDate)}
                     />
                     {showDateErrors && presentationDateError && (
                       <div className="text-xs text-red-600 mt-1">{presentationDateError}</div>
@@ -532,7 +624,7 @@ export default function SessionStatus() {
                         <th key={e.id} className="min-w-40 text-center">
                           <div>{e.name}</div>
                           <div className="text-xs text-gray-500">
-                            {formatAnsweredAt(e.answered_at)}
+                            {formatAnsweredAt(liveAnsweredAt[e.id] ?? e.answered_at)}
                           </div>
                         </th>
                       ))}
@@ -593,9 +685,7 @@ export default function SessionStatus() {
                             rows={4}
                             className="w-48 rounded border border-gray-300 text-xs px-2 py-1"
                             value={notes[e.id] ?? ""}
-                            onChange={(ev) =>
-                              setNotes((m) => ({ ...m, [e.id]: ev.target.value }))
-                            }
+                            onChange={(ev) => setNote(e.id, ev.target.value)}
                             placeholder="備考を入力"
                           />
                         </td>
@@ -12,3 +12,4 @@ export const MSG_DRAFT_GENERIC_ERROR = "下書き作成でエラーが発生し
 export const MSG_DATE_REQUIRED = "を入力してください。";
 export const MSG_DATE_FORMAT_INVALID = "の日付形式が正しくありません。";
 export const MSG_FACILITY_FORM_ALREADY_CREATED = "事業所フォームは既に作成済みです。";
+export const MSG_EVALUATOR_DOUBLE_BOOKED = "他のセッションで確定済みの日程と重複している評価者がいます。";
@@ -39,6 +39,32 @@ export function buildInitialAnswers(evaluators = [], slots = [], matrix = {}) {
   return answers;
 }
 
+// Cell codes of `answers_compact` (see fetch_session_status answers_format=compact)
+const CELL_CODE_TO_TOKEN = ["", "O", "M", "X"];
+
+/**
+ * Decode `answers_compact` into the nested { [evaluatorId]: { [slotId]: token } } matrix.
+ * cells is base64 of a row-major array packed 4 cells per byte (first cell in the
+ * highest 2 bits): cell (e, s) -> i = e * slot_ids.length + s.
+ */
+export function decodeCompactAnswers(compact) {
+  const matrix = {};
+  if (!compact) return matrix;
+  const { evaluator_ids: evaluatorIds = [], slot_ids: slotIds = [], cells = "" } = compact;
+  const bin = atob(cells);
+  const nSlots = slotIds.length;
+  evaluatorIds.forEach((evaluatorId, e) => {
+    const row = {};
+    slotIds.forEach((slotId, s) => {
+      const i = e * nSlots + s;
+      const code = (bin.charCodeAt(i >> 2) >> (6 - 2 * (i & 3))) & 3;
+      if (code) row[String(slotId)] = CELL_CODE_TO_TOKEN[code];
+    });
+    matrix[String(evaluatorId)] = row;
+  });
+  return matrix;
+}
+
 export function buildInitialNotes(evaluators = []) {
   const notes = {};
   for (const evaluator of evaluators) {
@@ -57,6 +83,15 @@ export function buildInitialProposed(slots = []) {
   return proposed;
 }
 
+// Fresh values from the server, except the keys edited locally and not saved yet
+export function keepUnsaved(fresh = {}, current = {}, unsavedKeys = []) {
+  const next = { ...fresh };
+  for (const key of unsavedKeys) {
+    if (key in current) next[key] = current[key];
+  }
+  return next;
+}
+
 export {
   formatAnsweredAt,
   formatSlot,
@@ -1,5 +1,5 @@
 import { API_BASE } from "../config";
-import { fetchWithAuthJson } from "../lib/fetchWithAuth";
+import { fetchWithAuth, fetchWithAuthJson } from "../lib/fetchWithAuth";
 
 export async function fetchEnums(signal) {
   return fetchWithAuthJson(`${API_BASE}/api/meta/enums`, {
@@ -50,7 +50,7 @@ export async function generateEvaluatorEmail(sessionId, signal) {
 }
 
 export async function fetchSessionStatus(sessionId, signal) {
-  return fetchWithAuthJson(`${API_BASE}/api/sessions/${sessionId}/status`, {
+  return fetchWithAuthJson(`${API_BASE}/api/sessions/${sessionId}/status?answers_format=compact`, {
     method: "GET",
     signal,
   });
@@ -90,6 +90,47 @@ export async function checkSlotEveryoneOk(sessionId, slotId, signal) {
   );
 }
 
+// Server-sent events of one session. Read through fetch (EventSource cannot send the
+// Authorization header); resolves when the stream ends, rejects on abort.
+export async function subscribeSessionEvents(sessionId, onEvent, signal) {
+  const res = await fetchWithAuth(`${API_BASE}/api/sessions/${sessionId}/events`, {
+    method: "GET",
+    headers: { Accept: "text/event-stream" },
+    signal,
+  });
+  if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += value;
+    let end;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      const frame = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let type = "message";
+      const data = [];
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event:")) type = line.slice(6).trim();
+        else if (line.startsWith("data:")) data.push(line.slice(5).trimStart());
+      }
+      if (data.length) onEvent(type, JSON.parse(data.join("\n")));
+    }
+  }
+}
+
+export async function fetchSlotConsensus(sessionId, signal) {
+  return fetchWithAuthJson(
+    `${API_BASE}/api/sessions/${sessionId}/slots/consensus`,
+    {
+      method: "GET",
+      signal,
+    }
+  );
+}
+
 export async function generateFacilityEmail(
   sessionId,
   candidateSlotIds,
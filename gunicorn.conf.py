@@ -0,0 +1,17 @@
+import os
+import shutil
+from app.logging_config import GUNICORN_LOGCONFIG
+
+# Multiprocess-safe Prometheus metrics across workers (see app/metrics.py)
+_metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+# app.* loggers at APP_LOG_LEVEL (default INFO) on stdout; see app/logging_config.py
+logconfig_dict = GUNICORN_LOGCONFIG
+
+def on_starting(server):
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,24 @@
+from typing import Any, Callable, List
+import statistics
+import time
+
+# Benchmarks run as ordinary tests: each measures the new path against the old one
+# (or a baseline) on the fakes, asserts the expected direction with a wide margin,
+# and reports its numbers, which conftest prints in the "benchmarks" summary section.
+
+RESULTS: List[str] = []
+
+def timed(fn: Callable[[], Any], *, repeat: int = 5) -> float:
+    """Median wall time of fn() in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}ms"
+
+def report(name: str, **values: Any) -> None:
+    RESULTS.append(f"{name}: " + "  ".join(f"{k}={v}" for k, v in values.items()))
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import time
+
+# Settings the app reads at import time; real credentials are never needed,
+# every Supabase call goes to a FakeSupabase (see tests/fakes.py)
+os.environ.setdefault("SUPABASE_URL", "http://supabase.test")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-jwt-secret")
+os.environ.setdefault("NOTION_API_TOKEN", "test-notion-token")
+os.environ.setdefault("MAKE_GENERATE_EVALUATOR_EMAIL", "http://make.test/evaluator")
+os.environ.setdefault("MAKE_GENERATE_FACILITY_EMAIL", "http://make.test/facility")
+os.environ.setdefault("MAKE_ON_CLIENT_RESPONSE", "http://make.test/client-response")
+os.environ.setdefault("MAKE_OUTBOX_DB_PATH", os.path.join(tempfile.mkdtemp(), "make_outbox.sqlite3"))
+
+import pytest
+from fastapi.testclient import TestClient
+from app.auth.deps import require_allowed_user
+from app.db import get_async_supabase, get_supabase
+from app.main import app
+from app.request_metrics import AsyncInstrumentedClient, InstrumentedClient
+from app.services.meta import enum_service
+from app.services.notion import facility_info_service
+from app.services.sessions import booking_conflict_service, entity_cache_service, facility_search_service
+from tests.bench import RESULTS
+from tests.fakes import FakeSupabase
+from tests.notion_stub import NotionStub
+
+PURPOSES = ["評価", "再評価"]
+STATUSES = ["起案中", "確定"]
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    """Module-level caches and indexes are per process: start every test from the same state."""
+    for cache in (*entity_cache_service._SESSION_SCOPED, entity_cache_service._status_rows, entity_cache_service._confirmation_summaries):
+        cache.clear()
+    with enum_service._lock:
+        enum_service._values = {"purpose": list(PURPOSES), "status": list(STATUSES)}
+        enum_service._loaded_at = time.monotonic()
+    with booking_conflict_service._lock:
+        booking_conflict_service._by_evaluator = {}
+        booking_conflict_service._session_bookings = {}
+        booking_conflict_service._built_at = time.monotonic()
+        booking_conflict_service._rebuilding = False
+        booking_conflict_service._replay = []
+        booking_conflict_service._failures = 0
+        booking_conflict_service._retry_at = 0.0
+        booking_conflict_service._refresh_task = None
+    with facility_search_service._lock:
+        facility_search_service._names = {}
+        facility_search_service._folded = {}
+        facility_search_service._grams = {}
+        facility_search_service._built_at = None
+        facility_search_service._refreshing = False
+    yield
+
+@pytest.fixture
+def api():
+    """
+    api(handler, latency=0.0) -> (TestClient, FakeSupabase): the app with both Supabase
+    clients answered by `handler` (instrumented as in production, so Server-Timing
+    counts the calls) and authentication bypassed. The lifespan (outbox worker, enum
+    preload) is not run.
+    """
+    def make(handler, latency: float = 0.0):
+        fake = FakeSupabase(handler, latency=latency)
+        sync_client = InstrumentedClient(fake)
+        async_client = AsyncInstrumentedClient(fake.async_view())
+
+        async def _async_supabase():
+            return async_client
+
+        app.dependency_overrides[get_supabase] = lambda: sync_client
+        app.dependency_overrides[get_async_supabase] = _async_supabase
+        app.dependency_overrides[require_allowed_user] = lambda: {"email": "tester@example.com"}
+        return TestClient(app), fake
+
+    yield make
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def notion_api(monkeypatch):
+    """
+    notion_api(pages, **options) -> NotionStub answering pages.retrieve for
+    facility_info_service, with an empty facility cache and an unthrottled limiter.
+    """
+    facility_info_service._facility_cache.clear()
+    monkeypatch.setattr(facility_info_service, "_bucket", facility_info_service._TokenBucket(1000, 100))
+
+    def make(pages, **options):
+        stub = NotionStub(pages, **options)
+        monkeypatch.setattr(facility_info_service, "_get_notion", lambda: stub)
+        return stub
+
+    yield make
+    facility_info_service._facility_cache.clear()
+
+def pytest_terminal_summary(terminalreporter):
+    if RESULTS:
+        terminalreporter.section("benchmarks")
+        for line in RESULTS:
+            terminalreporter.write_line(line)
@@ -0,0 +1,255 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import re
+import threading
+import time
+
+# Stand-in for the Supabase client: every PostgREST call is answered by
+# handler(table, calls) and recorded, so tests can check the response and the
+# queries behind it. `table` is the table name, or "rpc:<function>" for rpc();
+# `calls` is the builder chain as (method, args, kwargs) tuples. `latency` (seconds)
+# is added to every execute(), to stand in for the network round trip to PostgREST.
+
+Call = Tuple[str, Tuple[Any, ...], Dict[str, Any]]
+
+class FakeResponse:
+    def __init__(self, data: Any = None, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+class FakeQuery:
+    """Request builder: records the chain, execute() asks the handler."""
+    def __init__(self, db: "FakeSupabase", table: str, calls: Optional[List[Call]] = None):
+        self._db = db
+        self.table = table
+        self.calls: List[Call] = calls or []
+
+    @property
+    def not_(self) -> "FakeQuery":
+        self.calls.append(("not_", (), {}))
+        return self
+
+    def __getattr__(self, name: str) -> Callable[..., "FakeQuery"]:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        def call(*args: Any, **kwargs: Any) -> "FakeQuery":
+            self.calls.append((name, args, kwargs))
+            return self
+        return call
+
+    def execute(self) -> FakeResponse:
+        if self._db.latency:
+            time.sleep(self._db.latency)
+        return self._db.respond(self.table, self.calls)
+
+class AsyncFakeQuery(FakeQuery):
+    async def execute(self) -> FakeResponse:
+        if self._db.latency:
+            await asyncio.sleep(self._db.latency)
+        return self._db.respond(self.table, self.calls)
+
+class FakeSupabase:
+    def __init__(self, handler: Callable[[str, List[Call]], Any], *, latency: float = 0.0, query_class: type = FakeQuery):
+        self.handler = handler
+        self.latency = latency
+        self.executed: List[Tuple[str, List[Call]]] = []
+        self._query_class = query_class
+        self._lock = threading.Lock()
+
+    def async_view(self) -> "FakeSupabase":
+        """Same handler and log, with awaitable execute() (the async client)."""
+        view = FakeSupabase(self.handler, latency=self.latency, query_class=AsyncFakeQuery)
+        view.executed = self.executed
+        view._lock = self._lock
+        return view
+
+    def table(self, name: str) -> FakeQuery:
+        return self._query_class(self, name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, count: Optional[str] = None) -> FakeQuery:
+        return self._query_class(self, f"rpc:{fn}", [("rpc", (params,), {"count": count} if count else {})])
+
+    def respond(self, table: str, calls: List[Call]) -> FakeResponse:
+        with self._lock:
+            self.executed.append((table, list(calls)))
+        out = self.handler(table, calls)
+        return out if isinstance(out, FakeResponse) else FakeResponse(out)
+
+    def tables(self) -> List[str]:
+        with self._lock:
+            return [t for t, _ in self.executed]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.executed.clear()
+
+def methods(calls: List[Call]) -> List[str]:
+    return [c[0] for c in calls]
+
+def args_of(calls: List[Call], method: str) -> List[Tuple[Any, ...]]:
+    """Positional args of every `method` call in the chain."""
+    return [c[1] for c in calls if c[0] == method]
+
+def db_calls(response: Any) -> int:
+    """PostgREST calls made for a request, from its Server-Timing header."""
+    m = re.search(r'desc="(\d+) calls"', response.headers.get("server-timing", ""))
+    assert m, "response has no Server-Timing db entry"
+    return int(m.group(1))
+
+def _like_regex(pattern: str) -> "re.Pattern[str]":
+    """LIKE pattern (% and _ wildcards, backslash escapes) as a regex."""
+    out, escaped = [], False
+    for ch in pattern.lower():
+        if escaped:
+            out.append(re.escape(ch))
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == "%":
+            out.append(".*")
+        elif ch == "_":
+            out.append(".")
+        else:
+            out.append(re.escape(ch))
+    return re.compile("".join(out), re.S)
+
+class MemoryDB:
+    """
+    handler over in-memory rows, enough for the entity reads and writes of the app:
+    eq / neq / in_ / lt / is_ (and not_.is_) / ilike filters, range(), limit(), single(),
+    insert / upsert / update. Select lists and order() are ignored: rows are stored
+    in the (embedded) shape the code reads. rpc results come from `rpc`, either a
+    value or a function of the params; set-returning results (lists of rows) go
+    through the same filters. Unless given, session_watermark changes with every
+    write (`version`) and is None for a session that has no row.
+    """
+    def __init__(self, tables: Optional[Dict[str, List[Dict[str, Any]]]] = None, rpc: Optional[Dict[str, Any]] = None):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {k: [dict(r) for r in v] for k, v in (tables or {}).items()}
+        self.rpc = dict(rpc or {})
+        self.rpc.setdefault("session_watermark", self._session_watermark)
+        self.version = 0
+        self._next_id = 1000
+
+    def _session_watermark(self, params: Dict[str, Any]) -> Optional[str]:
+        known = any(str(r.get("id")) == str(params["p_session_id"]) for r in self.tables.get("sessions", []))
+        return f"v{self.version}" if known else None
+
+    def _matches(self, row: Dict[str, Any], calls: List[Call]) -> bool:
+        negate = False
+        for name, args, _ in calls:
+            if name == "not_":
+                negate = True
+                continue
+            if name in ("eq", "neq", "in_", "lt", "is_", "ilike"):
+                col, value = args[0], args[1]
+                cell = row.get(col)
+                if name == "eq":
+                    ok = cell == value or str(cell) == str(value)
+                elif name == "neq":
+                    ok = not (cell == value or str(cell) == str(value))
+                elif name == "in_":
+                    ok = cell in value or str(cell) in {str(v) for v in value}
+                elif name == "lt":
+                    ok = cell is not None and cell < value
+                elif name == "ilike":
+                    ok = cell is not None and _like_regex(value).fullmatch(str(cell).lower()) is not None
+                else:
+                    ok = cell is None if value in (None, "null") else cell == value
+                if ok == negate:
+                    return False
+                negate = False
+        return True
+
+    def __call__(self, table: str, calls: List[Call]) -> Any:
+        names = methods(calls)
+        if table.startswith("rpc:"):
+            value = self.rpc[table[4:]]
+            value = value(calls[0][1][0]) if callable(value) else value
+            if not (isinstance(value, list) and all(isinstance(r, dict) for r in value)):
+                return value
+            rows = value
+        else:
+            rows = self.tables.setdefault(table, [])
+        if "insert" in names or "upsert" in names:
+            op = "insert" if "insert" in names else "upsert"
+            self.version += 1
+            payload = args_of(calls, op)[0][0]
+            conflict = dict((c[0], c[2]) for c in calls).get("upsert", {}).get("on_conflict", "id")
+            out = []
+            for item in payload if isinstance(payload, list) else [payload]:
+                existing = next((r for r in rows if op == "upsert" and conflict in item and r.get(conflict) == item[conflict]), None)
+                if existing is not None:
+                    existing.update(item)
+                    out.append(dict(existing))
+                    continue
+                row = dict(item)
+                if "id" not in row:
+                    self._next_id += 1
+                    row["id"] = self._next_id
+                rows.append(row)
+                out.append(dict(row))
+            return out
+        matched = [r for r in rows if self._matches(r, calls)]
+        if "update" in names or "delete" in names:
+            self.version += 1
+        if "update" in names:
+            values = args_of(calls, "update")[0][0]
+            for r in matched:
+                r.update(values)
+        if "delete" in names:
+            self.tables[table] = [r for r in rows if r not in matched]
+        for start, end in args_of(calls, "range"):
+            matched = matched[start:end + 1]
+        for (n,) in args_of(calls, "limit"):
+            matched = matched[:n]
+        out = [dict(r) for r in matched]
+        if "single" in names or "maybe_single" in names:
+            return out[0] if out else None
+        return out
+
+class SqliteDB:
+    """
+    handler that runs read chains as SQL on a SQLite connection, for benchmarks
+    over seeded data: select (with count=), eq / in_ / lt / ilike filters,
+    order(), range() and limit(). rpc results come from `rpc` as in MemoryDB.
+    """
+    def __init__(self, conn, rpc: Optional[Dict[str, Any]] = None):
+        self.conn = conn
+        self.rpc = dict(rpc or {})
+
+    def __call__(self, table: str, calls: List[Call]) -> Any:
+        if table.startswith("rpc:"):
+            value = self.rpc[table[4:]]
+            return value(calls[0][1][0]) if callable(value) else value
+        where, params, order, limit, offset, count = [], [], "", -1, 0, None
+        for name, args, kwargs in calls:
+            if name == "select":
+                count = kwargs.get("count")
+            elif name == "eq":
+                where.append(f"{args[0]} = ?")
+                params.append(args[1])
+            elif name == "lt":
+                where.append(f"{args[0]} < ?")
+                params.append(args[1])
+            elif name == "in_":
+                where.append(f"{args[0]} IN ({', '.join('?' for _ in args[1])})")
+                params.extend(args[1])
+            elif name == "ilike":
+                where.append(f"lower({args[0]}) LIKE lower(?)")
+                params.append(args[1])
+            elif name == "order":
+                order = f" ORDER BY {args[0]} {'DESC' if kwargs.get('desc') else 'ASC'}"
+            elif name == "range":
+                offset, limit = args[0], args[1] - args[0] + 1
+            elif name == "limit":
+                limit = args[0]
+        sql_where = f" WHERE {' AND '.join(where)}" if where else ""
+        cur = self.conn.execute(f"SELECT * FROM {table}{sql_where}{order} LIMIT ? OFFSET ?", (*params, limit, offset))
+        columns = [d[0] for d in cur.description]
+        rows = [dict(zip(columns, r)) for r in cur.fetchall()]
+        total = None
+        if count:
+            total = self.conn.execute(f"SELECT count(*) FROM {table}{sql_where}", params).fetchone()[0]
+        return FakeResponse(rows, total)
@@ -0,0 +1,79 @@
+from typing import Any, Dict, List, Optional
+import threading
+import time
+import httpx
+from notion_client import APIErrorCode, APIResponseError
+
+# Stand-in for notion_client.Client: pages.retrieve answers from `pages` after
+# `latency` seconds, records every call, and can answer 429 a set number of times.
+
+def page_id(n: int) -> str:
+    return f"{n:08x}-0000-0000-0000-000000000000"
+
+def facility_page(pid: str, related: List[str], *, last_edited_time: str = "2026-10-01T00:00:00.000Z",
+                  contact_email: str = "tanaka@x.jp") -> Dict[str, Any]:
+    return {
+        "object": "page",
+        "id": pid,
+        "last_edited_time": last_edited_time,
+        "properties": {
+            "facility name": {"type": "title", "title": [{"plain_text": "さくら園"}]},
+            "担当者名": {"type": "rich_text", "rich_text": [{"plain_text": "Tanaka"}]},
+            "Mail": {"type": "rich_text", "rich_text": [{"plain_text": contact_email}]},
+            "評価者": {"type": "relation", "relation": [{"id": r} for r in related]},
+        },
+    }
+
+def evaluator_page(pid: str, n: int) -> Dict[str, Any]:
+    return {
+        "object": "page",
+        "id": pid,
+        "properties": {
+            "名前": {"type": "title", "title": [{"plain_text": f"Evaluator {n}"}]},
+            "メール": {"type": "email", "email": f"e{n}@x.jp"},
+        },
+    }
+
+def facility_with_evaluators(n_related: int) -> Dict[str, Dict[str, Any]]:
+    """Pages for one facility row relating to `n_related` evaluator pages."""
+    related = [page_id(100 + i) for i in range(n_related)]
+    pages = {page_id(1): facility_page(page_id(1), related)}
+    for i, pid in enumerate(related):
+        pages[pid] = evaluator_page(pid, i)
+    return pages
+
+class _Pages:
+    def __init__(self, stub: "NotionStub"):
+        self._stub = stub
+
+    def retrieve(self, page_id: str) -> Dict[str, Any]:
+        return self._stub.retrieve(page_id)
+
+class NotionStub:
+    def __init__(self, pages: Dict[str, Dict[str, Any]], *, latency: float = 0.0,
+                 rate_limited: int = 0, retry_after: Optional[str] = None):
+        self.pages_by_id = pages
+        self.latency = latency
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.calls: List[tuple] = []  # (page_id, monotonic time, status)
+        self.pages = _Pages(self)
+        self._lock = threading.Lock()
+
+    def retrieve(self, page_id: str) -> Dict[str, Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            limited = self.rate_limited > 0
+            if limited:
+                self.rate_limited -= 1
+            self.calls.append((page_id, time.monotonic(), 429 if limited else 200))
+        if limited:
+            headers = {"retry-after": self.retry_after} if self.retry_after is not None else {}
+            raise APIResponseError(httpx.Response(429, headers=headers), "rate limited", APIErrorCode.RateLimited)
+        if page_id not in self.pages_by_id:
+            raise APIResponseError(httpx.Response(404), "not found", APIErrorCode.ObjectNotFound)
+        return self.pages_by_id[page_id]
+
+    def retrieved(self) -> List[str]:
+        return [pid for pid, _, status in self.calls if status == 200]
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List
+from tests.fakes import MemoryDB
+
+# Canned rows shared by the endpoint tests.
+
+def status_row(session_id: int = 1) -> Dict[str, Any]:
+    """A session as the status query embeds it: facility, 2 evaluators with answers, 3 slots."""
+    return {
+        "id": session_id,
+        "facility_id": 10,
+        "purpose": "評価",
+        "status": "起案中",
+        "response_deadline": "2026-11-01",
+        "presentation_date": "2026-11-20",
+        "notion_url": "https://www.notion.so/page",
+        "facility_form_view_url": None,
+        "facility_form_edit_url": None,
+        "facility": {"id": 10, "name": "Facility A", "contact_name": "Tanaka", "contact_email": "a@x.jp", "notion_url": None},
+        "session_evaluators": [
+            {
+                "id": 101, "evaluator_id": 7, "answered_at": "2026-10-10T00:00:00Z", "note": "note",
+                "evaluator_form_view_url": None, "evaluator_form_edit_url": None, "evaluator_form_id": None,
+                "evaluator": {"id": 7, "name": "Sato", "email": "s@x.jp"},
+                "evaluator_responses": [
+                    {"candidate_slot_id": 501, "choice": "O"},
+                    {"candidate_slot_id": 502, "choice": "X"},
+                ],
+            },
+            {
+                "id": 102, "evaluator_id": 8, "answered_at": None, "note": None,
+                "evaluator_form_view_url": None, "evaluator_form_edit_url": None, "evaluator_form_id": None,
+                "evaluator": {"id": 8, "name": "Suzuki", "email": "z@x.jp"},
+                "evaluator_responses": [{"candidate_slot_id": 503, "choice": "M"}],
+            },
+        ],
+        "candidate_slots": [
+            {"id": 501, "slot_date": "2026-11-05", "slot_label": "AM", "sort_order": 0},
+            {"id": 502, "slot_date": "2026-11-06", "slot_label": "PM", "sort_order": 1},
+            {"id": 503, "slot_date": "2026-11-07", "slot_label": "AM", "sort_order": 2},
+        ],
+        "client_responses": [],
+    }
+
+def status_db(*sessions: Dict[str, Any]) -> MemoryDB:
+    """MemoryDB serving embedded session rows, with a watermark per known session."""
+    known = {s["id"] for s in sessions}
+    return MemoryDB(
+        {"sessions": list(sessions)},
+        rpc={"session_watermark": lambda p: f"wm-{p['p_session_id']}" if p["p_session_id"] in known else None},
+    )
+
+def flat_tables(*sessions: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """The same sessions as plain table rows (what per-table queries read)."""
+    tables: Dict[str, List[Dict[str, Any]]] = {
+        "sessions": [], "facilities": [], "session_evaluators": [], "evaluators": [],
+        "candidate_slots": [], "evaluator_responses": [],
+    }
+    for s in sessions:
+        tables["sessions"].append({k: v for k, v in s.items() if not isinstance(v, (dict, list))})
+        if s["facility"]["id"] not in {f["id"] for f in tables["facilities"]}:
+            tables["facilities"].append(dict(s["facility"]))
+        for se in s["session_evaluators"]:
+            tables["session_evaluators"].append({
+                **{k: v for k, v in se.items() if k not in ("evaluator", "evaluator_responses")},
+                "session_id": s["id"],
+            })
+            if se["evaluator"]["id"] not in {e["id"] for e in tables["evaluators"]}:
+                tables["evaluators"].append(dict(se["evaluator"]))
+            for r in se["evaluator_responses"]:
+                tables["evaluator_responses"].append({**r, "session_evaluator_id": se["id"]})
+        for sl in s["candidate_slots"]:
+            tables["candidate_slots"].append({**sl, "session_id": s["id"]})
+    return tables
+
+# session_list_v rows: 25 sessions, alternating between two facilities, newest first
+FACILITIES = [{"id": 1, "name": "さくら園"}, {"id": 2, "name": "ひまわり苑"}]
+
+def list_row(session_id: int, facility_id: int) -> Dict[str, Any]:
+    return {
+        "id": session_id,
+        "facility_id": facility_id,
+        "facility_name": FACILITIES[facility_id - 1]["name"],
+        "purpose": "評価",
+        "status": "起案中",
+        "confirmed_date": None,
+        "notion_url": None,
+        "updated_at": "2026-10-01T00:00:00Z",
+        "total_evaluators": 2,
+        "answered": 1,
+    }
+
+def list_db(n: int = 25) -> MemoryDB:
+    rows = [list_row(i, 1 if i % 2 else 2) for i in range(n, 0, -1)]
+    return MemoryDB(
+        {"session_list_v": rows, "facilities": FACILITIES},
+        rpc={"session_list_watermark": "wm-list"},
+    )
+
+def list_calls(fake) -> List[Any]:
+    """Builder chains of the session_list_v queries."""
+    return [calls for table, calls in fake.executed if table == "session_list_v"]
@@ -0,0 +1,77 @@
+import asyncio
+import time
+import anyio.to_thread
+import httpx
+from fastapi import FastAPI
+from app.db import get_supabase
+from app.routes.api.hooks.make_evaluator_email import GenerateEmailBody, router as evaluator_email_router
+from app.services.hooks.make_evaluator_email_service import build_make_payload, mark_session_status
+from tests.bench import ms, report
+from tests.fakes import FakeSupabase, MemoryDB
+
+# Head-of-line blocking behind a slow Make webhook: while SENDS email requests wait on
+# Make, how long does an unrelated sync route on the same AnyIO threadpool take?
+THREADS = 4
+SENDS = 8
+MAKE_SEC = 0.3
+
+def _db():
+    return MemoryDB({
+        "sessions": [{"id": 1, "facility_id": 10, "purpose": "評価", "status": "起案中",
+                      "response_deadline": "2026-11-01", "presentation_date": "2026-11-20", "notion_url": None}],
+        "facilities": [{"id": 10, "name": "A", "contact_name": None, "contact_email": "a@x.jp", "notion_url": None}],
+        "session_evaluators": [{"id": 101, "session_id": 1, "evaluator_id": 7, "invite_token": "tok-7",
+                                "evaluator": {"id": 7, "name": "Sato", "email": "s@x.jp"}}],
+        "candidate_slots": [],
+    })
+
+def _bench_app(monkeypatch) -> FastAPI:
+    app = FastAPI()
+    app.include_router(evaluator_email_router, prefix="/api/hooks")
+    supabase = FakeSupabase(_db())
+    app.dependency_overrides[get_supabase] = lambda: supabase
+
+    async def slow_make(payload, timeout_sec=120):
+        await asyncio.sleep(MAKE_SEC)
+        return 200
+    monkeypatch.setattr("app.routes.api.hooks.make_evaluator_email.apost_to_make_webhook", slow_make)
+
+    @app.post("/old/generate-evaluator-email")
+    def old_generate_email(body: GenerateEmailBody):
+        """The route before it went async: the Make call blocks a threadpool thread."""
+        payload = build_make_payload(supabase, body.session_id)
+        time.sleep(MAKE_SEC)  # post_to_make_webhook
+        mark_session_status(supabase, body.session_id, "評価者待ち")
+        return {"ok": True, "session_id": body.session_id, "make_status": 200, "evaluators": len(payload["evaluators"])}
+
+    @app.get("/probe")
+    def probe():
+        return {"ok": True}
+
+    return app
+
+def _probe_while_sending(app: FastAPI, path: str) -> float:
+    async def run() -> float:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADS
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            sends = [asyncio.create_task(client.post(path, json={"session_id": 1})) for _ in range(SENDS)]
+            await asyncio.sleep(0.05)  # every send is waiting on Make
+            start = time.perf_counter()
+            probe = await client.get("/probe")
+            elapsed = time.perf_counter() - start
+            assert probe.status_code == 200
+            for res in await asyncio.gather(*sends):
+                assert res.status_code == 200 and res.json()["ok"]
+            return elapsed
+    return asyncio.run(run())
+
+def test_slow_make_does_not_block_the_threadpool(monkeypatch):
+    app = _bench_app(monkeypatch)
+    old = _probe_while_sending(app, "/old/generate-evaluator-email")
+    new = _probe_while_sending(app, "/api/hooks/generate-evaluator-email")
+    report("sync route behind slow Make", threads=THREADS, sends=SENDS, make=ms(MAKE_SEC),
+           old_probe=ms(old), new_probe=ms(new))
+    # old: the probe queues behind the sends holding all threads
+    assert old > MAKE_SEC / 2
+    assert new < MAKE_SEC / 4
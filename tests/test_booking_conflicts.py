@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from app.services.sessions import booking_conflict_service as bookings
+from tests.fakes import FakeSupabase, MemoryDB
+from tests.samples import status_row
+
+def _confirmed(session_id, slot_id, slot_date, evaluator_ids, label="AM"):
+    """A client_responses row in the embedded shape the index loads."""
+    return {
+        "session_id": session_id,
+        "selected_candidate_slot_id": slot_id,
+        "slot": {"id": slot_id, "slot_date": slot_date, "slot_label": label},
+        "session": {"session_evaluators": [{"evaluator_id": e} for e in evaluator_ids]},
+    }
+
+def _db(*confirmed):
+    # session 1: Sato (7) answered ○ on 501 (2026-11-05); other sessions' confirmations in client_responses
+    return MemoryDB(
+        {"sessions": [status_row(1)], "client_responses": list(confirmed)},
+        rpc={"session_watermark": lambda p: "wm"},
+    )
+
+def test_status_flags_answers_that_collide_with_other_confirmed_slots(api):
+    bookings._built_at = None  # built on first use
+    client, _ = api(_db(
+        _confirmed(2, 601, "2026-11-05", [7, 30]),  # same evaluator, same date
+        _confirmed(3, 701, "2026-11-06", [7]),      # Sato answered x on that date
+        _confirmed(4, 801, "2026-11-05", [31]),     # other evaluator
+    ))
+    body = client.get("/api/sessions/1/status").json()
+    assert body["conflicts"] == [{
+        "evaluator_id": 7, "slot_id": 501, "slot_date": "2026-11-05", "kind": "answer",
+        "other_session_id": 2, "other_slot_id": 601, "other_slot_label": "AM",
+    }]
+
+def test_lookup_ignores_the_session_itself():
+    bookings._replace_index([_confirmed(1, 501, "2026-11-05", [7])])
+    assert bookings.lookup_conflicts(session_id=1, checks=[(7, 501, "2026-11-05", "confirmed")]) == []
+    assert len(bookings.lookup_conflicts(session_id=2, checks=[(7, 601, "2026-11-05", "answer")])) == 1
+
+def test_reconfirming_a_session_moves_its_booking():
+    bookings._replace_index([])
+    bookings.record_confirmation(session_id=2, slot_id=601, slot_date="2026-11-05", evaluator_ids=[7, 8])
+    bookings.record_confirmation(session_id=3, slot_id=701, slot_date="2026-11-05", evaluator_ids=[7])
+    bookings.record_confirmation(session_id=2, slot_id=602, slot_date="2026-11-09", evaluator_ids=[7, 8])
+    assert bookings._by_evaluator[7] == [
+        (bookings._ordinal("2026-11-05"), 3, 701, None),
+        (bookings._ordinal("2026-11-09"), 2, 602, None),
+    ]
+    assert [c["other_session_id"] for c in bookings.lookup_conflicts(session_id=1, checks=[(7, 1, "2026-11-05", "answer")])] == [3]
+    assert bookings.lookup_conflicts(session_id=1, checks=[(8, 1, "2026-11-05", "answer")]) == []
+
+def test_save_client_response_reports_conflicts(api, monkeypatch):
+    monkeypatch.setattr("app.services.hooks.recipient_service.fetch_facility_info", lambda url: {})
+    db = MemoryDB({
+        "sessions": [{"id": 1, "facility_id": 10, "purpose": "評価", "status": "起案中",
+                      "response_deadline": None, "presentation_date": None, "notion_url": None}],
+        "facilities": [{"id": 10, "name": "A", "contact_name": None, "contact_email": None, "notion_url": None}],
+        "session_evaluators": [{"id": 101, "session_id": 1, "evaluator_id": 7,
+                                "evaluator": {"id": 7, "name": "Sato", "email": "s@x.jp"}}],
+        "candidate_slots": [{"id": 501, "session_id": 1, "slot_date": "2026-11-05", "slot_label": "AM", "sort_order": 0}],
+        "client_responses": [_confirmed(2, 601, "2026-11-05", [7], label="PM")],
+    })
+    bookings._built_at = None
+    client, _ = api(db)
+    res = client.post("/api/hooks/save-client-response", json={"session_id": 1, "selected_candidate_slot_id": 501})
+    assert res.status_code == 200
+    assert [(c["evaluator_id"], c["other_session_id"], c["other_slot_label"]) for c in res.json()["conflicts"]] == [(7, 2, "PM")]
+    # the confirmation is in the index right away
+    assert [c["other_session_id"] for c in bookings.lookup_conflicts(session_id=5, checks=[(7, 1, "2026-11-05", "answer")])] == [1, 2]
+
+def test_stale_index_is_refreshed_in_the_background(caplog):
+    bookings._replace_index([_confirmed(2, 601, "2026-11-05", [7])])
+    bookings._built_at = time.monotonic() - bookings._refresh_sec - 1
+    gate = asyncio.Event()
+
+    class SlowClient:
+        def table(self, name):
+            return self
+        def __getattr__(self, name):
+            return lambda *a, **k: self
+        @property
+        def not_(self):
+            return self
+        async def execute(self):
+            await gate.wait()
+            raise RuntimeError("PostgREST unavailable")
+
+    async def run():
+        await bookings.aensure_fresh(SlowClient())  # returns without waiting for the load
+        assert bookings._refresh_task is not None and not bookings._refresh_task.done()
+        # the stale index keeps answering meanwhile
+        assert len(bookings.lookup_conflicts(session_id=1, checks=[(7, 1, "2026-11-05", "answer")])) == 1
+        gate.set()
+        await bookings._refresh_task
+
+    with caplog.at_level(logging.WARNING, logger=bookings.__name__):
+        asyncio.run(run())
+    assert "Booking index refresh failed" in caplog.text
+    # the failure backs off instead of retrying on every request
+    assert bookings._failures == 1 and not bookings._needs_rebuild()
+    assert len(bookings.lookup_conflicts(session_id=1, checks=[(7, 1, "2026-11-05", "answer")])) == 1
+
+def test_first_build_failure_is_logged_not_raised(caplog):
+    bookings._built_at = None
+
+    def broken(table, calls):
+        raise RuntimeError("PostgREST unavailable")
+
+    with caplog.at_level(logging.WARNING, logger=bookings.__name__):
+        assert bookings.find_conflicts(FakeSupabase(broken), session_id=1, checks=[(7, 1, "2026-11-05", "answer")]) == []
+    assert "Booking index refresh failed" in caplog.text
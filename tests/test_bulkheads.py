@@ -0,0 +1,55 @@
+import threading
+from app.bulkhead import get_bulkhead
+from tests.notion_stub import facility_page, page_id
+from tests.samples import list_db, status_db, status_row
+
+FACILITY_URL = f"https://www.notion.so/{page_id(1).replace('-', '')}"
+
+def _saturate(name: str, release: threading.Event):
+    """Occupy every worker and queue slot of the bulkhead until `release` is set."""
+    bh = get_bulkhead(name)
+    started = threading.Semaphore(0)
+    def hold():
+        started.release()
+        release.wait(5)
+    futures = [bh.submit(hold) for _ in range(bh.max_workers + bh.max_queue)]
+    for _ in range(bh.max_workers):
+        assert started.acquire(timeout=2)
+    return futures
+
+def test_full_bulkhead_is_503_while_others_keep_serving(api, notion_api):
+    notion_api({page_id(1): facility_page(page_id(1), [])})
+    client, _ = api(list_db())
+    release = threading.Event()
+    futures = _saturate("notion", release)
+    try:
+        res = client.get("/api/notion/facility-info", params={"url": FACILITY_URL})
+        assert res.status_code == 503
+        assert res.headers["retry-after"] == "1"
+        assert "notion is saturated" in res.json()["detail"]
+        # the supabase bulkhead and the async routes are untouched
+        assert client.get("/api/sessions/list").status_code == 200
+        status_client, _ = api(status_db(status_row()))
+        assert status_client.get("/api/sessions/1/status").status_code == 200
+    finally:
+        release.set()
+        for f in futures:
+            f.result(timeout=5)
+    # once drained the route serves again
+    res = client.get("/api/notion/facility-info", params={"url": FACILITY_URL})
+    assert res.status_code == 200
+    assert res.json()["facility_name"] == "さくら園"
+
+def test_full_supabase_bulkhead_leaves_notion_serving(api, notion_api):
+    notion_api({page_id(1): facility_page(page_id(1), [])})
+    client, _ = api(list_db())
+    release = threading.Event()
+    futures = _saturate("supabase", release)
+    try:
+        assert client.get("/api/sessions/list").status_code == 503
+        assert client.get("/api/notion/facility-info", params={"url": FACILITY_URL}).status_code == 200
+    finally:
+        release.set()
+        for f in futures:
+            f.result(timeout=5)
+    assert client.get("/api/sessions/list").status_code == 200
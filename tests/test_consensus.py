@@ -0,0 +1,30 @@
+from tests.fakes import args_of
+from tests.samples import status_db, status_row
+
+def test_consensus_scores_and_ranks_every_slot(api):
+    row = status_row()
+    # a third evaluator who is ○ on 501 and 503
+    row["session_evaluators"].append({
+        "id": 103, "evaluator_id": 9,
+        "evaluator_responses": [{"candidate_slot_id": 501, "choice": "O"}, {"candidate_slot_id": 503, "choice": "O"}],
+    })
+    client, _ = api(status_db(row))
+    body = client.get("/api/sessions/1/slots/consensus").json()
+    assert body["evaluator_count"] == 3
+    by_slot = {s["slot_id"]: s for s in body["slots"]}
+    assert {k: by_slot[501][k] for k in ("ok", "maybe", "ng", "unanswered", "everyone_ok")} == {
+        "ok": 2, "maybe": 0, "ng": 0, "unanswered": 1, "everyone_ok": False,
+    }
+    assert (by_slot[502]["ng"], by_slot[503]["maybe"]) == (1, 1)
+    assert [by_slot[i]["rank"] for i in (501, 502, 503)] == [1, 3, 2]
+    assert body["recommended_slot_id"] == 501
+
+def test_consensus_batch_splits_ids_into_chunks(api):
+    n = 120
+    client, fake = api(status_db(*(status_row(i) for i in range(1, n + 1))))
+    ids = list(range(n, 0, -1)) + [999]
+    body = client.post("/api/sessions/consensus:batch", json={"session_ids": ids}).json()
+    assert [item["session_id"] for item in body["items"]] == ids[:-1]
+    chunks = [args_of(calls, "in_")[0][1] for table, calls in fake.executed if table == "sessions"]
+    assert sorted(len(c) for c in chunks) == [21, 50, 50]
+    assert sorted(i for c in chunks for i in c) == sorted(ids)
@@ -0,0 +1,134 @@
+from datetime import date
+from app.services.sessions import facility_search_service
+from app.services.sessions.create_service import _candidate_slot_rows, _evaluator_rows, _facility_row
+from tests.bench import ms, report, timed
+from tests.fakes import MemoryDB
+
+NOTION_URL = "https://www.notion.so/facility-page"
+LATENCY = 0.01
+
+FACILITY_INFO = {
+    "notion_page_id": "page-1",
+    "facility_name": "さくら園",
+    "contact_person": {"name": "Tanaka", "email": "t@x.jp"},
+    "evaluators": [
+        {"name": "Sato", "email": "s@x.jp"},
+        {"name": "No mail", "email": ""},
+    ],
+}
+
+def _body(**overrides):
+    body = {
+        "notion_url": NOTION_URL,
+        "purpose": "評価",
+        "response_deadline": "2026-11-01",
+        "presentation_date": "2026-11-20",
+        "candidate_slots": [
+            {"slot_date": "2026-11-05", "slot_label": " AM "},
+            {"slot_date": "2026-11-06", "slot_label": "PM"},
+        ],
+    }
+    body.update(overrides)
+    return body
+
+def test_create_session_sends_one_rpc(api, monkeypatch):
+    monkeypatch.setattr("app.routes.api.sessions.create.fetch_facility_info", lambda url: FACILITY_INFO)
+    sent = []
+    def rpc(params):
+        sent.append(params)
+        return {"session_id": 42, "facility_id": 9}
+    client, fake = api(MemoryDB(rpc={"create_session_with_notion": rpc}))
+
+    res = client.post("/api/sessions/create", json=_body())
+
+    assert res.status_code == 200
+    assert res.json() == {"session_id": 42}
+    assert fake.tables() == ["rpc:create_session_with_notion"]
+    (params,) = sent
+    assert params["p_facility"] == {
+        "notion_page_id": "page-1",
+        "notion_url": NOTION_URL,
+        "name": "さくら園",
+        "contact_name": "Tanaka",
+        "contact_email": "t@x.jp",
+    }
+    assert params["p_evaluators"] == [{"name": "Sato", "email": "s@x.jp"}]
+    assert params["p_session"] == {
+        "purpose": "評価",
+        "status": "起案中",
+        "response_deadline": "2026-11-01",
+        "presentation_date": "2026-11-20",
+        "notion_url": NOTION_URL,
+    }
+    assert params["p_slots"] == [
+        {"slot_date": "2026-11-05", "slot_label": "AM", "sort_order": 0},
+        {"slot_date": "2026-11-06", "slot_label": "PM", "sort_order": 1},
+    ]
+    # the new facility is searchable without an index rebuild
+    assert facility_search_service._names[9] == "さくら園"
+
+def test_create_session_rejects_unknown_purpose(api, monkeypatch):
+    monkeypatch.setattr("app.routes.api.sessions.create.fetch_facility_info", lambda url: FACILITY_INFO)
+    client, fake = api(MemoryDB(rpc={"create_session_with_notion": {"session_id": 1, "facility_id": 1}}))
+    res = client.post("/api/sessions/create", json=_body(purpose="unknown"))
+    assert res.status_code == 400
+    assert fake.tables() == []
+
+def test_create_session_without_session_id_is_400(api, monkeypatch):
+    monkeypatch.setattr("app.routes.api.sessions.create.fetch_facility_info", lambda url: FACILITY_INFO)
+    client, _ = api(MemoryDB(rpc={"create_session_with_notion": None}))
+    res = client.post("/api/sessions/create", json=_body())
+    assert res.status_code == 400
+    assert "no session id" in res.json()["detail"]
+
+def _old_create_session(supabase, info, body):
+    """The per-table writes that create_session_with_notion replaced, one round trip each."""
+    facility = _facility_row(notion_url=NOTION_URL, info=info)
+    res = supabase.table("facilities").upsert(facility, on_conflict="notion_page_id", returning="representation").execute()
+    facility_id = res.data[0]["id"]
+    rows = _evaluator_rows(info["evaluators"])
+    supabase.table("evaluators").upsert(rows, on_conflict="email", returning="minimal").execute()
+    evaluator_ids = [
+        r["id"] for r in supabase.table("evaluators").select("id,email").in_("email", [r["email"] for r in rows]).execute().data
+    ]
+    session_id = supabase.table("sessions").insert({
+        "facility_id": facility_id, "purpose": body["purpose"], "status": "起案中",
+        "response_deadline": body["response_deadline"], "presentation_date": body["presentation_date"],
+        "notion_url": NOTION_URL,
+    }, returning="representation").execute().data[0]["id"]
+    supabase.table("session_evaluators").insert([{"session_id": session_id, "evaluator_id": e} for e in evaluator_ids]).execute()
+    supabase.table("candidate_slots").insert([
+        {**s, "session_id": session_id} for s in _candidate_slot_rows(_slots(body))
+    ]).execute()
+    return session_id
+
+def _slots(body):
+    return [{"slot_date": date.fromisoformat(s["slot_date"]), "slot_label": s["slot_label"]} for s in body["candidate_slots"]]
+
+def test_create_session_round_trips_vs_sequential_writes(api, monkeypatch):
+    info = {**FACILITY_INFO, "evaluators": [{"name": f"E{i}", "email": f"e{i}@x.jp"} for i in range(8)]}
+    monkeypatch.setattr("app.routes.api.sessions.create.fetch_facility_info", lambda url: info)
+    body = _body()
+    db = MemoryDB()
+
+    def procedure(params):
+        # what the SQL function does, as one call
+        f = db("facilities", [("upsert", (params["p_facility"],), {"on_conflict": "notion_page_id"})])[0]
+        db("evaluators", [("upsert", (params["p_evaluators"],), {"on_conflict": "email"})])
+        s = db("sessions", [("insert", ({**params["p_session"], "facility_id": f["id"]},), {})])[0]
+        return {"session_id": s["id"], "facility_id": f["id"]}
+
+    db.rpc["create_session_with_notion"] = procedure
+    client, fake = api(db, latency=LATENCY)
+
+    fake.reset()
+    _old_create_session(fake, info, body)
+    old_calls = len(fake.executed)
+    fake.reset()
+    assert client.post("/api/sessions/create", json=body).status_code == 200
+    new_calls = len(fake.executed)
+    old_s = timed(lambda: _old_create_session(fake, info, body))
+    new_s = timed(lambda: client.post("/api/sessions/create", json=body))
+    report("create session", old_calls=old_calls, new_calls=new_calls, old=ms(old_s), new=ms(new_s), latency=ms(LATENCY))
+    assert (old_calls, new_calls) == (6, 1)
+    assert new_s * 3 < old_s
@@ -0,0 +1,101 @@
+from datetime import date
+import pytest
+from app.services.hooks.make_facility_email_service import build_make_payload
+from app.services.sessions import entity_cache_service as entities
+from app.services.sessions.create_service import create_session_with_notion
+from tests.fakes import FakeSupabase, MemoryDB, methods
+
+def _tables():
+    return {
+        "sessions": [
+            {"id": 1, "facility_id": 10, "purpose": "評価", "status": "起案中",
+             "response_deadline": "2026-11-01", "presentation_date": "2026-11-20", "notion_url": None},
+            {"id": 2, "facility_id": 10, "purpose": "評価", "status": "起案中",
+             "response_deadline": "2026-12-01", "presentation_date": "2026-12-20", "notion_url": None},
+        ],
+        "facilities": [{"id": 10, "name": "さくら園", "contact_name": "Tanaka", "contact_email": "a@x.jp", "notion_url": None}],
+        "session_evaluators": [
+            {"id": 101, "session_id": 1, "evaluator_id": 7, "invite_token": "tok-7",
+             "evaluator": {"id": 7, "name": "Sato", "email": "s@x.jp"}},
+        ],
+        "candidate_slots": [{"id": 501, "session_id": 1, "slot_date": "2026-11-05", "slot_label": "AM", "sort_order": 0}],
+    }
+
+def _reads(fake):
+    return [table for table, calls in fake.executed if not table.startswith("rpc:") and "select" in methods(calls)]
+
+@pytest.fixture
+def db():
+    return MemoryDB(_tables())
+
+def _payload(db, session_id=1):
+    fake = FakeSupabase(db)
+    return build_make_payload(fake, session_id, [501]), fake
+
+def test_unchanged_session_is_served_from_the_cache(db):
+    first, fake = _payload(db)
+    assert sorted(_reads(fake)) == ["candidate_slots", "facilities", "session_evaluators", "sessions"]
+    again, fake = _payload(db)
+    # only the watermark is read
+    assert fake.tables() == ["rpc:session_watermark"]
+    assert again == first
+
+def test_write_by_another_worker_is_not_served_stale(db):
+    first, _ = _payload(db)
+    # another worker's update: nothing is invalidated here, but the watermark moves
+    db.tables["sessions"][0].update({"purpose": "再評価", "response_deadline": "2026-11-08"})
+    db.tables["facilities"][0]["contact_email"] = "new@x.jp"
+    db.version += 1
+    second, fake = _payload(db)
+    assert (second["purpose"], second["response_deadline"]) == ("再評価", "2026-11-08")
+    assert second["facility"]["contact_emails"] == ["new@x.jp"]
+    assert sorted(_reads(fake)) == ["candidate_slots", "facilities", "session_evaluators", "sessions"]
+    assert first["purpose"] == "評価"
+
+def test_entries_are_only_served_under_their_watermark():
+    calls = []
+    def load():
+        calls.append(1)
+        return {"id": 1, "purpose": f"read {len(calls)}"}
+    assert entities._read_at(entities._sessions, 1, "w1", load)["purpose"] == "read 1"
+    assert entities._read_at(entities._sessions, 1, "w1", load)["purpose"] == "read 1"
+    assert entities._read_at(entities._sessions, 1, "w2", load)["purpose"] == "read 2"
+    # an unknown session (no watermark) is never cached
+    entities._read_at(entities._sessions, 9, None, load)
+    entities._read_at(entities._sessions, 9, None, load)
+    assert len(calls) == 4 and entities._sessions.peek(9) is None
+
+def test_invalidate_session_drops_only_that_session(db):
+    _payload(db, 1)
+    _payload(db, 2)
+    entities.invalidate_session(1)
+    for cache in entities._SESSION_SCOPED:
+        assert cache.peek(1) is None
+    assert entities._sessions.peek(2) is not None
+    assert entities._facilities.peek(2) is not None
+
+def test_load_racing_an_invalidation_is_not_stored(db):
+    def handler(table, calls):
+        if table == "sessions":
+            entities.invalidate_session(1)  # a write lands while the read is in flight
+        return db(table, calls)
+    fake = FakeSupabase(handler)
+    row = entities.get_session_row(fake, 1, "w1")
+    assert row["purpose"] == "評価"
+    assert entities._sessions.peek(1) is None
+
+def test_create_session_keeps_other_sessions_cached(db):
+    _payload(db, 1)
+    _payload(db, 2)
+    db.rpc["create_session_with_notion"] = {"session_id": 3, "facility_id": 10}
+    create_session_with_notion(
+        FakeSupabase(db),
+        notion_url="https://www.notion.so/facility-page",
+        facility_info={"facility_name": "さくら園", "contact_person": {"email": "a@x.jp"}, "evaluators": []},
+        purpose="評価",
+        response_deadline=date(2026, 11, 1),
+        presentation_date=date(2026, 11, 20),
+        candidate_slots=[],
+    )
+    assert entities._sessions.peek(1) is not None and entities._sessions.peek(2) is not None
+    assert entities._facilities.peek(1) is not None
@@ -0,0 +1,27 @@
+from app.services.sessions import booking_conflict_service
+from tests.samples import list_db, status_db, status_row
+
+def test_status_etag_answers_304(api):
+    client, _ = api(status_db(status_row()))
+    first = client.get("/api/sessions/1/status")
+    etag = first.headers["etag"]
+    again = client.get("/api/sessions/1/status", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    other = client.get("/api/sessions/1/status", params={"answers_format": "compact"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+def test_list_etag_answers_304(api):
+    client, _ = api(list_db())
+    etag = client.get("/api/sessions/list").headers["etag"]
+    assert client.get("/api/sessions/list", headers={"If-None-Match": etag}).status_code == 304
+
+def test_status_etag_depends_on_the_watermark_only(api):
+    db = status_db(status_row())
+    client, _ = api(db)
+    first = client.get("/api/sessions/1/status").headers["etag"]
+    # another worker's booking index differs from this one's; the shared watermark does not
+    booking_conflict_service.record_confirmation(session_id=2, slot_id=601, slot_date="2026-11-05", evaluator_ids=[7])
+    assert client.get("/api/sessions/1/status").headers["etag"] == first
+    db.rpc["session_watermark"] = lambda p: "wm-after-write"
+    assert client.get("/api/sessions/1/status").headers["etag"] != first
@@ -0,0 +1,59 @@
+from app.services.notion import facility_info_service as fis
+from tests.notion_stub import facility_page, facility_with_evaluators, page_id
+
+FACILITY_URL = f"https://www.notion.so/{page_id(1).replace('-', '')}"
+
+def _expire(monkeypatch):
+    """Every entry set from now on is already past its TTL (it is revalidated on the next read)."""
+    monkeypatch.setattr(fis._facility_cache, "ttl_seconds", 0)
+
+def test_hit_makes_no_notion_call(notion_api):
+    stub = notion_api(facility_with_evaluators(2))
+    first = fis.fetch_facility_info(FACILITY_URL)
+    assert len(stub.calls) == 3
+    # any URL form of the same page id shares the entry
+    again = fis.fetch_facility_info(f"https://www.notion.so/Sakura-{page_id(1).replace('-', '')}?pvs=4")
+    assert again == first
+    assert len(stub.calls) == 3
+    # callers get their own copy
+    again["evaluators"].clear()
+    assert fis.fetch_facility_info(FACILITY_URL) == first
+
+def test_expired_entry_with_same_last_edited_time_is_revalidated(notion_api, monkeypatch):
+    _expire(monkeypatch)
+    stub = notion_api(facility_with_evaluators(2))
+    before = fis.facility_info_cache_stats()["revalidated"]
+    first = fis.fetch_facility_info(FACILITY_URL)
+    stub.calls.clear()
+    assert fis.fetch_facility_info(FACILITY_URL) == first
+    # only the facility page itself is re-read
+    assert stub.retrieved() == [page_id(1)]
+    assert fis.facility_info_cache_stats()["revalidated"] == before + 1
+
+def test_changed_last_edited_time_refetches_related_pages(notion_api, monkeypatch):
+    _expire(monkeypatch)
+    pages = facility_with_evaluators(2)
+    stub = notion_api(pages)
+    fis.fetch_facility_info(FACILITY_URL)
+    related = [page_id(100), page_id(101)]
+    pages[page_id(1)] = facility_page(page_id(1), related, last_edited_time="2026-10-02T00:00:00.000Z", contact_email="new@x.jp")
+    stub.calls.clear()
+    info = fis.fetch_facility_info(FACILITY_URL)
+    assert info["contact_person"]["email"] == "new@x.jp"
+    # the related pages are fetched concurrently, in any order
+    retrieved = stub.retrieved()
+    assert retrieved[0] == page_id(1) and sorted(retrieved[1:]) == related
+
+def test_entry_past_max_age_is_always_rebuilt(notion_api, monkeypatch):
+    _expire(monkeypatch)
+    pages = facility_with_evaluators(1)
+    stub = notion_api(pages)
+    fis.fetch_facility_info(FACILITY_URL)
+    # an evaluator page edit leaves the facility page's last_edited_time alone
+    pages[page_id(100)]["properties"]["メール"]["email"] = "changed@x.jp"
+    stub.calls.clear()
+    assert fis.fetch_facility_info(FACILITY_URL)["evaluators"][0]["email"] == "e0@x.jp"
+    monkeypatch.setattr(fis, "FACILITY_INFO_MAX_AGE_SECONDS", 0)
+    stub.calls.clear()
+    assert fis.fetch_facility_info(FACILITY_URL)["evaluators"][0]["email"] == "changed@x.jp"
+    assert stub.retrieved() == [page_id(1), page_id(100)]
@@ -0,0 +1,129 @@
+import random
+import sqlite3
+from app.services.sessions import facility_search_service, list_service
+from app.services.sessions.facility_search_service import fold_for_search, normalize_text_for_search, search_facility_ids
+from tests.bench import ms, report, timed
+from tests.fakes import FakeSupabase, MemoryDB, SqliteDB, args_of, methods
+from tests.samples import FACILITIES, list_calls, list_db
+
+def _with_fold(rows):
+    # facilities.name_fold is generated by fold_for_search() in SQL
+    return [{**r, "name_fold": fold_for_search(r["name"])} for r in rows]
+
+def _facility_calls(fake):
+    return [calls for table, calls in fake.executed if table == "facilities"]
+
+def test_list_facility_filter_uses_ids(api):
+    client, fake = api(list_db())
+    body = client.get("/api/sessions/list", params={"facility": "サクラ", "page_size": 100}).json()
+    assert {r["facility_id"] for r in body["items"]} == {1}
+    (calls,) = list_calls(fake)
+    assert args_of(calls, "in_") == [("facility_id", [1])]
+    assert "ilike" not in methods(calls)
+
+def test_list_facility_without_match_skips_the_query(api):
+    client, fake = api(list_db())
+    body = client.get("/api/sessions/list", params={"facility": "どこにもない"}).json()
+    assert body["items"] == [] and body["total"] == 0
+    assert list_calls(fake) == []
+    # the index load, then the database check for facilities the index has not seen
+    load, miss = _facility_calls(fake)
+    assert "range" in methods(load)
+    assert args_of(miss, "ilike") == [("name_fold", "%どこにもない%")]
+
+def test_list_blank_facility_is_no_filter(api):
+    client, fake = api(list_db())
+    client.get("/api/sessions/list", params={"facility": " 　 "})
+    (calls,) = list_calls(fake)
+    assert "in_" not in methods(calls) and "ilike" not in methods(calls)
+    assert "facilities" not in fake.tables()
+
+def test_index_miss_finds_facilities_created_elsewhere():
+    db = MemoryDB({"facilities": _with_fold(FACILITIES)})
+    fake = FakeSupabase(db)
+    assert search_facility_ids(fake, "さくら") == [1]
+    # another worker creates a facility after this worker built its index
+    db.tables["facilities"].extend(_with_fold([{"id": 3, "name": "アオバ ハウス"}]))
+    assert search_facility_ids(fake, "あおばはうす") == [3]
+    fake.reset()
+    # the database hit was added to the local index
+    assert search_facility_ids(fake, "ｱｵﾊﾞ") == [3]
+    assert fake.executed == []
+
+def test_unavailable_index_searches_the_database(monkeypatch):
+    def broken(supabase):
+        raise RuntimeError("facilities page failed")
+    monkeypatch.setattr(facility_search_service, "rebuild", broken)
+    fake = FakeSupabase(MemoryDB({"facilities": _with_fold(FACILITIES)}))
+    assert search_facility_ids(fake, "ヒマワリ") == [2]
+    assert search_facility_ids(fake, "ひま", prefix=True) == [2]
+    assert search_facility_ids(fake, "まわ", prefix=True) == []
+
+def test_many_matching_facilities_are_posted_not_ilike(api, monkeypatch):
+    monkeypatch.setattr(list_service, "FACILITY_IN_FILTER_MAX", 0)
+    db = list_db()
+    db.rpc["session_list_for_facilities"] = lambda p: [
+        r for r in db.tables["session_list_v"] if r["facility_id"] in p["p_facility_ids"]
+    ]
+    client, fake = api(db)
+    body = client.get("/api/sessions/list", params={"facility": "さくら", "page_size": 5, "purpose": "評価"}).json()
+    assert [r["id"] for r in body["items"]] == [25, 23, 21, 19, 17]
+    assert list_calls(fake) == []
+    ((table, calls),) = [(t, c) for t, c in fake.executed if t.startswith("rpc:session_list_for")]
+    assert args_of(calls, "rpc") == [({"p_facility_ids": [1]},)]
+    assert args_of(calls, "eq") == [("purpose", "評価")]
+    assert args_of(calls, "range") == [(0, 5)]
+    assert "ilike" not in methods(calls)
+
+# Index vs ilike over 100k facility names
+
+_STEMS = ["さくら", "サクラ", "ひまわり", "ﾋﾏﾜﾘ", "あおば", "アオバ", "みどり", "ミドリ", "若葉", "青空", "ＡＢＣ", "Abc"]
+_SUFFIXES = ["園", "苑", " ホーム", "の家", "ケア センター", "デイサービス", "　ハウス"]
+
+def _facility_db(n: int):
+    rnd = random.Random(9)
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.create_function("fold_for_search", 1, fold_for_search, deterministic=True)
+    conn.create_function("normalize_text_for_search", 1, normalize_text_for_search, deterministic=True)
+    conn.executescript("""
+        CREATE TABLE facilities (
+            id INTEGER PRIMARY KEY, name TEXT,
+            name_fold TEXT GENERATED ALWAYS AS (fold_for_search(name)) STORED,
+            name_norm TEXT GENERATED ALWAYS AS (normalize_text_for_search(name)) STORED
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO facilities (id, name) VALUES (?, ?)",
+        ((i, f"{rnd.choice(_STEMS)}{rnd.choice(_SUFFIXES)}{i}") for i in range(1, n + 1)),
+    )
+    return conn
+
+def test_index_search_vs_ilike_at_100k_facilities():
+    n = 100_000
+    conn = _facility_db(n)
+    fake = FakeSupabase(SqliteDB(conn))
+    search_facility_ids(fake, "warm-up")  # builds the index
+
+    def like(column, pattern):
+        return sorted(r[0] for r in conn.execute(f"SELECT id FROM facilities WHERE lower({column}) LIKE lower(?)", (pattern,)))
+
+    terms = ["サクラ", "ひまわりの家", "ｱｵﾊﾞ ケア", "若葉苑", "abcホーム 12", "青", "デイサービス9999"]
+    rows = []
+    for term in terms:
+        folded = fold_for_search(term)
+        ids = search_facility_ids(fake, term)
+        # same rows as an ilike over the folded column...
+        assert ids == like("name_fold", f"%{folded}%")
+        # ...and a superset of the old ilike over facility_name_norm, which misses kana/space variants
+        old = like("name_norm", f"%{normalize_text_for_search(term)}%")
+        assert set(old) <= set(ids)
+        index_s = timed(lambda: search_facility_ids(fake, term))
+        ilike_s = timed(lambda: like("name_norm", f"%{normalize_text_for_search(term)}%"))
+        rows.append((term, len(ids), len(old), index_s, ilike_s))
+    for term, matched, old_matched, index_s, ilike_s in rows:
+        report(f"facility search {term!r} in {n}", matched=matched, old_ilike_matched=old_matched,
+               index=ms(index_s), ilike_scan=ms(ilike_s))
+    # selective terms answer from the index in milliseconds, well under a full scan
+    selective = [r for r in rows if r[1] < 5000]
+    assert selective and all(index_s < 0.01 and index_s * 5 < ilike_s for _, _, _, index_s, ilike_s in selective)
+    assert sum(r[1] for r in rows) > sum(r[2] for r in rows)
@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+
+# Importing the app must stay cheap (gunicorn imports it per worker, and every
+# cold start pays for it): the supabase SDK is imported on first use only.
+IMPORT_BUDGET_SECONDS = 3.0
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+print(json.dumps({"seconds": time.perf_counter() - start, "supabase": "supabase" in sys.modules}))
+"""
+
+def test_app_import_is_lazy_and_within_budget():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": root},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["supabase"] is False
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS
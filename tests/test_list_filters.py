@@ -0,0 +1,46 @@
+import logging
+from app.services.meta import enum_service
+from tests.fakes import args_of
+from tests.samples import list_calls, list_db
+
+def _list(client, **params):
+    res = client.get("/api/sessions/list", params={"page_size": 5, **params})
+    assert res.status_code == 200
+    return res.json()
+
+def test_known_values_filter_the_list(api):
+    db = list_db()
+    db.tables["session_list_v"][0]["status"] = "確定"
+    client, fake = api(db)
+    body = _list(client, purpose="評価", status="確定")
+    assert [r["id"] for r in body["items"]] == [25]
+    (calls,) = list_calls(fake)
+    assert args_of(calls, "eq") == [("purpose", "評価"), ("status", "確定")]
+
+def test_unknown_value_is_an_empty_page(api):
+    client, fake = api(list_db())
+    for params in ({"purpose": "unknown"}, {"status": "unknown"}, {"purpose": "評価", "status": "unknown"}):
+        body = _list(client, **params)
+        assert body == {"items": [], "total": 0, "page": 1, "page_size": 5, "next_cursor": None}
+    assert list_calls(fake) == []
+    assert _list(client, status="unknown", count_mode="none")["total"] is None
+
+def test_enums_are_loaded_on_demand(api):
+    enum_service._values = enum_service._loaded_at = None
+    db = list_db()
+    db.rpc.update({"purpose_enum_values": ["評価"], "status_enum_values": ["起案中"]})
+    client, fake = api(db)
+    assert len(_list(client, purpose="評価")["items"]) == 5
+    assert _list(client, purpose="再評価")["items"] == []
+    # loaded once, then served from the cache
+    assert fake.tables().count("rpc:purpose_enum_values") == 1
+
+def test_unavailable_enums_skip_validation(api, caplog):
+    enum_service._values = enum_service._loaded_at = None
+    client, fake = api(list_db())  # no enum RPCs: loading fails
+    with caplog.at_level(logging.WARNING, logger=enum_service.__name__):
+        body = _list(client, status="起案中")
+    assert len(body["items"]) == 5
+    (calls,) = list_calls(fake)
+    assert args_of(calls, "eq") == [("status", "起案中")]
+    assert "not validated" in caplog.text
@@ -0,0 +1,75 @@
+import sqlite3
+import time
+from tests.bench import ms, report, timed
+from tests.fakes import SqliteDB, args_of, methods
+from tests.samples import list_calls, list_db
+
+def test_list_shape_and_page_mode(api):
+    client, _ = api(list_db())
+    body = client.get("/api/sessions/list", params={"page": 1, "page_size": 10}).json()
+    assert set(body) == {"items", "total", "page", "page_size", "next_cursor"}
+    assert [r["id"] for r in body["items"]] == list(range(25, 15, -1))
+    assert body["next_cursor"] == 16
+    assert (body["page"], body["page_size"]) == (1, 10)
+    last = client.get("/api/sessions/list", params={"page": 3, "page_size": 10}).json()
+    assert [r["id"] for r in last["items"]] == list(range(5, 0, -1))
+    assert last["next_cursor"] is None
+
+def test_list_page_fetches_one_extra_row(api):
+    client, fake = api(list_db())
+    client.get("/api/sessions/list", params={"page": 2, "page_size": 10})
+    (calls,) = list_calls(fake)
+    assert args_of(calls, "range") == [(10, 20)]
+
+def test_list_cursor_mode(api):
+    client, fake = api(list_db())
+    body = client.get("/api/sessions/list", params={"cursor": 16, "page_size": 10}).json()
+    assert [r["id"] for r in body["items"]] == list(range(15, 5, -1))
+    assert body["next_cursor"] == 6
+    (calls,) = list_calls(fake)
+    assert args_of(calls, "lt") == [("id", 16)]
+    assert "range" not in methods(calls)
+
+def _seeded(n: int):
+    """session_list_v over n sessions, 3 evaluators each, aggregated per row like the real view."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.executescript("""
+        CREATE TABLE sessions (id INTEGER PRIMARY KEY, facility_id INTEGER, purpose TEXT, status TEXT, updated_at TEXT);
+        CREATE TABLE facilities (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE session_evaluators (id INTEGER PRIMARY KEY, session_id INTEGER, answered_at TEXT);
+        CREATE INDEX session_evaluators_session_idx ON session_evaluators (session_id);
+        CREATE VIEW session_list_v AS
+        SELECT s.id, s.facility_id, f.name AS facility_name, f.name AS facility_name_norm, s.purpose, s.status,
+               NULL AS confirmed_date, NULL AS notion_url, s.updated_at,
+               (SELECT count(*) FROM session_evaluators se WHERE se.session_id = s.id) AS total_evaluators,
+               (SELECT count(se.answered_at) FROM session_evaluators se WHERE se.session_id = s.id) AS answered
+        FROM sessions s JOIN facilities f ON f.id = s.facility_id;
+    """)
+    conn.executemany("INSERT INTO facilities VALUES (?, ?)", ((i, f"施設{i}") for i in range(500)))
+    conn.executemany(
+        "INSERT INTO sessions VALUES (?, ?, '評価', '起案中', '2026-10-01')", ((i, i % 500) for i in range(1, n + 1))
+    )
+    conn.executemany(
+        "INSERT INTO session_evaluators (session_id, answered_at) VALUES (?, ?)",
+        ((i, "2026-10-02" if e == 0 else None) for i in range(1, n + 1) for e in range(3)),
+    )
+    return SqliteDB(conn, rpc={"session_list_watermark": lambda p: f"wm-{time.monotonic()}"})
+
+def test_deep_pages_stay_flat_with_cursor(api):
+    n, page_size = 100_000, 50
+    client, _ = api(_seeded(n))
+
+    def get(**params):
+        res = client.get("/api/sessions/list", params={"page_size": page_size, "count_mode": "none", **params})
+        assert res.status_code == 200
+        return res.json()
+
+    deep_page = n // page_size - 1
+    deep_cursor = page_size * 2 + 1  # the same rows as deep_page, reached by seeking
+    assert [r["id"] for r in get(page=deep_page)["items"]] == [r["id"] for r in get(cursor=deep_cursor)["items"]]
+    first_page_s = timed(lambda: get(page=1))
+    offset_s = timed(lambda: get(page=deep_page))
+    cursor_s = timed(lambda: get(cursor=deep_cursor))
+    report(f"list page {deep_page} of {n} rows", first_page=ms(first_page_s), offset=ms(offset_s), cursor=ms(cursor_s))
+    assert cursor_s < offset_s
+    assert cursor_s < first_page_s * 3
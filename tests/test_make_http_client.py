@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import socket
+import threading
+import time
+import urllib.request
+import pytest
+from app.services.hooks import make_http_client
+from tests.bench import ms, report, timed
+
+# Connection setup cost per new connection on the stub, standing in for the TCP+TLS
+# handshake to Make's webhook endpoint (no TLS on localhost).
+HANDSHAKE = 0.03
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(HANDSHAKE)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((json.loads(body), self.headers.get("Idempotency-Key")))
+        out = b"Accepted"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def webhook():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.received = []
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    make_http_client.get_http_client.cache_clear()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/hook"
+    if make_http_client.get_http_client.cache_info().currsize:
+        make_http_client.get_http_client().close()
+        make_http_client.get_http_client.cache_clear()
+    server.shutdown()
+    server.server_close()
+
+def _urllib_post(url, payload):
+    # the old path: a fresh urllib connection per call
+    req = urllib.request.Request(
+        url, data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json; charset=utf-8"}, method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=10) as res:
+        return res.status, res.read().decode("utf-8")
+
+def test_post_json_sends_utf8_json_and_idempotency_key(webhook):
+    server, url = webhook
+    assert make_http_client.post_json(url, {"name": "さくら園"}, idempotency_key="k1") == (200, "Accepted")
+    assert server.received == [({"name": "さくら園"}, "k1")]
+
+def test_unreachable_webhook_raises_timeout_error():
+    with pytest.raises(TimeoutError):
+        make_http_client.post_json("http://127.0.0.1:9/hook", {})
+
+def test_pooled_client_reuses_connections_under_burst(webhook):
+    server, url = webhook
+    burst, concurrency = 60, 6
+
+    def run(post):
+        with ThreadPoolExecutor(concurrency) as pool:
+            assert all(s == 200 for s, _ in pool.map(lambda i: post(url, {"i": i}), range(burst)))
+
+    server.connections = 0
+    urllib_s = timed(lambda: run(_urllib_post), repeat=3)
+    urllib_connections = server.connections // 3
+    server.connections = 0
+    run(make_http_client.post_json)  # the first burst opens the pool
+    opened = server.connections
+    pooled_s = timed(lambda: run(make_http_client.post_json), repeat=3)
+    reopened = server.connections - opened
+    report(f"burst of {burst} Make posts", urllib_connections=urllib_connections, pooled_opened=opened, pooled_reopened=reopened,
+           urllib=ms(urllib_s), pooled=ms(pooled_s), handshake=ms(HANDSHAKE))
+    assert urllib_connections == burst
+    assert opened <= make_http_client._max_connections
+    assert reopened == 0
+    assert pooled_s * 2 < urllib_s
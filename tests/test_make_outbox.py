@@ -0,0 +1,106 @@
+import time
+import pytest
+from app.services.hooks import make_outbox_service as outbox
+from tests.fakes import MemoryDB
+
+@pytest.fixture
+def box(tmp_path, monkeypatch):
+    """An empty outbox file and a 'test' target whose responses are scripted per call."""
+    monkeypatch.setattr(outbox, "_db_path", str(tmp_path / "outbox.sqlite3"))
+    monkeypatch.setattr(outbox, "_initialized", False)
+    monkeypatch.setattr(outbox, "_max_attempts", 3)
+    monkeypatch.setattr(outbox, "_targets", {})
+    sent = []
+    statuses = []
+
+    def sender(payload, key):
+        sent.append((payload, key))
+        status = statuses.pop(0) if statuses else 200
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    outbox.register_target("test", sender)
+    return sent, statuses
+
+def _rows():
+    with outbox._connect() as conn:
+        return [dict(r) for r in conn.execute("SELECT * FROM make_outbox ORDER BY id")]
+
+def _make_due():
+    with outbox._connect() as conn:
+        conn.execute("UPDATE make_outbox SET next_attempt_at = 0")
+
+def _deliver_due():
+    for row in outbox._claim_due(10):
+        outbox._deliver(row)
+
+def test_enqueue_is_idempotent(box):
+    sent, _ = box
+    assert outbox.enqueue("test", {"a": 1}, idempotency_key="k1")
+    assert not outbox.enqueue("test", {"a": 2}, idempotency_key="k1")
+    _deliver_due()
+    assert sent == [({"a": 1}, "k1")]
+    assert _rows()[0]["status"] == outbox.STATUS_DELIVERED
+
+def test_failure_is_retried_with_backoff(box):
+    sent, statuses = box
+    statuses.extend([500, RuntimeError("connection reset")])
+    outbox.enqueue("test", {"a": 1}, idempotency_key="k1")
+    _deliver_due()
+    (row,) = _rows()
+    assert (row["status"], row["attempts"], row["last_error"]) == (outbox.STATUS_PENDING, 1, "Make webhook returned 500")
+    assert row["next_attempt_at"] > time.time()
+    # not due yet: nothing is claimed
+    assert outbox._claim_due(10) == []
+    _make_due()
+    _deliver_due()
+    assert _rows()[0]["last_error"] == "connection reset"
+    _make_due()
+    _deliver_due()
+    (row,) = _rows()
+    assert (row["status"], row["attempts"], row["last_error"]) == (outbox.STATUS_DELIVERED, 3, None)
+    assert len(sent) == 3
+
+def test_backoff_grows_and_is_capped(monkeypatch):
+    monkeypatch.setattr(outbox.random, "uniform", lambda a, b: 1.0)
+    assert [outbox._backoff_seconds(n) for n in (1, 2, 3)] == [2.0, 4.0, 8.0]
+    assert outbox._backoff_seconds(30) == outbox._backoff_max_sec
+
+def test_exhausted_retries_are_dead_lettered(box, api):
+    _, statuses = box
+    statuses.extend([502, 502, 502])
+    outbox.enqueue("test", {"a": 1}, idempotency_key="k1")
+    for _ in range(3):
+        _make_due()
+        _deliver_due()
+    (row,) = _rows()
+    assert row["status"] == outbox.STATUS_DEAD
+    assert outbox._claim_due(10) == []
+    (dead,) = outbox.dead_letters()
+    assert (dead["idempotency_key"], dead["attempts"], dead["last_error"]) == ("k1", 3, "Make webhook returned 502")
+    client, _ = api(MemoryDB())
+    body = client.get("/api/meta/outbox/dead-letters").json()
+    assert [d["idempotency_key"] for d in body["items"]] == ["k1"]
+
+def test_result_of_a_lost_lease_is_not_recorded(box, monkeypatch):
+    outbox.enqueue("test", {"a": 1}, idempotency_key="k1")
+    (first,) = outbox._claim_due(10)
+    # the first worker stalls past its lease and another one re-claims the row
+    monkeypatch.setattr(outbox, "_lease_sec", -1)
+    (second,) = outbox._claim_due(10)
+    assert second["lease_owner"] != first["lease_owner"]
+    outbox._deliver({**first})
+    assert _rows()[0]["status"] == outbox.STATUS_DELIVERING
+    outbox._deliver(second)
+    assert _rows()[0]["status"] == outbox.STATUS_DELIVERED
+
+def test_purge_removes_old_delivered_rows_only(box):
+    _, statuses = box
+    statuses.extend([500])
+    outbox.enqueue("test", {"a": 1}, idempotency_key="failing")
+    outbox.enqueue("test", {"a": 2}, idempotency_key="ok")
+    _deliver_due()
+    assert outbox.purge_delivered() == 0  # within the retention period
+    assert outbox.purge_delivered(older_than_sec=-1) == 1
+    assert [r["idempotency_key"] for r in _rows()] == ["failing"]
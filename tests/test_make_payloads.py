@@ -0,0 +1,172 @@
+from collections import Counter
+import pytest
+from tests.fakes import MemoryDB, db_calls, methods
+
+NOTION_URL = "https://www.notion.so/facility-page"
+
+def _tables(invite_token=None):
+    return {
+        "sessions": [{
+            "id": 1, "facility_id": 10, "purpose": "評価", "status": "起案中",
+            "response_deadline": "2026-11-01", "presentation_date": "2026-11-20", "notion_url": None,
+        }],
+        "facilities": [{
+            "id": 10, "name": "さくら\n園", "contact_name": "Tanaka",
+            "contact_email": "a@x.jp、b@x.jp", "notion_url": NOTION_URL,
+        }],
+        "session_evaluators": [
+            {"id": 101, "session_id": 1, "evaluator_id": 7, "invite_token": "tok-7",
+             "evaluator": {"id": 7, "name": "Sato", "email": "s@x.jp"}},
+            {"id": 102, "session_id": 1, "evaluator_id": 8, "invite_token": invite_token,
+             "evaluator": {"id": 8, "name": "Suzuki", "email": "z@x.jp\nz2@x.jp"}},
+        ],
+        "candidate_slots": [
+            {"id": 501, "session_id": 1, "slot_date": "2026-11-05", "slot_label": "AM", "sort_order": 0},
+            {"id": 502, "session_id": 1, "slot_date": "2026-11-06", "slot_label": "PM", "sort_order": 1},
+        ],
+        "client_responses": [],
+    }
+
+HEADER = {
+    "session_id": 1,
+    "purpose": "評価",
+    "response_deadline": "2026-11-01",
+    "presentation_date": "2026-11-20",
+}
+FACILITY = {
+    "contact_name": "Tanaka",
+    # DB addresses first, then the Notion page's (deduplicated)
+    "contact_emails": ["a@x.jp", "b@x.jp", "n@x.jp"],
+    "notion_url": NOTION_URL,
+}
+SLOTS = [
+    {"id": 501, "slot_date": "2026-11-05", "slot_label": "AM", "sort_order": 0},
+    {"id": 502, "slot_date": "2026-11-06", "slot_label": "PM", "sort_order": 1},
+]
+
+@pytest.fixture
+def notion(monkeypatch):
+    """Notion page lookups made by the payload builders (fetch_facility_info's shape)."""
+    urls = []
+    def fetch(url):
+        urls.append(url)
+        return {"facility_name": "さくら園", "contact_person": {"name": "Tanaka", "email": "n@x.jp、A@x.jp"}}
+    monkeypatch.setattr("app.services.hooks.recipient_service.fetch_facility_info", fetch)
+    return urls
+
+@pytest.fixture
+def make(monkeypatch):
+    """Payloads posted to the Make webhooks, by route."""
+    sent = {}
+    async def evaluator(payload, timeout_sec=120):
+        sent["evaluator"] = payload
+        return 200
+    async def facility(payload, timeout_sec=120):
+        sent["facility"] = payload
+        return 200, '{"gmail_draft_url": "https://mail.test/draft"}'
+    monkeypatch.setattr("app.routes.api.hooks.make_evaluator_email.apost_to_make_webhook", evaluator)
+    monkeypatch.setattr("app.routes.api.hooks.make_facility_email.apost_to_make_webhook", facility)
+    return sent
+
+def _reads(fake):
+    """How many times each table was selected from (writes excluded)."""
+    return Counter(
+        table for table, calls in fake.executed
+        if "select" in methods(calls) and not {"insert", "upsert", "update"} & set(methods(calls))
+    )
+
+def test_evaluator_email_payload(api, notion, make):
+    db = MemoryDB(_tables(invite_token="tok-8"))
+    client, fake = api(db)
+    res = client.post("/api/hooks/generate-evaluator-email", json={"session_id": 1})
+    assert res.status_code == 200
+    assert make["evaluator"] == {
+        **HEADER,
+        "facility": {"name": "さくら 園", **FACILITY},
+        "evaluators": [
+            {"id": 7, "name": "Sato", "email": ["s@x.jp"], "invite_token": "tok-7"},
+            {"id": 8, "name": "Suzuki", "email": ["z@x.jp", "z2@x.jp"], "invite_token": "tok-8"},
+        ],
+        "candidate_slots": SLOTS,
+    }
+    assert notion == [NOTION_URL]
+    assert db.tables["sessions"][0]["status"] == "評価者待ち"
+
+def test_evaluator_email_reads_session_evaluators_once(api, notion, make):
+    client, fake = api(MemoryDB(_tables(invite_token="tok-8")))
+    res = client.post("/api/hooks/generate-evaluator-email", json={"session_id": 1})
+    # the session watermark, sessions, session_evaluators, candidate_slots, facilities + the status update
+    assert db_calls(res) == 6
+    assert _reads(fake) == {"sessions": 1, "session_evaluators": 1, "candidate_slots": 1, "facilities": 1}
+    assert not any("upsert" in methods(calls) for _, calls in fake.executed)
+
+def test_evaluator_email_writes_missing_tokens_once(api, notion, make):
+    db = MemoryDB(_tables(invite_token=None))
+    client, fake = api(db)
+    client.post("/api/hooks/generate-evaluator-email", json={"session_id": 1})
+    upserts = [calls for table, calls in fake.executed if "upsert" in methods(calls)]
+    assert len(upserts) == 1
+    # the write waits for the parallel payload reads instead of running among them
+    order = [("write" if "upsert" in methods(calls) else table) for table, calls in fake.executed]
+    assert order.index("write") > max(order.index("sessions"), order.index("candidate_slots"))
+    stored = {r["id"]: r["invite_token"] for r in db.tables["session_evaluators"]}
+    assert stored[101] == "tok-7" and stored[102]
+    # the payload carries exactly the tokens that were written, without reading them back
+    assert [e["invite_token"] for e in make["evaluator"]["evaluators"]] == ["tok-7", stored[102]]
+    assert _reads(fake)["session_evaluators"] == 2  # cached read + fresh re-read before writing
+
+    # the next send finds every token and leaves them alone
+    make.clear()
+    client.post("/api/hooks/generate-evaluator-email", json={"session_id": 1})
+    assert [e["invite_token"] for e in make["evaluator"]["evaluators"]] == ["tok-7", stored[102]]
+    assert len([1 for _, calls in fake.executed if "upsert" in methods(calls)]) == 1
+
+def test_facility_email_payload(api, notion, make):
+    client, fake = api(MemoryDB(_tables(invite_token="tok-8")))
+    res = client.post("/api/hooks/generate-facility-email", json={"session_id": 1, "candidate_slot_ids": [502]})
+    assert res.json() == {"ok": True, "session_id": 1, "make_status": 200, "gmail_draft_url": "https://mail.test/draft"}
+    assert make["facility"] == {
+        **HEADER,
+        "facility": {"name": "さくら 園", **FACILITY},
+        "evaluators": [
+            {"id": 7, "name": "Sato", "email": ["s@x.jp"]},
+            {"id": 8, "name": "Suzuki", "email": ["z@x.jp", "z2@x.jp"]},
+        ],
+        "selected_slots": [SLOTS[1]],
+    }
+    assert db_calls(res) == 5  # the watermark + 4 reads
+    assert _reads(fake) == {"sessions": 1, "session_evaluators": 1, "candidate_slots": 1, "facilities": 1}
+
+def test_client_response_payload(api, notion):
+    db = MemoryDB(_tables(invite_token="tok-8"))
+    client, fake = api(db)
+    res = client.post("/api/hooks/save-client-response", json={"session_id": 1, "selected_candidate_slot_id": 501, "note": "ok"})
+    assert res.status_code == 200
+    body = res.json()
+    (saved,) = db.tables["client_responses"]
+    assert body["client_response_payload"] == [{
+        **HEADER,
+        "facility": {"name": "さくら\n園", **FACILITY},
+        "evaluators": [
+            {"id": 7, "name": "Sato", "email": ["s@x.jp"]},
+            {"id": 8, "name": "Suzuki", "email": ["z@x.jp", "z2@x.jp"]},
+        ],
+        "client_response": {
+            "id": saved["id"],
+            # the slot row as loaded (the fake ignores select lists, hence session_id)
+            "preferred_slot": {**SLOTS[0], "session_id": 1},
+            "client_note": "ok",
+            "client_answered_at": saved["answered_at"],
+        },
+    }]
+    assert db.tables["sessions"][0]["status"] == "確定"
+    # the checks and the payload share one identity map: nothing is read twice
+    assert _reads(fake) == {"client_responses": 1, "candidate_slots": 1, "sessions": 1, "session_evaluators": 1, "facilities": 1}
+    assert db_calls(res) == 8  # the watermark + 5 reads + insert + status update
+
+def test_client_response_twice_is_409(api, notion):
+    client, _ = api(MemoryDB(_tables(invite_token="tok-8")))
+    first = client.post("/api/hooks/save-client-response", json={"session_id": 1, "selected_candidate_slot_id": 501})
+    assert first.status_code == 200
+    again = client.post("/api/hooks/save-client-response", json={"session_id": 1, "selected_candidate_slot_id": 502})
+    assert again.status_code == 409
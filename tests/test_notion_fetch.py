@@ -0,0 +1,75 @@
+import time
+import pytest
+from app.services.notion import facility_info_service as fis
+from tests.bench import ms, report, timed
+from tests.notion_stub import facility_page, facility_with_evaluators, page_id
+
+FACILITY_URL = f"https://www.notion.so/{page_id(1).replace('-', '')}"
+LATENCY = 0.03
+
+def test_related_pages_are_fetched_with_failures_isolated(notion_api):
+    pages = facility_with_evaluators(3)
+    del pages[page_id(101)]  # a related page that cannot be read
+    stub = notion_api(pages)
+    info = fis.fetch_facility_info(FACILITY_URL)
+    assert info["facility_name"] == "さくら園"
+    assert info["contact_person"] == {"name": "Tanaka", "email": "tanaka@x.jp"}
+    assert info["evaluators"] == [{"name": "Evaluator 0", "email": "e0@x.jp"}, {"name": "Evaluator 2", "email": "e2@x.jp"}]
+    assert len(stub.calls) == 4
+
+def test_429_is_retried_after_retry_after(notion_api):
+    stub = notion_api({page_id(1): facility_page(page_id(1), [])}, rate_limited=1, retry_after="0.2")
+    started = time.monotonic()
+    info = fis.fetch_facility_info(FACILITY_URL)
+    assert info["facility_name"] == "さくら園"
+    assert [status for _, _, status in stub.calls] == [429, 200]
+    assert stub.calls[1][1] - started >= 0.2
+
+def test_429_beyond_max_retries_raises(notion_api, monkeypatch):
+    monkeypatch.setattr(fis, "NOTION_MAX_RETRIES", 2)
+    stub = notion_api({page_id(1): facility_page(page_id(1), [])}, rate_limited=5, retry_after="0")
+    with pytest.raises(fis.APIResponseError):
+        fis.fetch_facility_info(FACILITY_URL)
+    assert len(stub.calls) == 3
+
+def test_token_bucket_spaces_calls_to_the_rate():
+    bucket = fis._TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # a burst of 2, then one grant every 50ms
+    assert time.monotonic() - started >= 4 / 20 * 0.9
+
+def test_concurrent_fetch_vs_sequential_against_stub(notion_api):
+    n = 12
+    pages = facility_with_evaluators(n)
+    stub = notion_api(pages, latency=LATENCY)
+    related = [page_id(100 + i) for i in range(n)]
+
+    def sequential():
+        # the old path: one pages.retrieve after another
+        stub.retrieve(page_id(1))
+        for pid in related:
+            stub.retrieve(pid)
+
+    def concurrent():
+        fis._facility_cache.clear()
+        fis.fetch_facility_info(FACILITY_URL)
+
+    sequential_s = timed(sequential, repeat=3)
+    concurrent_s = timed(concurrent, repeat=3)
+    report(f"facility with {n} related pages", sequential=ms(sequential_s), concurrent=ms(concurrent_s),
+           latency=ms(LATENCY), workers=fis.NOTION_FETCH_CONCURRENCY)
+    assert concurrent_s * 2 < sequential_s
+
+def test_rate_limited_fetch_stays_under_the_limit(notion_api, monkeypatch):
+    # with the production limits, 7 pages cannot go faster than ~3 req/s after the burst
+    monkeypatch.setattr(fis, "_bucket", fis._TokenBucket(fis.NOTION_RATE_PER_SEC, fis.NOTION_BURST))
+    stub = notion_api(facility_with_evaluators(6))
+    started = time.monotonic()
+    fis.fetch_facility_info(FACILITY_URL)
+    elapsed = time.monotonic() - started
+    times = sorted(t for _, t, _ in stub.calls)
+    report("7 pages at the Notion rate limit", elapsed=ms(elapsed), rate=fis.NOTION_RATE_PER_SEC, burst=fis.NOTION_BURST)
+    assert len(times) == 7
+    assert elapsed >= (7 - fis.NOTION_BURST) / fis.NOTION_RATE_PER_SEC * 0.9
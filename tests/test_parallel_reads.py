@@ -0,0 +1,46 @@
+import pytest
+from app.db import run_parallel
+from tests.bench import ms, report, timed
+from tests.fakes import FakeSupabase, MemoryDB
+
+LATENCY = 0.02
+
+def _reads(fake):
+    # the independent reads of a payload builder: session, evaluators, slots, facility
+    return [
+        lambda: fake.table("sessions").select("*").eq("id", 1).execute().data,
+        lambda: fake.table("session_evaluators").select("*").eq("session_id", 1).execute().data,
+        lambda: fake.table("candidate_slots").select("*").eq("session_id", 1).execute().data,
+        lambda: fake.table("facilities").select("*").eq("id", 10).execute().data,
+    ]
+
+def _db():
+    return MemoryDB({
+        "sessions": [{"id": 1, "facility_id": 10}],
+        "session_evaluators": [{"id": 101, "session_id": 1}],
+        "candidate_slots": [{"id": 501, "session_id": 1}],
+        "facilities": [{"id": 10}],
+    })
+
+def test_run_parallel_keeps_call_order():
+    fake = FakeSupabase(_db())
+    sessions, se, slots, facilities = run_parallel(*_reads(fake))
+    assert sessions == [{"id": 1, "facility_id": 10}]
+    assert [r["id"] for r in se] == [101]
+    assert [r["id"] for r in slots] == [501]
+    assert facilities == [{"id": 10}]
+
+def test_run_parallel_reraises_the_failure():
+    def boom():
+        raise ValueError("read failed")
+    with pytest.raises(ValueError, match="read failed"):
+        run_parallel(lambda: 1, boom)
+
+def test_parallel_reads_cost_the_slowest_not_the_sum():
+    fake = FakeSupabase(_db(), latency=LATENCY)
+    reads = _reads(fake)
+    sequential_s = timed(lambda: [r() for r in reads])
+    parallel_s = timed(lambda: run_parallel(*reads))
+    report("4 independent reads", sequential=ms(sequential_s), parallel=ms(parallel_s), latency=ms(LATENCY))
+    assert sequential_s >= 4 * LATENCY
+    assert parallel_s < 2 * LATENCY
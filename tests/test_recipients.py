@@ -0,0 +1,78 @@
+import re
+from typing import List
+from app.services.hooks import recipient_service as recipients
+from app.services.hooks.make_facility_email_service import build_make_payload
+from tests.bench import ms, report, timed
+from tests.fakes import FakeSupabase, MemoryDB
+
+EVALUATORS = 200
+BUILDS = 30
+
+# Free-text address fields as they are typed in: Japanese separators, names, notes
+MESSY = [
+    "山田 太郎 <taro@kaigo-example.co.jp>、 hanako@example.ne.jp\r\n（予備）yobi@x.jp; 連絡先：office@example.org , ",
+    "施設長：a@x.jp、事務 b@x.jp\n c@x.jp",
+    "A@X.JP,a@x.jp;;b.c+tag@sub.example.com",
+    "メールなし",
+    "",
+]
+
+_OLD_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}", re.IGNORECASE)
+
+def _old_extract_emails(text: str) -> List[str]:
+    """The per-builder copy that extract_emails replaced."""
+    if not text:
+        return []
+    norm = (
+        text.replace("\r\n", " ")
+            .replace("\n", " ")
+            .replace("、", " ")
+            .replace(";", " ")
+            .replace(",", " ")
+    )
+    return [m.strip() for m in _OLD_EMAIL_RE.findall(norm)]
+
+def test_extract_emails_matches_the_old_parser():
+    for text in MESSY:
+        assert recipients.extract_emails(text) == _old_extract_emails(text)
+    assert recipients.extract_emails(MESSY[0]) == [
+        "taro@kaigo-example.co.jp", "hanako@example.ne.jp", "yobi@x.jp", "office@example.org",
+    ]
+    assert recipients.merge_unique_emails(recipients.extract_emails(MESSY[2])) == ["A@X.JP", "b.c+tag@sub.example.com"]
+
+def test_memo_returns_independent_lists():
+    first = recipients.extract_emails(MESSY[1])
+    first.append("mutated@x.jp")
+    assert recipients.extract_emails(MESSY[1]) == ["a@x.jp", "b@x.jp", "c@x.jp"]
+
+def _db() -> MemoryDB:
+    return MemoryDB({
+        "sessions": [{"id": 1, "facility_id": 10, "purpose": "評価", "status": "起案中",
+                      "response_deadline": None, "presentation_date": None, "notion_url": None}],
+        "facilities": [{"id": 10, "name": "さくら園", "contact_name": "田中", "contact_email": MESSY[1], "notion_url": None}],
+        "session_evaluators": [
+            {"id": 100 + i, "session_id": 1, "evaluator_id": i, "invite_token": f"tok-{i}",
+             "evaluator": {"id": i, "name": f"評価者{i}", "email": MESSY[0].replace("@", f"{i}@")}}
+            for i in range(EVALUATORS)
+        ],
+        "candidate_slots": [],
+    })
+
+def _builds_per_sec(supabase) -> float:
+    build_make_payload(supabase, 1, [])  # warm the entity cache (and the memo)
+    def builds():
+        for _ in range(BUILDS):
+            build_make_payload(supabase, 1, [])
+    return BUILDS / timed(builds)
+
+def test_memoized_parse_raises_builder_throughput(monkeypatch):
+    supabase = FakeSupabase(_db())
+    memoized = _builds_per_sec(supabase)
+    payload = build_make_payload(supabase, 1, [])
+    monkeypatch.setattr(recipients, "_parse", recipients._parse.__wrapped__)
+    unmemoized = _builds_per_sec(supabase)
+    assert build_make_payload(supabase, 1, []) == payload
+    report("facility email builder, 200 messy evaluator addresses",
+           memoized=f"{memoized:.0f}/s", unmemoized=f"{unmemoized:.0f}/s",
+           memoized_build=ms(1 / memoized), unmemoized_build=ms(1 / unmemoized))
+    assert memoized > unmemoized * 1.5
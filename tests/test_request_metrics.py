@@ -0,0 +1,60 @@
+import json
+import logging
+import app.main  # noqa: F401  (configures the app loggers)
+from tests.fakes import MemoryDB, db_calls
+from tests.samples import list_db, status_db, status_row
+
+def test_app_logger_emits_info():
+    # the request line is logged at INFO through the app logger's own handler
+    logger = logging.getLogger("app.request_metrics")
+    assert logger.isEnabledFor(logging.INFO)
+    assert logging.getLogger("app").handlers
+
+def test_request_line_is_logged(api, caplog):
+    client, _ = api(MemoryDB(rpc={"session_list_watermark": "wm"}))
+    res = client.get("/api/sessions/list")
+    assert res.status_code == 200
+    (record,) = [r for r in caplog.records if r.name == "app.request_metrics"]
+    line = json.loads(record.getMessage())
+    assert line["path"] == "/api/sessions/list"
+    assert line["status"] == 200
+    assert line["db_calls"] == 2
+    assert set(line["tables"]) == {"rpc.session_list_watermark", "session_list_v"}
+    assert 'desc="2 calls"' in res.headers["server-timing"]
+
+# Query budgets: PostgREST round trips per request, from the Server-Timing header
+
+def test_status_query_budget(api):
+    client, fake = api(status_db(status_row()))
+    first = client.get("/api/sessions/1/status")
+    assert db_calls(first) == 2  # watermark + one embedded select
+    assert fake.tables() == ["rpc:session_watermark", "sessions"]
+    # same watermark: the row comes from the entity cache
+    assert db_calls(client.get("/api/sessions/1/status", params={"answers_format": "compact"})) == 1
+    assert db_calls(client.get("/api/sessions/1/status", headers={"If-None-Match": first.headers["etag"]})) == 1
+
+def test_status_batch_query_budget(api):
+    client, fake = api(status_db(*(status_row(i) for i in range(1, 21))))
+    res = client.post("/api/sessions/status:batch", json={"session_ids": list(range(1, 21))})
+    assert len(res.json()["items"]) == 20
+    assert db_calls(res) == 1
+    assert fake.tables() == ["sessions"]
+
+def test_consensus_query_budget(api):
+    client, _ = api(status_db(status_row(1), status_row(2)))
+    assert db_calls(client.get("/api/sessions/1/slots/consensus")) == 1
+    assert db_calls(client.post("/api/sessions/consensus:batch", json={"session_ids": [1, 2]})) == 1
+
+def test_list_query_budget(api):
+    client, fake = api(list_db())
+    params = {"purpose": "評価", "status": "起案中"}
+    res = client.get("/api/sessions/list", params=params)
+    assert db_calls(res) == 2  # watermark + list (enums are served from the cache)
+    assert fake.tables() == ["rpc:session_list_watermark", "session_list_v"]
+    assert db_calls(client.get("/api/sessions/list", params=params, headers={"If-None-Match": res.headers["etag"]})) == 1
+
+def test_list_facility_query_budget(api):
+    client, _ = api(list_db())
+    # the first search loads the facility index (one page here), later ones reuse it
+    assert db_calls(client.get("/api/sessions/list", params={"facility": "さくら"})) == 3
+    assert db_calls(client.get("/api/sessions/list", params={"facility": "ひまわり"})) == 2
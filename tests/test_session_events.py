@@ -0,0 +1,129 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+import pytest
+from fastapi.testclient import TestClient
+from app.auth.deps import require_allowed_user
+from app.main import app
+from app.services.hooks.evaluator_response_service import mark_session_status
+from app.services.sessions import session_events_service as events
+from tests.fakes import FakeSupabase, MemoryDB
+
+# TestClient buffers the whole response body, so an endless event stream never
+# returns from it: these tests drive the app over raw ASGI and disconnect themselves.
+
+class _Stream:
+    """GET /api/sessions/{id}/events on the real app; frame() reads the next body chunk."""
+
+    def __init__(self, session_id: int):
+        self.session_id = session_id
+        self.messages: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._requested = False
+        self._disconnected = asyncio.Event()
+
+    async def _receive(self) -> Dict[str, Any]:
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        await self.messages.put(message)
+
+    async def __aenter__(self) -> "_Stream":
+        path = f"/api/sessions/{self.session_id}/events"
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "root_path": "", "query_string": b"", "headers": [(b"host", b"test")],
+            "client": ("test", 1), "server": ("test", 80),
+        }
+        self._task = asyncio.create_task(app(scope, self._receive, self._send))
+        self.start = await asyncio.wait_for(self.messages.get(), 1)
+        return self
+
+    async def frame(self, timeout: float = 1.0) -> str:
+        message = await asyncio.wait_for(self.messages.get(), timeout)
+        assert message["type"] == "http.response.body"
+        return message["body"].decode()
+
+    async def __aexit__(self, *exc) -> None:
+        self._disconnected.set()
+        await asyncio.wait_for(self._task, 1)
+
+def _event(frame: str) -> Dict[str, Any]:
+    fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return {"id": int(fields["id"]), "type": fields["event"], "data": json.loads(fields["data"])}
+
+@pytest.fixture
+def authed():
+    app.dependency_overrides[require_allowed_user] = lambda: {"email": "tester@example.com"}
+    yield
+    app.dependency_overrides.clear()
+
+def test_subscribe_sends_retry_and_unsubscribes_on_disconnect(authed):
+    async def run():
+        async with _Stream(1) as s:
+            assert s.start["status"] == 200
+            assert (b"content-type", b"text/event-stream; charset=utf-8") in s.start["headers"]
+            assert (b"cache-control", b"no-cache") in s.start["headers"]
+            assert await s.frame() == "retry: 3000\n\n"
+            assert events.open_stream_count() == 1
+        assert events.open_stream_count() == 0
+
+    asyncio.run(run())
+
+def test_published_events_reach_only_that_sessions_streams(authed):
+    async def run():
+        async with _Stream(1) as one, _Stream(1) as other, _Stream(2) as elsewhere:
+            for s in (one, other, elsewhere):
+                await s.frame()
+            # write paths publish from worker threads
+            await asyncio.to_thread(events.publish, 1, events.EVENT_STATUS, {"status": "確定"})
+            first, second = _event(await one.frame()), _event(await other.frame())
+            assert first == second
+            assert first["type"] == "status"
+            assert first["data"] == {"session_id": 1, "status": "確定"}
+            with pytest.raises(asyncio.TimeoutError):
+                await elsewhere.frame(timeout=0.1)
+
+    asyncio.run(run())
+
+def test_status_write_is_streamed_in_order(authed):
+    db = MemoryDB({"sessions": [{"id": 1, "status": "起案中"}]})
+
+    async def run():
+        async with _Stream(1) as s:
+            await s.frame()
+            supabase = FakeSupabase(db)
+            for status in ("評価者待ち", "日程調整中"):
+                await asyncio.to_thread(mark_session_status, supabase, 1, status)
+            received: List[Dict[str, Any]] = [_event(await s.frame()), _event(await s.frame())]
+            assert [e["data"]["status"] for e in received] == ["評価者待ち", "日程調整中"]
+            assert received[0]["id"] < received[1]["id"]
+
+    asyncio.run(run())
+    assert db.tables["sessions"][0]["status"] == "日程調整中"
+
+def test_idle_stream_sends_heartbeats(authed, monkeypatch):
+    monkeypatch.setattr(events, "_heartbeat_sec", 0.05)
+
+    async def run():
+        async with _Stream(1) as s:
+            await s.frame()
+            assert await s.frame() == ": ping\n\n"
+            assert await s.frame() == ": ping\n\n"
+            # an event still arrives between heartbeats
+            events.publish(1, events.EVENT_SESSION, {"response_deadline": "2026-11-02"})
+            frame = await s.frame()
+            while frame == ": ping\n\n":
+                frame = await s.frame()
+            assert _event(frame)["data"] == {"session_id": 1, "response_deadline": "2026-11-02"}
+
+    asyncio.run(run())
+
+def test_stream_requires_a_signed_in_user():
+    res = TestClient(app).get("/api/sessions/1/events")
+    assert res.status_code == 401
+    assert events.open_stream_count() == 0
@@ -0,0 +1,25 @@
+from tests.samples import status_db, status_row
+
+def test_status_nested_shape(api):
+    client, _ = api(status_db(status_row()))
+    res = client.get("/api/sessions/1/status")
+    assert res.status_code == 200
+    body = res.json()
+    assert set(body) == {"session", "evaluators", "slots", "answers", "conflicts"}
+    assert body["session"]["facility"] == {
+        "id": 10, "name": "Facility A", "contact_name": "Tanaka", "contact_email": "a@x.jp", "notion_url": None,
+    }
+    assert body["evaluators"][0] == {
+        "id": 7, "session_evaluator_id": 101, "name": "Sato", "email": "s@x.jp",
+        "answered_at": "2026-10-10T00:00:00Z", "note": "note",
+        "form_id": None, "form_view_url": None, "form_edit_url": None,
+    }
+    assert [e["session_evaluator_id"] for e in body["evaluators"]] == [101, 102]
+    assert [s["id"] for s in body["slots"]] == [501, 502, 503]
+    assert body["answers"] == {"7": {"501": "○", "502": "x"}, "8": {"503": "△"}}
+
+def test_status_unknown_session_is_400(api):
+    client, _ = api(status_db(status_row()))
+    res = client.get("/api/sessions/99/status")
+    assert res.status_code == 400
+    assert "not found" in res.json()["detail"]
@@ -0,0 +1,57 @@
+import itertools
+from tests.fakes import args_of
+from tests.bench import ms, report, timed
+from tests.samples import status_db, status_row
+
+LATENCY = 0.005
+
+def test_status_batch_items_and_missing(api):
+    client, _ = api(status_db(status_row(1), status_row(2)))
+    res = client.post("/api/sessions/status:batch", json={"session_ids": [2, 99, 1, 2]})
+    assert res.status_code == 200
+    body = res.json()
+    assert [item["session"]["id"] for item in body["items"]] == [2, 1]
+    assert body["missing"] == [99]
+    single = client.get("/api/sessions/2/status").json()
+    assert body["items"][0] == single
+
+def test_status_batch_rejects_too_many_ids(api):
+    client, _ = api(status_db(status_row()))
+    res = client.post("/api/sessions/status:batch", json={"session_ids": list(range(1, 302))})
+    assert res.status_code == 422
+
+def test_status_batch_vs_individual_calls(api):
+    n = 30
+    db = status_db(*(status_row(i) for i in range(1, n + 1)))
+    versions = itertools.count()
+    db.rpc["session_watermark"] = lambda p: f"wm-{next(versions)}"  # never served from cache
+    client, fake = api(db, latency=LATENCY)
+
+    def individual():
+        for i in range(1, n + 1):
+            client.get(f"/api/sessions/{i}/status")
+
+    def batch():
+        client.post("/api/sessions/status:batch", json={"session_ids": list(range(1, n + 1))})
+
+    fake.reset()
+    individual()
+    individual_calls = len(fake.executed)
+    fake.reset()
+    batch()
+    batch_calls = len(fake.executed)
+    individual_s = timed(individual, repeat=3)
+    batch_s = timed(batch, repeat=3)
+    report(f"status of {n} sessions", individual_calls=individual_calls, batch_calls=batch_calls,
+           individual=ms(individual_s), batch=ms(batch_s), latency=ms(LATENCY))
+    assert batch_calls == 1
+    assert individual_calls >= n
+    assert batch_s * 5 < individual_s
+
+def test_status_batch_splits_ids_into_chunks(api):
+    n = 120
+    client, fake = api(status_db(*(status_row(i) for i in range(1, n + 1))))
+    body = client.post("/api/sessions/status:batch", json={"session_ids": list(range(1, n + 1))}).json()
+    assert [item["session"]["id"] for item in body["items"]] == list(range(1, n + 1))
+    chunks = [args_of(calls, "in_")[0][1] for table, calls in fake.executed if table == "sessions"]
+    assert sorted(len(c) for c in chunks) == [20, 50, 50]
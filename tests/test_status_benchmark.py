@@ -0,0 +1,69 @@
+from typing import Any, Dict
+import itertools
+from tests.bench import ms, report, timed
+from tests.fakes import FakeSupabase, MemoryDB
+from tests.samples import flat_tables, status_db, status_row
+
+# The status aggregate before the embedded select: six dependent PostgREST calls
+# (sessions, facilities, session_evaluators, evaluators, candidate_slots,
+# evaluator_responses), as fetch_session_status made them.
+DB_TO_SYMBOL = {"O": "○", "M": "△", "X": "x"}
+LATENCY = 0.01
+
+def old_fetch_session_status(supabase, session_id: int) -> Dict[str, Any]:
+    s = supabase.table("sessions").select("*").eq("id", session_id).single().execute().data
+    f = supabase.table("facilities").select("*").eq("id", s["facility_id"]).single().execute().data or {}
+    se_rows = supabase.table("session_evaluators").select("*").eq("session_id", session_id).execute().data or []
+    ev_map = {
+        r["id"]: r
+        for r in supabase.table("evaluators").select("id, name, email").in_("id", [r["evaluator_id"] for r in se_rows]).execute().data or []
+    }
+    slots = supabase.table("candidate_slots").select("id, slot_date, slot_label, sort_order").eq("session_id", session_id).execute().data or []
+    responses = supabase.table("evaluator_responses").select("*").in_("session_evaluator_id", [r["id"] for r in se_rows]).execute().data or []
+    se_id_to_eid = {r["id"]: r["evaluator_id"] for r in se_rows}
+    answers: Dict[str, Dict[str, Any]] = {}
+    for r in responses:
+        answers.setdefault(str(se_id_to_eid[r["session_evaluator_id"]]), {})[str(r["candidate_slot_id"])] = DB_TO_SYMBOL.get(r["choice"])
+    return {
+        "session": {
+            **{k: s.get(k) for k in ("id", "purpose", "status", "response_deadline", "presentation_date", "notion_url", "facility_form_view_url", "facility_form_edit_url")},
+            "facility": {k: f.get(k) for k in ("id", "name", "contact_name", "contact_email", "notion_url")},
+        },
+        "evaluators": [
+            {
+                "id": r["evaluator_id"], "session_evaluator_id": r["id"],
+                "name": ev_map.get(r["evaluator_id"], {}).get("name"), "email": ev_map.get(r["evaluator_id"], {}).get("email"),
+                "answered_at": r.get("answered_at"), "note": r.get("note"), "form_id": r.get("evaluator_form_id"),
+                "form_view_url": r.get("evaluator_form_view_url"), "form_edit_url": r.get("evaluator_form_edit_url"),
+            }
+            for r in se_rows
+        ],
+        "slots": [{k: sl[k] for k in ("id", "slot_date", "slot_label", "sort_order")} for sl in slots],
+        "answers": answers,
+    }
+
+def test_status_single_round_trip_vs_six(api):
+    row = status_row()
+    old_db = FakeSupabase(MemoryDB(flat_tables(row)), latency=LATENCY)
+    db = status_db(row)
+    # a new watermark on every request: always the uncached path
+    versions = itertools.count()
+    db.rpc["session_watermark"] = lambda p: f"wm-{next(versions)}"
+    client, fake = api(db, latency=LATENCY)
+
+    old = old_fetch_session_status(old_db, 1)
+    new = client.get("/api/sessions/1/status").json()
+    # same response as before, plus what later endpoints added
+    assert {k: new[k] for k in old} == old
+    assert set(new) - set(old) <= {"conflicts"}
+
+    old_calls = len(old_db.executed)
+    fake.reset()
+    client.get("/api/sessions/1/status")
+    new_calls = len(fake.executed)
+    old_s = timed(lambda: old_fetch_session_status(old_db, 1))
+    new_s = timed(lambda: client.get("/api/sessions/1/status"))
+    report("status aggregate", old_calls=old_calls, new_calls=new_calls, old=ms(old_s), new=ms(new_s), latency=ms(LATENCY))
+    assert old_calls == 6
+    assert new_calls <= 2  # the embedded select (+ the watermark of conditional GETs)
+    assert new_s < old_s * 0.6
@@ -0,0 +1,66 @@
+import base64
+import json
+from app.services.sessions.status_service import _get_answers_compact, _get_answers_matrix_from_se
+from tests.bench import ms, report, timed
+from tests.samples import status_db, status_row
+
+SYMBOLS = {1: "○", 2: "△", 3: "x"}
+
+def decode(compact):
+    """Inverse of the documented 2-bit packing: {evaluator_id: {slot_id: symbol}} for answered cells."""
+    packed = base64.b64decode(compact["cells"])
+    n = len(compact["slot_ids"])
+    out = {}
+    for e, eid in enumerate(compact["evaluator_ids"]):
+        for s, sid in enumerate(compact["slot_ids"]):
+            i = e * n + s
+            code = (packed[i >> 2] >> (6 - 2 * (i & 3))) & 3
+            if code:
+                out.setdefault(str(eid), {})[str(sid)] = SYMBOLS[code]
+    return out
+
+def test_status_compact_round_trips_to_nested(api):
+    client, _ = api(status_db(status_row()))
+    nested = client.get("/api/sessions/1/status").json()
+    compact = client.get("/api/sessions/1/status", params={"answers_format": "compact"}).json()
+    assert "answers" not in compact
+    matrix = compact["answers_compact"]
+    assert matrix["encoding"] == "2bit-base64"
+    assert matrix["evaluator_ids"] == [7, 8]
+    assert matrix["slot_ids"] == [501, 502, 503]
+    assert decode(matrix) == nested["answers"]
+    # everything but the answers encoding is identical
+    assert {k: v for k, v in compact.items() if k != "answers_compact"} == {
+        k: v for k, v in nested.items() if k != "answers"
+    }
+
+def test_status_invalid_answers_format_is_422(api):
+    client, _ = api(status_db(status_row()))
+    assert client.get("/api/sessions/1/status", params={"answers_format": "csv"}).status_code == 422
+
+def _large_session(n_evaluators: int = 60, n_slots: int = 40):
+    slots = [{"id": 1000 + j, "slot_date": f"2026-12-{1 + j % 28:02d}", "slot_label": "AM", "sort_order": j} for j in range(n_slots)]
+    se_rows = [
+        {
+            "id": 5000 + e,
+            "evaluator_id": 100 + e,
+            "evaluator_responses": [
+                {"candidate_slot_id": sl["id"], "choice": "OMX"[(e + j) % 3]} for j, sl in enumerate(slots)
+            ],
+        }
+        for e in range(n_evaluators)
+    ]
+    return se_rows, slots
+
+def test_compact_payload_size_and_build_time():
+    se_rows, slots = _large_session()
+    nested_s = timed(lambda: json.dumps(_get_answers_matrix_from_se(se_rows), ensure_ascii=False), repeat=9)
+    compact_s = timed(lambda: json.dumps(_get_answers_compact(se_rows, slots)), repeat=9)
+    nested_bytes = len(json.dumps(_get_answers_matrix_from_se(se_rows), ensure_ascii=False).encode("utf-8"))
+    compact_bytes = len(json.dumps(_get_answers_compact(se_rows, slots)).encode("utf-8"))
+    report(
+        "answers 60x40 build+serialize",
+        nested_bytes=nested_bytes, compact_bytes=compact_bytes, nested=ms(nested_s), compact=ms(compact_s),
+    )
+    assert compact_bytes * 5 < nested_bytes
+    assert compact_s < nested_s * 1.5